@@ -7,3 +7,105 @@ DB_USER = ''
 DB_PASSWORD = ''
 DB_NAME = ''
 GOOGLE_API_KEY = ''
+
+
+# 크롤링 실행기 (동시에 뜨는 Chrome 수 = CRAWL_MAX_WORKERS)
+CRAWL_MAX_WORKERS = 5
+CRAWL_MAX_CONCURRENT_JOBS = 2
+CRAWL_MAX_QUEUE = 8
+CRAWL_FETCH_MODE = 'auto'        # 'selenium' | 'http' | 'auto'(http 실패 시 selenium)
+CRAWL_PARSER_BACKEND = None      # None이면 lxml(설치 시) -> bs4
+# 예의 대기: 관측된 평균 응답 시간 x FACTOR 만큼 쉬되, MIN~MAX(초) 범위로 제한
+CRAWL_POLITENESS_MIN_DELAY = 0.2
+CRAWL_POLITENESS_MAX_DELAY = 2.0
+CRAWL_POLITENESS_FACTOR = 0.5
+# 별점 대신 (별점, 페이지 구간) 단위로 작업을 나눠 놀고 있는 워커가 남은 페이지를 가져가도록 함
+CRAWL_PAGE_SPLIT = True
+CRAWL_PAGE_CHUNK_MIN = 2        # 구간 하나의 최소 페이지 수
+CRAWL_TASK_TIMEOUT = 300        # 작업 결과를 이 시간(초) 동안 받지 못하면 남은 구간을 실패 처리
+# 조기 종료: 별점마다 키워드별로 이만큼의 키워드 포함 문장을 모으면 남은 페이지를 수집하지 않음
+CRAWL_EARLY_STOP = True
+CRAWL_STOP_SENTENCES_PER_KEYWORD = 10
+
+
+# 리뷰 캐시 (상품 ID + 별점 단위, 초 단위 TTL)
+REVIEW_CACHE_TTL = 60 * 60 * 6
+REVIEW_CACHE_INCREMENTAL = True
+REVIEW_CACHE_MAX_PRODUCTS = 200
+
+
+# 분석 결과 캐시 (fresh TTL 이후엔 캐시를 반환하며 백그라운드 재분석, stale TTL 이후엔 폐기)
+RESULT_CACHE_SIZE = 256
+RESULT_CACHE_FRESH_TTL = 60 * 60
+RESULT_CACHE_STALE_TTL = 60 * 60 * 24
+RESULT_CACHE_USE_DB = True
+
+
+# 키워드 단위 분석 캐시 (상품 ID + 리뷰 저장소 세대 + 키워드, 초 단위 TTL)
+KEYWORD_CACHE_ENABLED = True
+KEYWORD_CACHE_SIZE = 2048
+KEYWORD_CACHE_TTL = 60 * 60 * 24
+
+
+# 비동기 분석 작업 (백그라운드 스레드 수, 완료 작업 보관 시간(초), 대기 작업 최대 수(넘으면 429))
+JOB_MAX_WORKERS = 4
+JOB_TTL = 60 * 30
+JOB_MAX_PENDING = 16
+
+
+# DB 커넥션 풀 (최대 연결 수, 연결 최대 수명(초), 대기 시간(초))
+DB_POOL_SIZE = 10
+DB_POOL_MAX_LIFETIME = 60 * 30
+DB_POOL_TIMEOUT = 10
+DB_POOL_PRE_PING = True
+
+
+# 라이브러리 목록 페이지 크기
+LIBRARY_PAGE_SIZE = 20
+LIBRARY_MAX_PAGE_SIZE = 100
+
+
+# AI 분석에 넘길 키워드 포함 문장의 토큰 예산 (별점/키워드별로 도움됨 많은 문장부터 고르게 선택)
+ANALYSIS_TOKEN_BUDGET = 8000
+ANALYSIS_COUNT_TOKENS = True     # 모델 토크나이저로 실제 토큰 수를 확인하여 추정치 보정
+# 유사도(MinHash 추정 자카드)가 이 값 이상인 리뷰는 하나만 남김 (0 또는 None이면 중복 제거 안 함)
+ANALYSIS_DEDUP_THRESHOLD = 0.8
+# 키워드 매칭: 공백 무시("노이즈 캔슬링" == "노이즈캔슬링"), 한글 자모 단위 비교
+KEYWORD_MATCH_IGNORE_SPACES = True
+KEYWORD_MATCH_JAMO = False
+
+
+# AI map-reduce 분석: 문장이 CHUNK_TOKENS를 넘으면 묶음별로 동시에 분석한 뒤 합침
+# (CHUNK_TOKENS는 ANALYSIS_TOKEN_BUDGET 이상으로 유지: 예산 안의 입력은 스트리밍 단일 호출로 분석)
+AI_MAP_REDUCE = True
+AI_CHUNK_TOKENS = 16000
+AI_MAX_CONCURRENCY = 4
+AI_CHUNK_RETRIES = 2
+# Gemini 클라이언트: 프로세스 전체 동시 요청 수, 요청 타임아웃/슬롯 대기 시간(초)
+AI_MAX_CONCURRENT_REQUESTS = 8
+AI_REQUEST_TIMEOUT = 120
+AI_ACQUIRE_TIMEOUT = 60
+# 비동기 분석 작업에서 AI 응답을 스트리밍으로 받아 키워드별 결과를 완성되는 즉시 이벤트로 전달
+AI_STREAMING = True
+# AI 응답을 분석 결과 스키마(response_schema)의 JSON으로 제한 (코드 블록 제거/재파싱 불필요)
+AI_STRUCTURED_OUTPUT = True
+# 고정 system_message를 Gemini 컨텍스트 캐시로 재사용 (TTL(초), 만료 몇 초 전에 연장할지). 미지원 시 자동으로 매 요청 전송
+# 명시적 캐시는 모델별 최소 토큰 수(2.5 Flash: 1,024) 이상이어야 해서 현재 system_message로는 만들 수 없으므로 기본은 꺼 둠
+# (암묵적 캐시 적중분은 설정과 무관하게 usage_stats의 cached_tokens로 측정됨)
+AI_CONTEXT_CACHE = False
+AI_CONTEXT_CACHE_TTL = 60 * 60
+AI_CONTEXT_CACHE_REFRESH = 5 * 60
+# Gemini 호출 복원력: 일시적 오류(429/5xx/타임아웃) 재시도 횟수와 백오프(초), 재시도 포함 전체 제한 시간(초)
+AI_RETRIES = 3
+AI_RETRY_BACKOFF = 1.0
+AI_RETRY_MAX_BACKOFF = 30
+AI_CALL_DEADLINE = 180
+# 최근 응답 시간의 p95가 지나도록 응답이 없으면 같은 요청을 하나 더 보냄 (표본이 MIN_SAMPLES개 모인 뒤부터)
+# 헤지 요청은 전체 호출의 BUDGET 비율까지만, 동시 요청 슬롯에 여유가 있을 때만 보냄
+AI_HEDGE = True
+AI_HEDGE_PERCENTILE = 95
+AI_HEDGE_MIN_SAMPLES = 20
+AI_HEDGE_BUDGET = 0.05
+# 연속 실패 THRESHOLD번이면 RESET_TIMEOUT(초) 동안 AI 호출 없이 즉시 실패 (캐시된 키워드가 있으면 부분 결과 반환)
+AI_CIRCUIT_FAILURE_THRESHOLD = 5
+AI_CIRCUIT_RESET_TIMEOUT = 60
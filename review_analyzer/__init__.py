@@ -30,6 +30,32 @@ def create_app():
     db.init_app(app)
 
 
+    # --- 크롤링 실행기 초기화 ---
+    # 분석 요청마다 프로세스 풀을 만들지 않도록, 앱 전체가 공유하는 크롤링 워커 풀을 등록합니다.
+    from .crawling import crawl_executor
+    crawl_executor.init_app(app)
+
+    # --- 리뷰 저장소(캐시) 초기화 ---
+    # 같은 상품을 키워드만 바꿔 재분석할 때 크롤링을 건너뛰기 위한 상품/별점 단위 리뷰 캐시입니다.
+    from .crawling import review_store
+    review_store.init_app(app)
+
+    # --- 분석 결과 캐시 초기화 ---
+    # 같은 analysis_id(링크 + 키워드)의 반복 분석을 크롤링/AI 호출 없이 응답하기 위한 캐시입니다.
+    from . import result_cache
+    result_cache.init_app(app)
+
+    # --- 키워드 단위 분석 캐시 초기화 ---
+    # 키워드 조합이 달라도 같은 리뷰로 이미 분석한 키워드는 AI에 다시 보내지 않기 위한 캐시입니다.
+    from . import keyword_cache
+    keyword_cache.init_app(app)
+
+    # --- 비동기 분석 작업 관리자 초기화 ---
+    # /api/analyze의 async 모드에서 분석을 백그라운드로 실행하고 진행 상황을 보관합니다.
+    from . import jobs
+    jobs.init_app(app)
+
+
     # --- 블루프린트(Blueprint) 등록 ---
     # 각 기능별로 분리된 라우트 파일을 앱에 등록합니다.
     from . import routes
@@ -5,9 +5,22 @@ ChatBot 모듈을 사용하여 리뷰 텍스트에 대한 AI 분석을 수행하
 시스템 프롬프트를 정의하고, 분석 요청을 ChatBot에 전달하는 역할을 합니다.
 """
 
-from .chatbot import ChatBot
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .chatbot import ChatBot, get_resilience_stats
+from .resilience import AIUnavailableError
+from .stream_parser import IncrementalJSONParser
+from .result import AnalysisResult, KeywordAnalysis, ANALYSIS_RESPONSE_SCHEMA, INSUFFICIENT_SUMMARY
 from flask import current_app
 
+# --- map-reduce 기본 설정 (config.py의 AI_*로 덮어쓸 수 있음) ---
+DEFAULT_MAX_CONCURRENCY = 4    # 동시에 보내는 chunk 분석 요청 수
+DEFAULT_CHUNK_RETRIES = 2      # chunk 하나당 재시도 횟수
+RETRY_BACKOFF = 1.0            # 재시도 대기 시간 기본값 (초, 시도마다 2배)
+
 system_message = """
 [지시사항]
 당신은 사용자가 입력한 키워드를 중심으로 제품 리뷰를 분석하고 요약하는 전문 분석가입니다.
@@ -50,21 +63,235 @@ system_message = """
 }
 """
 
+reduce_system_message = """
+[지시사항]
+당신은 같은 제품의 리뷰를 여러 묶음으로 나눠 분석한 부분 결과들을 하나로 합치는 전문 분석가입니다.
+입력으로 키워드 목록과, 묶음별 분석 결과(JSON) 목록이 주어집니다. 이를 종합하여 반드시 아래 제시된 JSON 형식으로 출력합니다.
+
+1. **제품명 (product_name)**: 부분 결과들의 제품명을 종합하여 가장 적절한 하나를 기입합니다.
+2. **종합 감정 요약 (overall_sentiment_summary)**: 부분 결과들의 종합 요약을 합쳐 한 문장으로 요약합니다.
+3. **키워드별 분석 (keywords_analysis)**: 각 키워드에 대해 부분 결과들의 긍정/부정 요약을 합쳐 각각 1~2문장으로 다시 요약합니다.
+    긍정/부정 언급 개수(positive_count, negative_count)는 부분 결과의 값을 그대로 더한 정수로 기입합니다.
+
+[제약사항]
+* 부분 결과에 없는 내용을 새로 만들지 않습니다.
+* 모든 부분 결과에서 언급이 부족하다고 한 항목은 '해당 키워드에 대한 구체적인 언급이 부족합니다.'라고 명시합니다.
+* 반드시 입력받은 키워드 목록에 대해서만 출력하며, 모든 출력은 JSON 형식이어야 합니다.
+
+[출력 형식]
+{
+  "product_name": "제품명",
+  "overall_sentiment_summary": "종합 요약 한 문장",
+  "keywords_analysis": [
+    {
+      "keyword": "키워드",
+      "positive_count": 0,
+      "negative_count": 0,
+      "positive_summary": "긍정 요약",
+      "negative_summary": "부정 요약"
+    }
+  ]
+}
+"""
+
 _chatbot_instance = None
+_reduce_chatbot_instance = None
+_instance_lock = threading.Lock()   # 동시 요청이 챗봇을 두 번 만들지 않도록 보호
+
+def _generation_config():
+    """ AI_STRUCTURED_OUTPUT이 켜져 있으면 응답을 분석 결과 스키마의 JSON으로 제한합니다. (코드 블록 표시 없음) """
+    if not current_app.config.get('AI_STRUCTURED_OUTPUT', True):
+        return None
+    return {"response_mime_type": "application/json", "response_schema": ANALYSIS_RESPONSE_SCHEMA}
 
 def get_chatbot():
     """ 챗봇 인스턴스를 가져오거나, 없으면 새로 생성하여 반환합니다. (싱글턴 패턴) """
     global _chatbot_instance
-    if _chatbot_instance is None:
-        _chatbot_instance = ChatBot(model="gemini-2.5-flash", system_message=system_message)
-        _chatbot_instance.init_app(current_app._get_current_object())
+    with _instance_lock:
+        if _chatbot_instance is None:
+            chatbot = ChatBot(model="gemini-2.5-flash", system_message=system_message,
+                              generation_config=_generation_config(), context_cache=True)
+            chatbot.init_app(current_app._get_current_object())
+            _chatbot_instance = chatbot
     return _chatbot_instance
 
+def get_reduce_chatbot():
+    """ map-reduce 분석의 reduce 단계(부분 결과 병합)용 챗봇 인스턴스를 반환합니다. """
+    global _reduce_chatbot_instance
+    with _instance_lock:
+        if _reduce_chatbot_instance is None:
+            chatbot = ChatBot(model="gemini-2.5-flash", system_message=reduce_system_message,
+                              generation_config=_generation_config(), context_cache=True)
+            chatbot.init_app(current_app._get_current_object())
+            _reduce_chatbot_instance = chatbot
+    return _reduce_chatbot_instance
+
 def analyze_reviews(keywords, review_data):
+    """
+    리뷰 분석은 매번 독립된 요청이므로 대화 세션 대신 단발 요청(generate)을 사용합니다.
+    반환값: AnalysisResult (응답을 해석할 수 없으면 AnalysisFormatError)
+    """
     chatbot = get_chatbot()
-    
-    chatbot.reset()
     prompt = f"keywords: {keywords}\nreview data: {review_data}"
-    ai_response = chatbot.get_response(user_input=prompt)
-    return ai_response
-    
+    ai_response = chatbot.generate(prompt)
+    return AnalysisResult.from_json(ai_response, keywords)
+
+def analyze_reviews_stream(keywords, review_data, on_item=None, on_field=None):
+    """
+    analyze_reviews의 스트리밍 버전입니다. 응답이 생성되는 동안 JSON을 점진적으로 파싱하여
+    키워드 분석 객체가 완성될 때마다 on_item(dict)을, 최상위 필드가 완성될 때마다 on_field(name, value)를 호출합니다.
+    반환값: AnalysisResult (analyze_reviews와 동일)
+    """
+    chatbot = get_chatbot()
+    prompt = f"keywords: {keywords}\nreview data: {review_data}"
+    parser = IncrementalJSONParser()
+    started = time.time()
+    first_item_at = None
+    for text in chatbot.generate_stream(prompt):
+        for completed in parser.feed(text):
+            try:
+                if completed[0] == "item":
+                    if first_item_at is None:
+                        first_item_at = time.time() - started
+                    if on_item:
+                        on_item(completed[1])
+                elif on_field:
+                    on_field(completed[1], completed[2])
+            except Exception as e:
+                print(f"WARNING: stream callback failed: {e}")
+    if first_item_at is not None:
+        print(f"LOG: First keyword result after {first_item_at:.2f}s, stream done in {time.time() - started:.2f}s")
+    return AnalysisResult.from_json(parser.text, keywords)
+
+def get_usage_stats():
+    """
+    분석/병합 챗봇의 누적 토큰 사용량과 컨텍스트 캐시 절감량, 재시도/헤징/서킷 브레이커 통계를 반환합니다.
+    (생성되지 않은 챗봇은 None)
+    """
+    return {
+        "analyzer": _chatbot_instance.usage_stats() if _chatbot_instance else None,
+        "reducer": _reduce_chatbot_instance.usage_stats() if _reduce_chatbot_instance else None,
+        "resilience": get_resilience_stats(),
+    }
+
+def count_tokens(text):
+    """ 모델의 토크나이저로 토큰 수를 셉니다. 실패하면 None을 반환합니다. (추정치로 대체) """
+    try:
+        return get_chatbot().count_tokens(text)
+    except Exception as e:
+        print(f"WARNING: count_tokens failed: {e}")
+        return None
+
+
+# ======================================================================
+#                          map-reduce 분석
+# ======================================================================
+
+def _analyze_chunk(chatbot, keywords, chunk_text, retries):
+    """
+    리뷰 문장 묶음 하나를 분석합니다. (대화 기록 없는 단발 요청, 실패 시 지수 백오프로 재시도)
+    일시적 오류 재시도는 호출 계층(resilience)에서 이미 했으므로, AI를 쓸 수 없으면 AIUnavailableError를 그대로 전달합니다.
+    """
+    prompt = f"keywords: {keywords}\nreview data: {chunk_text}"
+    for attempt in range(retries + 1):
+        try:
+            return AnalysisResult.from_json(chatbot.generate(prompt), keywords)
+        except AIUnavailableError:
+            raise
+        except Exception as e:
+            if attempt == retries:
+                print(f"WARNING: chunk analysis failed after {retries + 1} attempts: {e}")
+                return None
+            time.sleep(RETRY_BACKOFF * (2 ** attempt))
+
+def _merge_counts(keywords, partials):
+    """ 부분 결과들의 키워드별 긍정/부정 개수를 더하고, 키워드별 요약 목록을 모읍니다. """
+    merged = {k: {"keyword": k, "positive_count": 0, "negative_count": 0,
+                  "positive_summaries": [], "negative_summaries": []} for k in keywords}
+    for partial in partials:
+        for item in partial.keywords_analysis:
+            entry = merged.get(item.keyword)
+            if entry is None:
+                continue
+            entry["positive_count"] += item.positive_count
+            entry["negative_count"] += item.negative_count
+            if item.positive_summary != INSUFFICIENT_SUMMARY:
+                entry["positive_summaries"].append(item.positive_summary)
+            if item.negative_summary != INSUFFICIENT_SUMMARY:
+                entry["negative_summaries"].append(item.negative_summary)
+    return merged
+
+def _fallback_reduce(keywords, partials, merged):
+    """ reduce 호출이 실패했을 때 부분 결과를 규칙으로 합칩니다. (요약은 첫 번째 유효한 요약 사용) """
+    names = [p.product_name for p in partials if p.product_name]
+    overall = [p.overall_sentiment_summary for p in partials if p.overall_sentiment_summary]
+    return AnalysisResult(
+        product_name=names[0] if names else "",
+        overall_sentiment_summary=overall[0] if overall else "",
+        keywords_analysis=[
+            KeywordAnalysis(
+                keyword=k,
+                positive_count=merged[k]["positive_count"],
+                negative_count=merged[k]["negative_count"],
+                positive_summary=(merged[k]["positive_summaries"] or [INSUFFICIENT_SUMMARY])[0],
+                negative_summary=(merged[k]["negative_summaries"] or [INSUFFICIENT_SUMMARY])[0],
+            )
+            for k in keywords
+        ],
+    )
+
+def analyze_reviews_map_reduce(keywords, chunks, max_concurrency=None, retries=None):
+    """
+    리뷰 문장 묶음(chunks)들을 동시에 분석(map)한 뒤, 부분 결과를 하나로 합칩니다(reduce).
+    긍정/부정 개수는 코드에서 더하고, 요약은 reduce 호출로 다시 요약합니다. (실패 시 규칙 기반 병합)
+    반환값: AnalysisResult (analyze_reviews와 동일)
+    일부 묶음만 분석에 실패하면 그 묶음의 개수는 빠지므로, coverage=(분석한 묶음 수, 전체 묶음 수)를 채운
+    부분 결과(partial)를 반환합니다. 호출한 쪽은 이 결과를 캐시하지 않아야 합니다.
+    """
+    chunks = list(chunks)
+    if len(chunks) <= 1:
+        return analyze_reviews(keywords, chunks[0] if chunks else "")
+
+    config = current_app.config
+    max_concurrency = max_concurrency or config.get('AI_MAX_CONCURRENCY', DEFAULT_MAX_CONCURRENCY)
+    retries = config.get('AI_CHUNK_RETRIES', DEFAULT_CHUNK_RETRIES) if retries is None else retries
+    chatbot = get_chatbot()
+
+    started = time.time()
+    unavailable = []
+
+    def _map(chunk):
+        try:
+            return _analyze_chunk(chatbot, keywords, chunk, retries)
+        except AIUnavailableError as e:
+            unavailable.append(e)
+            return None
+
+    with ThreadPoolExecutor(max_workers=min(max_concurrency, len(chunks))) as pool:
+        results = list(pool.map(_map, chunks))
+    partials = [r for r in results if r is not None]
+    print(f"LOG: Map phase done: {len(partials)}/{len(chunks)} chunks in {time.time() - started:.2f}s")
+    if not partials:
+        if unavailable:
+            raise unavailable[0]
+        raise RuntimeError("모든 리뷰 묶음의 AI 분석에 실패했습니다.")
+
+    merged = _merge_counts(keywords, partials)
+    try:
+        reduce_input = json.dumps([p.to_dict() for p in partials], ensure_ascii=False)
+        reduced = AnalysisResult.from_json(
+            get_reduce_chatbot().generate(f"keywords: {keywords}\npartial results: {reduce_input}"), keywords
+        )
+        # 개수는 모델의 계산 대신 코드에서 더한 값을 사용합니다.
+        for item in reduced.keywords_analysis:
+            item.positive_count = merged[item.keyword]["positive_count"]
+            item.negative_count = merged[item.keyword]["negative_count"]
+    except Exception as e:
+        print(f"WARNING: reduce call failed, merging partial results by rule: {e}")
+        reduced = _fallback_reduce(keywords, partials, merged)
+
+    if len(partials) < len(chunks):
+        print(f"WARNING: {len(chunks) - len(partials)}/{len(chunks)} chunks failed, counts cover only analyzed chunks")
+        reduced.coverage = (len(partials), len(chunks))
+    print(f"LOG: Map-reduce analysis done in {time.time() - started:.2f}s")
+    return reduced
@@ -1,41 +1,320 @@
 # RA/review_analyzer/ai/chatbot.py
 
+"""
+Gemini 모델 호출을 감싸는 ChatBot 모듈입니다.
+
+- generate/generate_stream/count_tokens: 대화 기록 없는 단발 요청입니다. 요청마다 상태를 남기지 않으므로
+  여러 분석 요청/스레드에서 하나의 모델 인스턴스(같은 API 클라이언트)를 동시에 호출해도 안전합니다.
+- 동시성 제한: 프로세스 전체에서 동시에 보내는 Gemini 요청 수를 AI_MAX_CONCURRENT_REQUESTS로 제한합니다.
+- 타임아웃: 요청마다 AI_REQUEST_TIMEOUT(초)을 적용하고, 한도가 찬 상태로 AI_ACQUIRE_TIMEOUT(초)을 넘겨 기다리면
+  ChatBotBusyError를 발생시킵니다.
+- get_response/reset: 대화형 세션(기록 유지)이 필요할 때만 사용하며, lock으로 직렬화됩니다.
+- 컨텍스트 캐싱: context_cache=True이고 AI_CONTEXT_CACHE가 켜져 있으면 고정된 system_message를
+  Gemini 컨텍스트 캐시(CachedContent)로 한 번 올려 두고, 요청마다 다시 보내지 않습니다.
+  만료 AI_CONTEXT_CACHE_REFRESH(초) 전에 TTL을 연장하며, 모델/SDK가 지원하지 않거나 생성에 실패하면
+  system_message를 요청마다 보내는 기존 방식으로 동작합니다.
+  명시적 캐시는 모델별 최소 토큰 수(Gemini 2.5 Flash 기준 1,024 토큰 이상)를 넘는 접두부만 만들 수 있는데,
+  현재 system_message는 수백 토큰이라 생성이 거부되므로 AI_CONTEXT_CACHE는 기본으로 꺼 둡니다.
+  (system_message가 최소 토큰 수를 넘도록 커졌을 때만 켜서 사용)
+- 사용량 통계: 응답의 usage_metadata로 프롬프트 토큰 수와 캐시에서 처리된 토큰 수를 누적합니다. (usage_stats)
+  명시적 캐시가 없어도 Gemini가 같은 접두부를 자동으로 재사용한 암묵적 캐시 적중분이
+  cached_content_token_count로 보고되므로, 절감 효과는 이 값으로 측정합니다.
+- 복원력: 응답 생성 요청은 재시도(지수 백오프)/헤징/서킷 브레이커 계층(resilience.ResilientCaller)을 거칩니다.
+"""
+
+import time
+import itertools
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+
 import google.generativeai as genai
 from flask import current_app
 
+try:
+    from google.generativeai import caching  # 컨텍스트 캐싱 (SDK 버전에 따라 없을 수 있음)
+except ImportError:
+    caching = None
+
+from . import resilience
+from .resilience import AIUnavailableError
+
+# --- 기본 설정 (config.py에서 덮어쓸 수 있음) ---
+DEFAULT_MAX_CONCURRENT_REQUESTS = 8   # 프로세스 전체의 동시 Gemini 요청 수
+DEFAULT_REQUEST_TIMEOUT = 120         # 요청 1건의 타임아웃 (초)
+DEFAULT_ACQUIRE_TIMEOUT = 60          # 요청 슬롯을 기다리는 최대 시간 (초)
+DEFAULT_CONTEXT_CACHE = False        # system_message가 명시적 캐시 최소 토큰 수보다 짧아 기본으로 사용하지 않음
+DEFAULT_CONTEXT_CACHE_TTL = 60 * 60   # system_message 컨텍스트 캐시의 TTL (초)
+DEFAULT_CONTEXT_CACHE_REFRESH = 5 * 60  # 만료 이 시간 전에 TTL을 연장 (초)
+
+
+class ChatBotBusyError(AIUnavailableError):
+    """ 동시 요청 한도가 가득 차 제한 시간 안에 Gemini 요청을 보내지 못했을 때 발생하는 예외입니다. """
+
+
+# 모든 ChatBot 인스턴스(분석용, reduce용 등)가 공유하는 동시 요청 제한
+_request_limiter = None
+_request_limiter_lock = threading.Lock()
+
+def _get_request_limiter(max_concurrent_requests):
+    global _request_limiter
+    with _request_limiter_lock:
+        if _request_limiter is None:
+            _request_limiter = threading.BoundedSemaphore(max_concurrent_requests)
+        return _request_limiter
+
+
+# 모든 ChatBot 인스턴스가 공유하는 재시도/헤징/서킷 브레이커 계층 (같은 제공자이므로 상태를 공유)
+_resilient_caller = None
+
+def _get_resilient_caller(config):
+    global _resilient_caller
+    limiter = _get_request_limiter(config.get('AI_MAX_CONCURRENT_REQUESTS', DEFAULT_MAX_CONCURRENT_REQUESTS))
+    with _request_limiter_lock:
+        if _resilient_caller is None:
+            _resilient_caller = resilience.ResilientCaller(
+                retries=config.get('AI_RETRIES', resilience.DEFAULT_RETRIES),
+                backoff=config.get('AI_RETRY_BACKOFF', resilience.DEFAULT_RETRY_BACKOFF),
+                max_backoff=config.get('AI_RETRY_MAX_BACKOFF', resilience.DEFAULT_RETRY_MAX_BACKOFF),
+                deadline=config.get('AI_CALL_DEADLINE', resilience.DEFAULT_CALL_DEADLINE),
+                hedge=config.get('AI_HEDGE', resilience.DEFAULT_HEDGE),
+                hedge_percentile=config.get('AI_HEDGE_PERCENTILE', resilience.DEFAULT_HEDGE_PERCENTILE),
+                hedge_min_samples=config.get('AI_HEDGE_MIN_SAMPLES', resilience.DEFAULT_HEDGE_MIN_SAMPLES),
+                hedge_budget=config.get('AI_HEDGE_BUDGET', resilience.DEFAULT_HEDGE_BUDGET),
+                breaker=resilience.CircuitBreaker(
+                    failure_threshold=config.get('AI_CIRCUIT_FAILURE_THRESHOLD',
+                                                 resilience.DEFAULT_CIRCUIT_FAILURE_THRESHOLD),
+                    reset_timeout=config.get('AI_CIRCUIT_RESET_TIMEOUT', resilience.DEFAULT_CIRCUIT_RESET_TIMEOUT),
+                ),
+                limiter=limiter,
+                max_workers=config.get('AI_MAX_CONCURRENT_REQUESTS', DEFAULT_MAX_CONCURRENT_REQUESTS),
+            )
+        return _resilient_caller
+
+def get_resilience_stats():
+    """ 재시도/헤징/서킷 브레이커 통계를 반환합니다. (아직 호출 계층이 없으면 None) """
+    return _resilient_caller.stats() if _resilient_caller else None
+
+
 class ChatBot:
-    def __init__(self, model, system_message="You are a helpful assistant."):
+    def __init__(self, model, system_message="You are a helpful assistant.", generation_config=None,
+                 context_cache=False):
         self.model_name = model
         self.system_message = system_message
+        self.generation_config = generation_config   # 예: 응답 스키마(response_schema) 지정
+        self.context_cache = context_cache           # system_message를 컨텍스트 캐시로 보낼지 여부
         self.model = None
         self.chat = None
+        self._token_model = None      # count_tokens용 모델 (system_message/컨텍스트 캐시 없이 입력 텍스트만 셈)
         self.is_initialized = False
 
+        self.request_timeout = DEFAULT_REQUEST_TIMEOUT
+        self.acquire_timeout = DEFAULT_ACQUIRE_TIMEOUT
+        self._limiter = None
+        self._caller = None           # 재시도/헤징/서킷 브레이커 (resilience.ResilientCaller)
+        self._chat_lock = threading.Lock()
+
+        self.cache_ttl = DEFAULT_CONTEXT_CACHE_TTL
+        self.cache_refresh = DEFAULT_CONTEXT_CACHE_REFRESH
+        self._cached_content = None   # 현재 사용 중인 CachedContent (없으면 system_message를 매번 전송)
+        self._cache_expires_at = None
+        self._cache_lock = threading.Lock()
+
+        self._usage = {"requests": 0, "prompt_tokens": 0, "cached_tokens": 0, "prefix_tokens": 0}
+        self._usage_lock = threading.Lock()
+
+    def _new_model(self):
+        if self._cached_content is not None:
+            return genai.GenerativeModel.from_cached_content(
+                cached_content=self._cached_content,
+                generation_config=self.generation_config,
+            )
+        return genai.GenerativeModel(
+            model_name=self.model_name,
+            system_instruction=self.system_message,
+            generation_config=self.generation_config,
+        )
+
+    # ------------------------------------------------------------------
+    # system_message 컨텍스트 캐시
+    # ------------------------------------------------------------------
+    def _create_context_cache(self):
+        """ system_message를 컨텍스트 캐시로 만듭니다. 실패하면 False (system_message를 요청마다 전송) """
+        if caching is None:
+            print("WARNING: google.generativeai.caching is unavailable, sending system_message with each request")
+            return False
+        try:
+            self._cached_content = caching.CachedContent.create(
+                model=self.model_name,
+                system_instruction=self.system_message,
+                ttl=timedelta(seconds=self.cache_ttl),
+            )
+            self._cache_expires_at = time.time() + self.cache_ttl
+            prefix_tokens = getattr(getattr(self._cached_content, 'usage_metadata', None), 'total_token_count', 0)
+            with self._usage_lock:
+                self._usage["prefix_tokens"] = prefix_tokens or 0
+            print(f"LOG: Context cache created for {self.model_name} ({prefix_tokens} tokens, ttl={self.cache_ttl}s)")
+            return True
+        except Exception as e:
+            # 최소 토큰 수 미달, 미지원 모델 등
+            print(f"WARNING: Context cache unavailable for {self.model_name}, "
+                  f"sending system_message with each request: {e}")
+            self._cached_content = None
+            self._cache_expires_at = None
+            return False
+
+    def _refresh_context_cache(self):
+        """ 캐시 만료가 가까우면 TTL을 연장하고, 연장에 실패하면 새로 만들거나 캐시 없이 동작하도록 전환합니다. """
+        if self._cache_expires_at is None or time.time() < self._cache_expires_at - self.cache_refresh:
+            return
+        with self._cache_lock:
+            if self._cache_expires_at is None or time.time() < self._cache_expires_at - self.cache_refresh:
+                return
+            try:
+                self._cached_content.update(ttl=timedelta(seconds=self.cache_ttl))
+                self._cache_expires_at = time.time() + self.cache_ttl
+                return
+            except Exception as e:
+                print(f"WARNING: Context cache TTL update failed, recreating: {e}")
+            self._cached_content = None
+            self._cache_expires_at = None
+            self._create_context_cache()
+            # 이후 요청은 새 캐시(또는 캐시 없음)로 만든 모델을 사용합니다.
+            with self._chat_lock:
+                self.model = self._new_model()
+                self.chat = self.model.start_chat(history=[])
+
+    def _record_usage(self, response):
+        usage = getattr(response, 'usage_metadata', None)
+        if usage is None:
+            return
+        with self._usage_lock:
+            self._usage["requests"] += 1
+            self._usage["prompt_tokens"] += getattr(usage, 'prompt_token_count', 0) or 0
+            self._usage["cached_tokens"] += getattr(usage, 'cached_content_token_count', 0) or 0
+
+    def usage_stats(self):
+        """ 누적 프롬프트 토큰 수와 그중 캐시(명시적/암묵적)에서 처리된 토큰 수(절감분)를 반환합니다. """
+        with self._usage_lock:
+            stats = dict(self._usage)
+        stats["context_cache"] = getattr(self._cached_content, 'name', None)
+        stats["cached_ratio"] = round(stats["cached_tokens"] / stats["prompt_tokens"], 4) if stats["prompt_tokens"] else 0.0
+        return stats
+
     def init_app(self, app):
         """ Flask 앱 컨텍스트 안에서 API 키로 모델을 초기화합니다. """
         with app.app_context():
             try:
-                api_key = current_app.config['GOOGLE_API_KEY']
+                config = current_app.config
+                api_key = config['GOOGLE_API_KEY']
                 genai.configure(api_key=api_key)
-                self.model = genai.GenerativeModel(
-                    model_name=self.model_name,
-                    system_instruction=self.system_message,
-                )
+                self.cache_ttl = config.get('AI_CONTEXT_CACHE_TTL', DEFAULT_CONTEXT_CACHE_TTL)
+                self.cache_refresh = config.get('AI_CONTEXT_CACHE_REFRESH', DEFAULT_CONTEXT_CACHE_REFRESH)
+                if self.context_cache and config.get('AI_CONTEXT_CACHE', DEFAULT_CONTEXT_CACHE):
+                    self._create_context_cache()
+                self.model = self._new_model()
                 self.chat = self.model.start_chat(history=[])
+                self._token_model = genai.GenerativeModel(model_name=self.model_name)
+
+                self.request_timeout = config.get('AI_REQUEST_TIMEOUT', DEFAULT_REQUEST_TIMEOUT)
+                self.acquire_timeout = config.get('AI_ACQUIRE_TIMEOUT', DEFAULT_ACQUIRE_TIMEOUT)
+                self._limiter = _get_request_limiter(
+                    config.get('AI_MAX_CONCURRENT_REQUESTS', DEFAULT_MAX_CONCURRENT_REQUESTS)
+                )
+                self._caller = _get_resilient_caller(config)
                 self.is_initialized = True
             except KeyError:
                 raise ValueError("config.py에 GOOGLE_API_KEY가 설정되지 않았습니다.")
             except Exception as e:
                 raise RuntimeError(f"Google Generative AI 설정 중 오류 발생: {e}")
 
+    @contextmanager
+    def _client(self):
+        """ 동시 요청 슬롯을 얻은 뒤 현재 모델을 넘겨주고, 사용이 끝나면 슬롯을 반납합니다. """
+        if not self.is_initialized:
+            raise RuntimeError("ChatBot이 초기화되지 않았습니다. init_app()을 먼저 호출해야 합니다.")
+        if not self._limiter.acquire(timeout=self.acquire_timeout):
+            raise ChatBotBusyError("AI 요청이 많아 처리하지 못했습니다. 잠시 후 다시 시도해주세요.")
+        try:
+            self._refresh_context_cache()
+            yield self.model
+        finally:
+            self._limiter.release()
+
+    def _request_options(self, timeout=None, remaining=None):
+        """ 요청 타임아웃: 지정값(없으면 AI_REQUEST_TIMEOUT)과 호출 제한 시간까지 남은 시간 중 짧은 쪽 """
+        timeout = timeout or self.request_timeout
+        return {"timeout": min(timeout, remaining) if remaining is not None else timeout}
+
     def get_response(self, user_input):
-        """ 사용자 입력을 모델에 보내고, 텍스트 응답을 반환합니다. """
+        """ 사용자 입력을 대화 세션에 보내고, 텍스트 응답을 반환합니다. (대화 기록 유지, 직렬화됨) """
+        if not self.is_initialized:
+            raise RuntimeError("ChatBot이 초기화되지 않았습니다. init_app()을 먼저 호출해야 합니다.")
+        def _send(remaining):
+            self._refresh_context_cache()
+            with self._chat_lock:
+                response = self.chat.send_message(user_input, request_options=self._request_options(remaining=remaining))
+            self._record_usage(response)
+            return response.text
+
+        # 대화 기록에 같은 메시지가 두 번 쌓이지 않도록 헤징하지 않습니다.
+        return self._caller.call(_send, hedge=False)
+
+    def generate(self, user_input, timeout=None):
+        """ 대화 기록 없이 단발성으로 응답을 생성합니다. (여러 스레드에서 동시에 호출 가능, 재시도/헤징 적용) """
+        if not self.is_initialized:
+            raise RuntimeError("ChatBot이 초기화되지 않았습니다. init_app()을 먼저 호출해야 합니다.")
+
+        def _generate(remaining):
+            with self._client() as model:
+                response = model.generate_content(user_input, request_options=self._request_options(timeout, remaining))
+            self._record_usage(response)
+            return response.text
+
+        return self._caller.call(_generate)
+
+    def generate_stream(self, user_input, timeout=None):
+        """
+        대화 기록 없이 응답을 스트리밍으로 생성하여, 도착하는 텍스트 조각을 차례로 흘려보냅니다.
+        (스트림을 다 읽거나 닫을 때까지 요청 슬롯을 점유합니다.)
+        첫 조각을 받기 전까지의 실패만 재시도하며, 스트림 도중의 일시적 오류는 AIUnavailableError로 전달합니다.
+        """
         if not self.is_initialized:
             raise RuntimeError("ChatBot이 초기화되지 않았습니다. init_app()을 먼저 호출해야 합니다.")
-        response = self.chat.send_message(user_input)
-        return response.text
+        with self._client() as model:
+            def _open(remaining):
+                response = model.generate_content(
+                    user_input, stream=True, request_options=self._request_options(timeout, remaining))
+                chunks = iter(response)
+                return response, list(itertools.islice(chunks, 1)), chunks
+
+            response, first, chunks = self._caller.call(_open, hedge=False)
+            try:
+                for chunk in itertools.chain(first, chunks):
+                    try:
+                        text = chunk.text
+                    except ValueError:
+                        # 안전 필터 등으로 텍스트가 없는 조각은 건너뜁니다.
+                        continue
+                    if text:
+                        yield text
+            except Exception as e:
+                if not resilience.is_retryable(e):
+                    raise
+                self._caller.breaker.record_failure()
+                raise AIUnavailableError(f"AI 응답 스트림이 중단되었습니다: {e}") from e
+            self._record_usage(response)
+
+    def count_tokens(self, text):
+        """
+        모델의 토크나이저로 text의 토큰 수를 셉니다.
+        system_message(또는 컨텍스트 캐시)가 함께 세어지지 않도록 시스템 지시가 없는 모델로 셉니다.
+        """
+        with self._client():
+            return self._token_model.count_tokens(text, request_options=self._request_options()).total_tokens
 
     def reset(self):
         """ 대화 기록을 초기화하여 새로운 대화를 시작합니다. """
         if self.model:
-            self.chat = self.model.start_chat(history=[])
\ No newline at end of file
+            with self._chat_lock:
+                self.chat = self.model.start_chat(history=[])
@@ -0,0 +1,273 @@
+# RA/review_analyzer/ai/resilience.py
+
+"""
+Gemini 호출을 감싸는 복원력(resilience) 계층입니다.
+느리거나 429(요청 한도 초과)로 실패하는 응답 하나 때문에 분석 요청 전체가 멈추지 않도록 합니다.
+
+- 재시도: 요청 한도 초과/일시적 서버 오류/타임아웃이면 지수 백오프(+지터)로 다시 시도합니다.
+  전체 호출 시간은 AI_CALL_DEADLINE(초)을 넘기지 않습니다.
+- 헤징(hedging): 최근 응답 시간의 p95가 지나도록 응답이 없으면 같은 요청을 하나 더 보내고, 먼저 끝난 응답을 씁니다.
+  헤지 요청은 전체 호출의 AI_HEDGE_BUDGET 비율까지만, 동시 요청 슬롯에 여유가 있을 때만 보냅니다.
+  (한도가 찬 상태에서 헤지하면 다른 요청의 슬롯을 빼앗아 대기열만 길어지기 때문)
+- 서킷 브레이커: 재시도까지 모두 실패한 호출이 연속 AI_CIRCUIT_FAILURE_THRESHOLD번 나면 AI_CIRCUIT_RESET_TIMEOUT(초) 동안
+  호출 없이 즉시 실패(CircuitOpenError)하고, 이후 한 번의 시험 호출로 회복 여부를 확인합니다.
+"""
+
+import time
+import random
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+try:
+    from google.api_core import exceptions as api_exceptions  # google-generativeai의 의존성
+except ImportError:
+    api_exceptions = None
+
+# --- 기본 설정 (config.py에서 덮어쓸 수 있음) ---
+DEFAULT_RETRIES = 3                  # 일시적 오류 시 재시도 횟수
+DEFAULT_RETRY_BACKOFF = 1.0          # 재시도 대기 시간 기본값 (초, 시도마다 2배)
+DEFAULT_RETRY_MAX_BACKOFF = 30.0     # 재시도 대기 시간 상한 (초)
+DEFAULT_CALL_DEADLINE = 180          # 재시도를 포함한 호출 1건의 전체 제한 시간 (초)
+DEFAULT_HEDGE = True
+DEFAULT_HEDGE_PERCENTILE = 95        # 이 백분위 응답 시간이 지나면 헤지 요청을 보냄
+DEFAULT_HEDGE_MIN_SAMPLES = 20       # 응답 시간 표본이 이만큼 모이기 전에는 헤징하지 않음
+DEFAULT_HEDGE_BUDGET = 0.05          # 헤지 요청은 전체 호출 수의 이 비율까지만 보냄
+DEFAULT_CIRCUIT_FAILURE_THRESHOLD = 5
+DEFAULT_CIRCUIT_RESET_TIMEOUT = 60   # 서킷이 열린 뒤 시험 호출까지 기다리는 시간 (초)
+
+# 서킷 브레이커 상태
+STATE_CLOSED = 'closed'
+STATE_OPEN = 'open'
+STATE_HALF_OPEN = 'half_open'
+
+_RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class AIUnavailableError(RuntimeError):
+    """ 재시도/제한 시간 안에 AI 응답을 받지 못했을 때 발생하는 예외입니다. (캐시/부분 결과로 대체 가능) """
+
+
+class CircuitOpenError(AIUnavailableError):
+    """ 서킷 브레이커가 열려 있어 AI를 호출하지 않고 즉시 실패할 때 발생하는 예외입니다. """
+
+
+def is_retryable(exc):
+    """ 다시 시도하면 성공할 수 있는 오류(요청 한도 초과, 일시적 서버 오류, 타임아웃)인지 판단합니다. """
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    if api_exceptions is not None and isinstance(exc, (
+            api_exceptions.ResourceExhausted, api_exceptions.TooManyRequests,
+            api_exceptions.ServiceUnavailable, api_exceptions.DeadlineExceeded,
+            api_exceptions.InternalServerError, api_exceptions.GatewayTimeout)):
+        return True
+    return getattr(exc, 'code', None) in _RETRYABLE_STATUS_CODES
+
+
+def is_rate_limited(exc):
+    if api_exceptions is not None and isinstance(exc, (api_exceptions.ResourceExhausted, api_exceptions.TooManyRequests)):
+        return True
+    return getattr(exc, 'code', None) == 429
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=DEFAULT_CIRCUIT_FAILURE_THRESHOLD, reset_timeout=DEFAULT_CIRCUIT_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """ 호출해도 되면 True. 열린 상태면 reset_timeout이 지난 뒤 시험 호출 한 건만 허용합니다. """
+        with self._lock:
+            if self.state == STATE_CLOSED:
+                return True
+            if self.state == STATE_OPEN and time.time() - self.opened_at >= self.reset_timeout:
+                self.state = STATE_HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == STATE_HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != STATE_CLOSED:
+                print("LOG: Gemini circuit closed")
+            self.state = STATE_CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == STATE_HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != STATE_OPEN:
+                    print(f"WARNING: Gemini circuit opened after {self.failures} failures")
+                self.state = STATE_OPEN
+                self.opened_at = time.time()
+                self._trial_in_flight = False
+
+    def release_trial(self):
+        """ 시험 호출이 제공자와 무관한 이유로 끝났을 때, 다음 호출이 다시 시험할 수 있게 합니다. """
+        with self._lock:
+            self._trial_in_flight = False
+
+    def snapshot(self):
+        with self._lock:
+            return {"state": self.state, "failures": self.failures}
+
+
+class LatencyTracker:
+    """ 최근 성공 응답 시간을 보관하고 백분위 값을 계산합니다. (헤징 기준) """
+
+    def __init__(self, window=200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, p, min_samples):
+        with self._lock:
+            if len(self._samples) < min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+
+class ResilientCaller:
+    def __init__(self, retries=DEFAULT_RETRIES, backoff=DEFAULT_RETRY_BACKOFF, max_backoff=DEFAULT_RETRY_MAX_BACKOFF,
+                 deadline=DEFAULT_CALL_DEADLINE, hedge=DEFAULT_HEDGE, hedge_percentile=DEFAULT_HEDGE_PERCENTILE,
+                 hedge_min_samples=DEFAULT_HEDGE_MIN_SAMPLES, hedge_budget=DEFAULT_HEDGE_BUDGET, breaker=None,
+                 limiter=None, max_workers=8):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.deadline = deadline
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_budget = hedge_budget
+        self.breaker = breaker or CircuitBreaker()
+        self.limiter = limiter        # fn이 사용하는 동시 요청 세마포어 (빈 슬롯이 있을 때만 헤징)
+        self.latency = LatencyTracker()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='gemini-call')
+        self._stats = {"calls": 0, "retries": 0, "rate_limited": 0, "hedged": 0, "hedge_wins": 0, "rejected": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key):
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    def _take_hedge(self):
+        """ 헤지 예산(전체 호출 대비 비율)과 동시 요청 슬롯에 여유가 있으면 헤지 1건을 기록하고 True를 반환합니다. """
+        if self.limiter is not None:
+            # 슬롯을 잡아 두지는 않고 여유만 확인합니다. (헤지 요청은 fn 안에서 슬롯을 직접 얻음)
+            if not self.limiter.acquire(blocking=False):
+                return False
+            self.limiter.release()
+        with self._stats_lock:
+            if self._stats["hedged"] + 1 > self._stats["calls"] * self.hedge_budget:
+                return False
+            self._stats["hedged"] += 1
+            return True
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["circuit"] = self.breaker.snapshot()
+        stats["p95_latency"] = self.latency.percentile(self.hedge_percentile, self.hedge_min_samples)
+        return stats
+
+    def call(self, fn, hedge=True):
+        """
+        fn(remaining)을 재시도/헤징/서킷 브레이커로 감싸 호출하고 결과를 반환합니다.
+        remaining은 전체 제한 시간(deadline)까지 남은 시간(초)이며, fn은 이 값을 넘지 않도록 요청 타임아웃을 잡아야 합니다.
+        (헤징하지 않는 시도는 호출한 스레드에서 그대로 실행되므로, 제한 시간은 요청 타임아웃으로만 지켜집니다.)
+        hedge=False면 헤지 요청을 보내지 않습니다. (대화 기록처럼 두 번 실행되면 안 되는 호출)
+        일시적 오류로 끝내 실패하면 AIUnavailableError, 서킷이 열려 있으면 CircuitOpenError를 발생시킵니다.
+        서킷 브레이커에는 재시도 시도마다가 아니라 호출 1건당 한 번만 실패를 기록합니다.
+        """
+        self._count("calls")
+        if not self.breaker.allow():
+            self._count("rejected")
+            raise CircuitOpenError("AI 분석 서비스가 일시적으로 원활하지 않습니다. 잠시 후 다시 시도해주세요.")
+        started = time.time()
+        for attempt in range(self.retries + 1):
+            try:
+                if self.deadline - (time.time() - started) <= 0:
+                    raise TimeoutError("AI 응답 제한 시간을 초과했습니다.")
+                result = self._call_once(fn, hedge and self.hedge, started)
+            except AIUnavailableError:
+                # 로컬 대기열 포화(ChatBotBusyError) 등은 제공자 상태와 무관하므로 서킷에 반영하지 않고 그대로 전달합니다.
+                self.breaker.release_trial()
+                raise
+            except Exception as e:
+                if not is_retryable(e):
+                    # 잘못된 요청 등은 제공자 상태를 알려 주지 않으므로 실패로 세지 않고,
+                    # 반열림 상태의 시험 호출이었다면 서킷을 닫지 않은 채 다음 호출이 다시 시험하게 합니다.
+                    self.breaker.release_trial()
+                    raise
+                if is_rate_limited(e):
+                    self._count("rate_limited")
+                delay = min(self.max_backoff, self.backoff * (2 ** attempt)) * random.uniform(0.5, 1.0)
+                if attempt == self.retries or time.time() - started + delay >= self.deadline:
+                    self.breaker.record_failure()
+                    raise AIUnavailableError(f"AI 응답을 받지 못했습니다: {e}") from e
+                print(f"WARNING: Gemini call failed ({type(e).__name__}), retrying in {delay:.1f}s")
+                self._count("retries")
+                time.sleep(delay)
+                continue
+            self.breaker.record_success()
+            return result
+
+    def _timed(self, fn, started):
+        """ fn을 실행하고 (결과, 실행 시간)을 반환합니다. (실행기 대기열에서 기다린 시간은 응답 시간에서 제외) """
+        call_started = time.time()
+        remaining = self.deadline - (call_started - started)
+        if remaining <= 0:
+            raise TimeoutError("AI 응답 제한 시간을 초과했습니다.")
+        result = fn(remaining)
+        return result, time.time() - call_started
+
+    def _call_once(self, fn, hedge, started):
+        hedge_after = self.latency.percentile(self.hedge_percentile, self.hedge_min_samples) if hedge else None
+        if hedge_after is None:
+            result, elapsed = self._timed(fn, started)
+            self.latency.add(elapsed)
+            return result
+
+        # 헤징: 첫 요청이 p95 안에 끝나지 않으면 같은 요청을 하나 더 보내고, 먼저 성공한 응답을 사용합니다.
+        remaining = max(0.0, self.deadline - (time.time() - started))
+        futures = [self._executor.submit(self._timed, fn, started)]
+        done, _ = wait(futures, timeout=min(hedge_after, remaining))
+        if not done and time.time() - started < self.deadline and self._take_hedge():
+            futures.append(self._executor.submit(self._timed, fn, started))
+
+        error = None
+        pending = set(futures)
+        try:
+            while pending:
+                remaining = self.deadline - (time.time() - started)
+                if remaining <= 0:
+                    raise TimeoutError("AI 응답 제한 시간을 초과했습니다.")
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is None:
+                        if future is not futures[0]:
+                            self._count("hedge_wins")
+                        result, elapsed = future.result()
+                        self.latency.add(elapsed)
+                        return result
+                    error = future.exception()
+            raise error
+        finally:
+            # 진 요청/제한 시간이 지난 요청은 취소합니다. (아직 실행기 대기열에 있는 요청만 취소되고,
+            # 이미 실행 중인 요청은 request_options의 timeout으로 끝나며 결과는 버려집니다.)
+            for future in pending:
+                future.cancel()
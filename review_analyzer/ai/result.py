@@ -0,0 +1,154 @@
+# RA/review_analyzer/ai/result.py
+
+"""
+AI 분석 결과를 담는 타입 객체와, 모델에 요청할 응답 스키마(response_schema)를 정의하는 모듈입니다.
+모델 응답은 여기서 한 번만 파싱/검증하여 AnalysisResult로 만들고, 이후 facade/DB 계층은 이 객체를 그대로 넘겨받습니다.
+JSON 문자열이 필요한 곳(API 응답, DB 저장)에서는 to_json()으로 한 번만 직렬화합니다.
+"""
+
+import json
+from dataclasses import dataclass, field, asdict
+
+from ..keyword_matcher import normalize_text
+
+INSUFFICIENT_SUMMARY = '해당 키워드에 대한 구체적인 언급이 부족합니다.'
+UNAVAILABLE_SUMMARY = 'AI 분석 서비스가 일시적으로 원활하지 않아 분석하지 못했습니다. 잠시 후 다시 시도해주세요.'
+
+# system_message의 [출력 형식]과 같은 구조의 응답 스키마 (GenerationConfig.response_schema)
+ANALYSIS_RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "product_name": {"type": "STRING"},
+        "overall_sentiment_summary": {"type": "STRING"},
+        "keywords_analysis": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "keyword": {"type": "STRING"},
+                    "positive_count": {"type": "INTEGER"},
+                    "negative_count": {"type": "INTEGER"},
+                    "positive_summary": {"type": "STRING"},
+                    "negative_summary": {"type": "STRING"},
+                },
+                "required": ["keyword", "positive_count", "negative_count", "positive_summary", "negative_summary"],
+            },
+        },
+    },
+    "required": ["product_name", "overall_sentiment_summary", "keywords_analysis"],
+}
+
+
+class AnalysisFormatError(ValueError):
+    """ 모델 응답을 분석 결과 형식으로 해석할 수 없을 때 발생하는 예외입니다. (원본 텍스트를 raw_text로 보관) """
+
+    def __init__(self, message, raw_text=None):
+        super().__init__(message)
+        self.raw_text = raw_text
+
+
+def _as_int(value):
+    try:
+        return max(0, int(value or 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _as_str(value):
+    return value if isinstance(value, str) else ("" if value is None else str(value))
+
+
+@dataclass
+class KeywordAnalysis:
+    keyword: str
+    positive_count: int = 0
+    negative_count: int = 0
+    positive_summary: str = INSUFFICIENT_SUMMARY
+    negative_summary: str = INSUFFICIENT_SUMMARY
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            keyword=_as_str(data.get("keyword")).strip(),
+            positive_count=_as_int(data.get("positive_count")),
+            negative_count=_as_int(data.get("negative_count")),
+            positive_summary=_as_str(data.get("positive_summary")) or INSUFFICIENT_SUMMARY,
+            negative_summary=_as_str(data.get("negative_summary")) or INSUFFICIENT_SUMMARY,
+        )
+
+
+@dataclass
+class AnalysisResult:
+    product_name: str = ""
+    overall_sentiment_summary: str = ""
+    keywords_analysis: list = field(default_factory=list)   # [KeywordAnalysis, ...]
+    related_products: list = None                            # 라이브러리 저장 시 붙는 유사 상품 링크
+    coverage: tuple = None    # map-reduce에서 일부 묶음만 분석된 경우 (분석한 묶음 수, 전체 묶음 수), JSON에는 포함하지 않음
+
+    @property
+    def partial(self):
+        """ 일부 리뷰 묶음의 분석이 실패하여 개수가 전체 표본보다 적게 집계된 결과인지 여부 """
+        return self.coverage is not None and self.coverage[0] < self.coverage[1]
+
+    @classmethod
+    def from_dict(cls, data, keywords=None):
+        """
+        dict를 검증하여 AnalysisResult로 만듭니다. (개수는 0 이상의 정수로, 빈 요약은 '언급 부족' 문구로 보정)
+        keywords가 주어지면 그 키워드만 입력 순서대로 남기고, 응답에 빠진 키워드는 '언급 부족'으로 채웁니다.
+        """
+        if not isinstance(data, dict):
+            raise AnalysisFormatError("분석 결과가 JSON 객체가 아닙니다.")
+        items = data.get("keywords_analysis")
+        if not isinstance(items, list):
+            raise AnalysisFormatError("분석 결과에 keywords_analysis 배열이 없습니다.")
+
+        analyses = [KeywordAnalysis.from_dict(item) for item in items if isinstance(item, dict)]
+        if keywords is not None:
+            # 모델이 키워드의 띄어쓰기/대소문자를 바꿔 써도 입력 키워드에 맞춥니다.
+            by_keyword = {}
+            for analysis in analyses:
+                by_keyword.setdefault(normalize_text(analysis.keyword), analysis)
+            matched = []
+            for k in keywords:
+                analysis = by_keyword.get(normalize_text(k)) or KeywordAnalysis(keyword=k)
+                analysis.keyword = k
+                matched.append(analysis)
+            analyses = matched
+
+        related = data.get("related_products")
+        return cls(
+            product_name=_as_str(data.get("product_name")),
+            overall_sentiment_summary=_as_str(data.get("overall_sentiment_summary")),
+            keywords_analysis=analyses,
+            related_products=related if isinstance(related, list) else None,
+        )
+
+    @classmethod
+    def from_json(cls, text, keywords=None):
+        """
+        JSON 문자열을 파싱/검증합니다. 스키마 지정 응답은 그대로 파싱되고,
+        스키마 없이 받은 응답(```json 코드 블록)일 때만 표시를 제거한 뒤 다시 시도합니다.
+        """
+        try:
+            data = json.loads(text)
+        except (TypeError, json.JSONDecodeError):
+            try:
+                data = json.loads(text.replace("```json", "").replace("```", "").strip())
+            except (AttributeError, json.JSONDecodeError) as e:
+                raise AnalysisFormatError(f"분석 결과 JSON 파싱 실패: {e}", raw_text=text)
+        try:
+            return cls.from_dict(data, keywords)
+        except AnalysisFormatError as e:
+            e.raw_text = text
+            raise
+
+    def to_dict(self):
+        data = asdict(self)
+        del data["coverage"]
+        if self.related_products is None:
+            del data["related_products"]
+        return data
+
+    def to_json(self):
+        """ API 응답/DB 저장용 JSON 문자열 (analysis_text) """
+        return json.dumps(self.to_dict(), ensure_ascii=False)
@@ -0,0 +1,99 @@
+# RA/review_analyzer/ai/stream_parser.py
+
+"""
+스트리밍으로 조금씩 도착하는 AI 응답(JSON 텍스트)을 점진적으로 파싱하는 모듈입니다.
+응답 전체가 끝나기를 기다리지 않고, keywords_analysis 배열의 키워드 객체가 닫히는 즉시 그 객체를 꺼내고,
+product_name / overall_sentiment_summary 같은 최상위 문자열 필드도 값이 끝나는 즉시 꺼냅니다.
+(```json 코드 블록 표시처럼 JSON 바깥의 글자는 무시합니다.)
+"""
+
+import json
+
+ARRAY_KEY = "keywords_analysis"
+TOP_LEVEL_FIELDS = ("product_name", "overall_sentiment_summary")
+
+
+class IncrementalJSONParser:
+    def __init__(self, array_key=ARRAY_KEY, fields=TOP_LEVEL_FIELDS):
+        self.array_key = array_key
+        self.fields = fields
+        self.text = ""           # 지금까지 받은 전체 텍스트
+        self._pos = 0            # 다음에 검사할 위치
+        self._stack = []         # 열려 있는 컨테이너 ('{' 또는 '[')
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._last_string = None # 직전에 닫힌 문자열 (다음 글자가 ':'이면 키)
+        self._key = None         # 최상위 객체에서 현재 값의 키
+        self._array_depth = None # keywords_analysis 배열이 열린 스택 깊이
+        self._item_start = None  # 배열 안에서 열린 키워드 객체의 시작 위치
+
+    def feed(self, chunk):
+        """
+        새로 받은 텍스트 조각을 넣고, 이번에 완성된 항목 리스트를 반환합니다.
+        항목: ("item", 키워드 객체 dict) 또는 ("field", 필드 이름, 값)
+        """
+        self.text += chunk
+        completed = []
+        text = self.text
+        for i in range(self._pos, len(text)):
+            char = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._close_string(i, completed)
+                continue
+
+            if char == '"':
+                if self._stack:
+                    self._in_string = True
+                    self._string_start = i
+            elif char == ':':
+                if len(self._stack) == 1 and self._last_string is not None:
+                    self._key = self._last_string
+                self._last_string = None
+            elif char in '{[':
+                if char == '{' and self._array_depth is not None and len(self._stack) == self._array_depth:
+                    self._item_start = i
+                if char == '[' and len(self._stack) == 1 and self._key == self.array_key:
+                    self._array_depth = len(self._stack) + 1
+                self._stack.append(char)
+                self._last_string = None
+            elif char in '}]':
+                if self._stack:
+                    self._stack.pop()
+                if char == '}' and self._item_start is not None and len(self._stack) == self._array_depth:
+                    item = self._loads(text[self._item_start:i + 1])
+                    if isinstance(item, dict):
+                        completed.append(("item", item))
+                    self._item_start = None
+                elif char == ']' and self._array_depth is not None and len(self._stack) < self._array_depth:
+                    self._array_depth = None
+                self._last_string = None
+            elif char == ',':
+                if len(self._stack) == 1:
+                    self._key = None
+                self._last_string = None
+        self._pos = len(text)
+        return completed
+
+    def _close_string(self, end, completed):
+        raw = self.text[self._string_start:end + 1]
+        value = self._loads(raw)
+        self._last_string = value
+        # 최상위 객체에서 키 다음에 온 문자열은 필드 값입니다.
+        if len(self._stack) == 1 and self._key in self.fields and isinstance(value, str):
+            completed.append(("field", self._key, value))
+            self._key = None
+            self._last_string = None
+
+    @staticmethod
+    def _loads(raw):
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError:
+            return None
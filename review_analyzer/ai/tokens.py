@@ -0,0 +1,48 @@
+# RA/review_analyzer/ai/tokens.py
+
+"""
+AI에 넘길 텍스트의 토큰 수를 추정하는 모듈입니다.
+문장마다 count_tokens API를 호출할 수 없으므로, 글자 종류별 비율로 빠르게 추정하고
+실제 토크나이저 결과(ChatBot.count_tokens)로 보정 계수를 갱신합니다.
+"""
+
+import threading
+
+# 토큰 1개당 글자 수 (초기값, 실제 토큰 수로 보정됨)
+HANGUL_CHARS_PER_TOKEN = 1.5
+OTHER_CHARS_PER_TOKEN = 4.0
+
+
+def _raw_estimate(text):
+    hangul = sum(1 for ch in text if '가' <= ch <= '힣' or 'ㄱ' <= ch <= 'ㆎ')
+    others = sum(1 for ch in text if not ch.isspace()) - hangul
+    return hangul / HANGUL_CHARS_PER_TOKEN + others / OTHER_CHARS_PER_TOKEN
+
+
+class TokenEstimator:
+    def __init__(self, alpha=0.3):
+        self.alpha = alpha
+        self.scale = 1.0        # 실제 토큰 수 / 추정 토큰 수 (지수 이동 평균)
+        self.samples = 0
+        self._lock = threading.Lock()
+
+    def estimate(self, text):
+        """ text의 토큰 수를 추정합니다. (최소 1) """
+        return max(1, int(_raw_estimate(text) * self.scale + 0.5))
+
+    def calibrate(self, text, actual_tokens):
+        """ 실제 토크나이저로 센 토큰 수로 보정 계수를 갱신합니다. """
+        raw = _raw_estimate(text)
+        if raw <= 0 or not actual_tokens:
+            return
+        ratio = actual_tokens / raw
+        with self._lock:
+            self.scale = ratio if self.samples == 0 else self.alpha * ratio + (1 - self.alpha) * self.scale
+            self.samples += 1
+
+
+_estimator = TokenEstimator()
+
+def get_token_estimator():
+    """ 프로세스 전역 토큰 추정기를 반환합니다. """
+    return _estimator
@@ -1,15 +1,17 @@
 import time
-import pandas as pd
 import traceback
-import random
 import os
+from datetime import datetime
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from selenium.webdriver.common.action_chains import ActionChains
-from bs4 import BeautifulSoup # 데이터 추출 가속용
+from .review_parser import parse_reviews # 데이터 추출 가속용 (lxml/bs4 백엔드)
+from .driver_pool import get_driver_pool, install_worker_finalizer # 웜 상태의 드라이버 재사용
+from . import http_fetcher # 브라우저 UI 조작 없이 HTTP로 리뷰 수집
+from . import waits # 고정 sleep 대신 DOM 변경 감지 + 적응형 예의 대기
 
 # 병렬 처리 및 프로세스 간 동기화를 위한 라이브러리
 from multiprocessing import Pool, freeze_support, Manager
@@ -17,6 +19,56 @@ from multiprocessing import Pool, freeze_support, Manager
 # --- 설정 ---
 TARGET_RATINGS = ['최고', '좋음', '보통', '별로', '나쁨']
 MAX_REVIEWS_PER_RATING = 100
+PAGINATION_XPATH = "//div[@data-page and @data-start and @data-end]"
+PARSER_BACKEND = None  # None이면 review_parser.DEFAULT_BACKEND (lxml 설치 시 lxml)
+
+# 수집 방식: 'selenium'(UI 조작), 'http'(리뷰 엔드포인트 직접 호출), 'auto'(http 실패 시 selenium)
+FETCH_MODE = 'auto'
+
+# 워커 프로세스 간 드라이버 생성 직렬화용 lock (crawl_executor가 init_worker로 주입)
+_worker_lock = None
+# 조기 종료된 작업의 cancel_key 집합 (crawl_executor의 Manager().dict(), init_worker로 주입)
+_cancel_flags = None
+
+def init_worker(lock, settings=None):
+    """
+    크롤링 워커 프로세스 초기화 함수 (multiprocessing.Pool의 initializer)
+    settings(dict)로 config.py의 크롤링 설정을 워커 프로세스에 전달합니다.
+    """
+    global _worker_lock, _cancel_flags, FETCH_MODE, PARSER_BACKEND
+    _worker_lock = lock
+    settings = settings or {}
+    _cancel_flags = settings.get('cancel_flags')
+    FETCH_MODE = settings.get('fetch_mode', FETCH_MODE)
+    PARSER_BACKEND = settings.get('parser_backend', PARSER_BACKEND)
+    waits.configure_politeness(
+        min_delay=settings.get('politeness_min_delay'),
+        max_delay=settings.get('politeness_max_delay'),
+        factor=settings.get('politeness_factor'),
+    )
+    # 워커 종료 시 드라이버 풀의 브라우저를 닫습니다. (Pool 워커에서는 atexit이 실행되지 않음)
+    install_worker_finalizer()
+
+def is_cancelled(cancel_key):
+    """ 실행기가 이 작업(별점)의 수집 중단을 요청했는지 확인합니다. """
+    if cancel_key is None or _cancel_flags is None:
+        return False
+    try:
+        return cancel_key in _cancel_flags
+    except Exception:
+        # Manager 프로세스가 종료된 경우 등: 중단 요청이 없는 것으로 간주
+        return False
+
+def parse_review_date(date_text):
+    """ 리뷰 날짜 문자열(예: '2025.11.02')을 datetime으로 변환합니다. 실패 시 None """
+    if not date_text:
+        return None
+    for fmt in ("%Y.%m.%d", "%Y-%m-%d", "%Y/%m/%d"):
+        try:
+            return datetime.strptime(date_text.strip().rstrip('.'), fmt)
+        except ValueError:
+            continue
+    return None
 
 def setup_driver(lock=None):
     """
@@ -61,10 +113,9 @@ def setup_driver(lock=None):
 
 def extract_reviews(driver, current_rating_filter):
     """
-    BeautifulSoup을 이용한 고속 데이터 추출
+    리뷰 목록 HTML을 review_parser로 넘겨 고속 데이터 추출
+    (페이지 전체가 아닌 #sdpReview 영역만 가져와 파싱)
     """
-    reviews_data = []
-    
     # 리뷰 아이템을 찾는 XPath
     review_article_xpath = "//article[contains(@class, 'sdp-review__article__list') or contains(@class, 'twc-pt-[16px]')]"
 
@@ -76,66 +127,13 @@ def extract_reviews(driver, current_rating_filter):
     except TimeoutException:
         return []
 
-    # Selenium은 HTML 소스만 덤프하고, 분석은 Python(BeautifulSoup)이 수행
-    html = driver.page_source
-    soup = BeautifulSoup(html, 'html.parser')
-    
-    articles = soup.find_all('article', class_=lambda x: x and ('sdp-review__article__list' in x or 'twc-pt-[16px]' in x))
-    
-    for article in articles:
-        try:
-            def get_text(selector):
-                el = article.select_one(selector)
-                return el.get_text(strip=True) if el else ""
-
-            author_el = article.select_one("span[data-member-id]")
-            author = author_el.get_text(strip=True) if author_el else ""
-            
-            rating = len(article.select("i.twc-bg-full-star"))
-            
-            date = get_text("div.sdp-review__article__list__info__product-info__reg-date")
-            if not date:
-                try:
-                    stars_div = article.select_one("div:has(> i.twc-bg-full-star)")
-                    if stars_div:
-                        date_div = stars_div.find_next_sibling("div")
-                        if date_div: date = date_div.get_text(strip=True)
-                except: pass
-            
-            product_option = get_text("div.sdp-review__article__list__info__product-info__name")
-            if not product_option: 
-                product_option = get_text("div.twc-my-\\[16px\\]")
-            
-            review_title = get_text("div.sdp-review__article__list__headline")
-            if not review_title: 
-                review_title = get_text("div.twc-mb-\\[8px\\].twc-font-bold")
+    # Selenium은 리뷰 영역의 HTML만 덤프하고, 분석은 Python(review_parser)이 수행
+    try:
+        html = driver.find_element(By.ID, "sdpReview").get_attribute("outerHTML")
+    except NoSuchElementException:
+        html = driver.page_source
 
-            review_body = get_text("div.sdp-review__article__list__review__content")
-            if not review_body: 
-                review_body = get_text("div.twc-break-all")
-            
-            helpful = 0
-            try: 
-                help_div = article.select_one("div.sdp-review__article__list__help")
-                if help_div and help_div.has_attr("data-count"):
-                    helpful = int(help_div["data-count"])
-                else:
-                    help_text_div = article.find("div", string=lambda text: text and "명에게 도움되었습니다" in text)
-                    if help_text_div:
-                        text = help_text_div.get_text(strip=True)
-                        helpful = int(text.split('명')[0].replace(',', '').strip())
-            except: 
-                pass
-            
-            reviews_data.append({
-                "별점필터": current_rating_filter,
-                "작성자": author, "평점": rating, "날짜": date, "구매옵션": product_option,
-                "제목": review_title, "내용": review_body, "도움됨": helpful
-            })
-        except: 
-            continue
-            
-    return reviews_data
+    return parse_reviews(html, current_rating_filter, backend=PARSER_BACKEND)
 
 def apply_rating_filter(driver, wait, rating_name):
     """별점 필터 적용 (JS 강제 클릭)"""
@@ -145,51 +143,287 @@ def apply_rating_filter(driver, wait, rating_name):
         if rating_name in filter_btn.text and "모든 별점" not in filter_btn.text:
             return True
 
+        # JS 클릭은 스크롤/애니메이션 완료를 기다릴 필요가 없음
         driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", filter_btn)
-        time.sleep(1) 
         driver.execute_script("arguments[0].click();", filter_btn)
         
         popup = wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, "[data-radix-popper-content-wrapper]")))
         option = popup.find_element(By.XPATH, f".//div[contains(text(), '{rating_name}')]")
         
+        snapshot = waits.snapshot_reviews(driver)
         driver.execute_script("arguments[0].click();", option)
         
         wait.until(EC.invisibility_of_element_located((By.CSS_SELECTOR, "[data-radix-popper-content-wrapper]")))
-        time.sleep(1.5) 
+        # 필터가 적용되어 리뷰 목록이 실제로 바뀔 때까지 대기 (해당 별점 리뷰가 없으면 제한 시간 후 진행)
+        waits.wait_for_review_change(driver, snapshot)
         return True
     except Exception as e:
         print(f"   FAIL: [{rating_name}] 필터 진입 실패")
         return False
 
-def scrape_single_rating(target_url, rating_name, lock):
-    """최적화된 수집 함수 (Eager load + BeautifulSoup + Parallel)"""
-    
-    start_delay = random.uniform(0.5, 2.0)
-    time.sleep(start_delay)
+def apply_latest_sort(driver, rating_name):
+    """최신순 정렬 적용 (증분 수집은 최신 리뷰부터 읽어야 캐시 시점에서 멈출 수 있음)"""
+    try:
+        sort_btn = driver.find_element(
+            By.XPATH, "//*[@id='sdpReview']//*[self::button or self::a or self::div][normalize-space(text())='최신순']"
+        )
+        snapshot = waits.snapshot_reviews(driver)
+        driver.execute_script("arguments[0].click();", sort_btn)
+        waits.wait_for_review_change(driver, snapshot)
+        return True
+    except Exception:
+        print(f"   FAIL: [{rating_name}] 최신순 정렬 실패")
+        return False
+
+def read_pagination(driver, timeout=5):
+    """
+    현재 리뷰 목록의 페이지네이션을 읽습니다.
+    반환값: (pagination element 또는 None, 신규 UI 여부, 현재 페이지 번호)
+    """
+    pagination = None
+    is_new_ui = False
+    try:
+        pagination = WebDriverWait(driver, timeout).until(
+            EC.presence_of_element_located((By.XPATH, PAGINATION_XPATH))
+        )
+        if "twc-mt-[24px]" in pagination.get_attribute("class"):
+            is_new_ui = True
+    except TimeoutException:
+        pass
+
+    current_page = 1
+    if pagination:
+        try:
+            if is_new_ui:
+                current_page = int(pagination.find_element(By.CSS_SELECTOR, "button[class*='twc-text-[#346aff]']").text.strip())
+            else:
+                current_page = int(pagination.find_element(By.CSS_SELECTOR, "button.selected").text.strip())
+        except: pass
+    return pagination, is_new_ui, current_page
+
+def pagination_buttons(pagination, is_new_ui):
+    """ 페이지 번호 버튼 목록 """
+    if is_new_ui:
+        return pagination.find_elements(By.XPATH, ".//button[span]")
+    return pagination.find_elements(By.CSS_SELECTOR, "button.sdp-review__article__page__num")
+
+def next_group_button(pagination):
+    """ 다음 페이지 그룹(>) 버튼. 없거나 비활성화 상태면 None """
+    try:
+        next_group = pagination.find_element(By.XPATH, ".//button[.//svg[not(contains(@class, 'twc-rotate'))]]")
+    except NoSuchElementException:
+        return None
+    return next_group if next_group.is_enabled() else None
+
+def click_and_wait(driver, element):
+    """ 예의 대기 후 클릭하고, 리뷰 목록이 실제로 바뀔 때까지만 대기 """
+    waits.get_politeness().pause()
+    snapshot = waits.snapshot_reviews(driver)
+    # JS Click 사용 (Eager 모드에서 레이아웃 이동 시 안정성 확보)
+    try: element.click()
+    except: driver.execute_script("arguments[0].click();", element)
+    waits.wait_for_review_change(driver, snapshot)
+
+def go_to_page(driver, page, max_hops=20):
+    """ 페이지 번호 버튼(필요하면 다음 그룹 버튼)을 눌러 page로 이동합니다. 성공 여부를 반환합니다. """
+    for _ in range(max_hops):
+        pagination, is_new_ui, current_page = read_pagination(driver)
+        if pagination is None:
+            return page == 1
+        if current_page == page:
+            return True
+
+        if page <= int(pagination.get_attribute("data-end")):
+            target_btn = None
+            for btn in pagination_buttons(pagination, is_new_ui):
+                try:
+                    if int(btn.text.strip()) == page:
+                        target_btn = btn
+                        break
+                except: continue
+            if target_btn is None:
+                return False
+            click_and_wait(driver, target_btn)
+        else:
+            next_group = next_group_button(pagination)
+            if next_group is None:
+                return False
+            click_and_wait(driver, next_group)
+    return False
+
+def open_review_list(driver, wait, target_url, rating_name):
+    """ 상품 페이지를 열어 상품평 탭으로 이동하고 별점 필터를 적용합니다. 실패 시 False """
+    page_load_started = time.time()
+    driver.get(target_url)
+    waits.get_politeness().observe(time.time() - page_load_started)
+
+    try:
+        review_tab = wait.until(EC.element_to_be_clickable((By.XPATH, "//a[contains(text(),'상품평')]")))
+        ActionChains(driver).move_to_element(review_tab).click().perform()
+    except TimeoutException:
+        print(f"FAIL: [{rating_name}] 상품평 탭을 찾을 수 없음")
+        return False
+
+    review_section = wait.until(EC.presence_of_element_located((By.ID, "sdpReview")))
+    driver.execute_script("arguments[0].scrollIntoView(true);", review_section)
+
+    if not apply_rating_filter(driver, wait, rating_name):
+        print(f"FAIL: [{rating_name}] 필터 적용 실패")
+        return False
+    return True
+
+def estimate_last_page(page_size, page_end, has_next_group):
+    """
+    첫 페이지의 리뷰 수와 페이지네이션 범위(data-end)로 수집할 마지막 페이지를 추정합니다.
+    MAX_REVIEWS_PER_RATING을 채우는 데 필요한 페이지 수를 넘지 않습니다.
+    """
+    if page_size <= 0 or page_end is None:
+        return 1
+    needed = -(-MAX_REVIEWS_PER_RATING // page_size)
+    return needed if has_next_group else min(page_end, needed)
+
+def probe_rating(target_url, rating_name, lock=None):
+    """
+    별점 필터의 첫 페이지를 수집하면서 페이지 수를 알아냅니다. (페이지 구간 분할의 1단계)
+    반환값: {'reviews': 첫 페이지 리뷰, 'last_page': 추정 마지막 페이지, 'mode': 'http' 또는 'selenium'}
+    두 방식은 페이지 크기가 달라 페이지 번호가 호환되지 않으므로, 나머지 구간도 같은 mode로 수집해야 합니다.
+    """
+    if lock is None:
+        lock = _worker_lock
+
+    if FETCH_MODE in ('http', 'auto'):
+        first = http_fetcher.fetch_first_page(target_url, rating_name, lock=lock)
+        if first is not None:
+            reviews, page_info = first
+            last_page = 1
+            if page_info is not None:
+                last_page = estimate_last_page(len(reviews), page_info['end'], page_info['has_next_group'])
+            return {'reviews': reviews, 'last_page': last_page, 'mode': 'http'}
+        if FETCH_MODE == 'http':
+            return {'reviews': [], 'last_page': 1, 'mode': 'http'}
+
+    result = {'reviews': [], 'last_page': 1, 'mode': 'selenium'}
+    driver_pool = get_driver_pool()
+    driver = driver_pool.checkout(lock)
+    if not driver: return result
+
+    driver_failed = False
+    print(f"START: [{rating_name}] 첫 페이지 수집 및 페이지 수 확인")
+    try:
+        wait = WebDriverWait(driver, 20)
+        if not open_review_list(driver, wait, target_url, rating_name):
+            return result
+
+        reviews = extract_reviews(driver, rating_name)
+        pagination, _, _ = read_pagination(driver)
+        result['reviews'] = reviews
+        if pagination is not None:
+            result['last_page'] = estimate_last_page(
+                len(reviews), int(pagination.get_attribute("data-end")), next_group_button(pagination) is not None
+            )
+        print(f"ING: [{rating_name}] 1페이지 {len(reviews)}개 (예상 마지막 페이지: {result['last_page']})")
+    except Exception as e:
+        driver_failed = True
+        print(f"ERROR: [{rating_name}] 오류 발생: {e}")
+        traceback.print_exc()
+    finally:
+        driver_pool.checkin(driver, discard=driver_failed)
+
+    return result
+
+def scrape_page_range(target_url, rating_name, start_page, end_page, lock=None, fetch_mode=None, cancel_key=None):
+    """
+    별점 필터의 start_page~end_page 구간만 수집합니다. (페이지 구간 분할의 2단계)
+    fetch_mode는 probe_rating이 사용한 수집 방식입니다. (None이면 FETCH_MODE를 따름)
+    cancel_key의 중단 요청이 있으면(키워드 문장을 충분히 모은 경우) 시작하지 않거나 페이지 사이에서 멈춥니다.
+    """
+    if lock is None:
+        lock = _worker_lock
+    fetch_mode = fetch_mode or FETCH_MODE
+
+    if is_cancelled(cancel_key):
+        print(f"SKIP: [{rating_name}] {start_page}~{end_page}페이지 (조기 종료)")
+        return []
+
+    if fetch_mode in ('http', 'auto'):
+        reviews = http_fetcher.fetch_reviews(target_url, rating_name, MAX_REVIEWS_PER_RATING, lock=lock,
+                                             start_page=start_page, end_page=end_page,
+                                             should_stop=lambda: is_cancelled(cancel_key))
+        if reviews is not None:
+            print(f"DONE: [{rating_name}] HTTP {start_page}~{end_page}페이지 수집 완료 ({len(reviews)}개)")
+            return reviews
+        if fetch_mode == 'http':
+            # 페이지 크기가 달라 Selenium으로 같은 구간을 대신 수집할 수 없습니다.
+            print(f"WARNING: [{rating_name}] HTTP {start_page}~{end_page}페이지 수집 실패")
+            return []
+
+    driver_pool = get_driver_pool()
+    driver = driver_pool.checkout(lock)
+    if not driver: return []
+
+    collected = []
+    driver_failed = False
+    print(f"START: [{rating_name}] {start_page}~{end_page}페이지 수집 시작")
+    try:
+        wait = WebDriverWait(driver, 20)
+        if not open_review_list(driver, wait, target_url, rating_name):
+            return []
+
+        for page in range(start_page, end_page + 1):
+            if page > start_page and is_cancelled(cancel_key):
+                print(f"INFO: [{rating_name}] 조기 종료 요청으로 {page}페이지부터 수집 중단")
+                break
+            if not go_to_page(driver, page):
+                print(f"INFO: [{rating_name}] {page}페이지로 이동할 수 없음 (총 {len(collected)}개). 종료.")
+                break
+            new_reviews = extract_reviews(driver, rating_name)
+            if not new_reviews:
+                break
+            collected.extend(new_reviews)
+            print(f"ING: [{rating_name}] {page}페이지 {len(new_reviews)}개 (구간 누적: {len(collected)})")
+    except Exception as e:
+        driver_failed = True
+        print(f"ERROR: [{rating_name}] 오류 발생: {e}")
+        traceback.print_exc()
+    finally:
+        driver_pool.checkin(driver, discard=driver_failed)
+
+    return collected
+
+def scrape_single_rating(target_url, rating_name, lock=None, since_date=None):
+    """
+    최적화된 수집 함수 (Eager load + BeautifulSoup + Parallel)
+    since_date(datetime)가 주어지면 증분 모드로 동작하여, 그보다 오래된 리뷰를 만나면 수집을 멈춥니다.
+    """
+    if lock is None:
+        lock = _worker_lock
+
+    # HTTP 모드: 리뷰 엔드포인트를 직접 호출하고, 실패하면 (auto 모드에서) Selenium 경로로 대체
+    if FETCH_MODE in ('http', 'auto'):
+        reviews = http_fetcher.fetch_reviews(target_url, rating_name, MAX_REVIEWS_PER_RATING, lock=lock,
+                                             since_date=since_date, parse_date=parse_review_date)
+        if reviews is not None:
+            print(f"DONE: [{rating_name}] HTTP 수집 완료 ({len(reviews)}개)")
+            return reviews
+        if FETCH_MODE == 'http':
+            return []
     
-    driver = setup_driver(lock)
+    driver_pool = get_driver_pool()
+    driver = driver_pool.checkout(lock)
     if not driver: return []
 
     collected = []
+    driver_failed = False
     print(f"START: [{rating_name}] 수집 시작")
     
     try:
         wait = WebDriverWait(driver, 20)
-        driver.get(target_url)
-        
-        try:
-            review_tab = wait.until(EC.element_to_be_clickable((By.XPATH, "//a[contains(text(),'상품평')]")))
-            ActionChains(driver).move_to_element(review_tab).click().perform()
-        except TimeoutException:
-            print(f"FAIL: [{rating_name}] 상품평 탭을 찾을 수 없음")
+        if not open_review_list(driver, wait, target_url, rating_name):
             return []
 
-        review_section = wait.until(EC.presence_of_element_located((By.ID, "sdpReview")))
-        driver.execute_script("arguments[0].scrollIntoView(true);", review_section)
-        
-        if not apply_rating_filter(driver, wait, rating_name):
-            print(f"FAIL: [{rating_name}] 필터 적용 실패")
-            return []
+        if since_date is not None and not apply_latest_sort(driver, rating_name):
+            # 정렬을 바꾸지 못하면 날짜 기준으로 멈출 수 없으므로 전체 수집으로 전환
+            since_date = None
 
         visited_pages = set()
         consecutive_failures = 0
@@ -197,31 +431,24 @@ def scrape_single_rating(target_url, rating_name, lock):
         while len(collected) < MAX_REVIEWS_PER_RATING:
             try:
                 # 페이지네이션 로딩 대기
-                pagination_xpath = "//div[@data-page and @data-start and @data-end]"
-                is_new_ui = False 
-                pagination = None
-                
-                try:
-                    pagination = WebDriverWait(driver, 5).until(
-                        EC.presence_of_element_located((By.XPATH, pagination_xpath))
-                    )
-                    if "twc-mt-[24px]" in pagination.get_attribute("class"):
-                        is_new_ui = True
-                except TimeoutException:
-                    pass 
-
-                current_page = 1
-                if pagination:
-                    try:
-                        if is_new_ui:
-                            current_page = int(pagination.find_element(By.CSS_SELECTOR, "button[class*='twc-text-[#346aff]']").text.strip())
-                        else:
-                            current_page = int(pagination.find_element(By.CSS_SELECTOR, "button.selected").text.strip())
-                    except: pass
+                pagination, is_new_ui, current_page = read_pagination(driver)
 
                 # --- 리뷰 수집 ---
                 if current_page not in visited_pages:
                     new_reviews = extract_reviews(driver, rating_name)
+
+                    # 증분 모드: 캐시된 최신 리뷰보다 오래된 리뷰는 버리고, 만나는 즉시 종료
+                    reached_cached = False
+                    if new_reviews and since_date is not None:
+                        recent = [r for r in new_reviews if (parse_review_date(r.get("날짜")) or since_date) >= since_date]
+                        reached_cached = len(recent) < len(new_reviews)
+                        new_reviews = recent
+
+                    if reached_cached:
+                        collected.extend(new_reviews)
+                        print(f"INFO: [{rating_name}] 캐시된 리뷰 시점 도달 (신규 {len(collected)}개). 종료.")
+                        break
+
                     if new_reviews:
                         collected.extend(new_reviews)
                         visited_pages.add(current_page)
@@ -245,12 +472,7 @@ def scrape_single_rating(target_url, rating_name, lock):
                     next_btn = None
                     min_val = float('inf')
 
-                    if is_new_ui:
-                        buttons = pagination.find_elements(By.XPATH, ".//button[span]")
-                    else:
-                        buttons = pagination.find_elements(By.CSS_SELECTOR, "button.sdp-review__article__page__num")
-                        
-                    for btn in buttons:
+                    for btn in pagination_buttons(pagination, is_new_ui):
                         try:
                             val = int(btn.text.strip())
                             if val not in visited_pages and val > current_page and val < min_val:
@@ -259,19 +481,12 @@ def scrape_single_rating(target_url, rating_name, lock):
                         except: continue
                     
                     if next_btn:
-                        # JS Click 사용 (Eager 모드에서 레이아웃 이동 시 안정성 확보)
-                        try: next_btn.click()
-                        except: driver.execute_script("arguments[0].click();", next_btn)
-                        
-                        # [최적화] 페이지 이동 대기 시간을 조금 더 줄임 (이미지 로딩 안 하므로)
-                        time.sleep(random.uniform(1.0, 1.5)) 
+                        click_and_wait(driver, next_btn)
                     else:
                         try:
-                            next_group = pagination.find_element(By.XPATH, ".//button[.//svg[not(contains(@class, 'twc-rotate'))]]")
-                            if next_group.is_enabled():
-                                try: next_group.click()
-                                except: driver.execute_script("arguments[0].click();", next_group)
-                                time.sleep(random.uniform(1.5, 2.0))
+                            next_group = next_group_button(pagination)
+                            if next_group is not None:
+                                click_and_wait(driver, next_group)
                             else:
                                 print(f"INFO: [{rating_name}] 마지막 페이지 도달 (총 {len(collected)}개). 종료.")
                                 break
@@ -280,20 +495,20 @@ def scrape_single_rating(target_url, rating_name, lock):
                             break
                 else:
                     if consecutive_failures >= 3: break
-                    time.sleep(1)
+                    waits.get_politeness().pause()
 
             except Exception:
                 consecutive_failures += 1
                 if consecutive_failures >= 5: break
-                time.sleep(1)
+                waits.get_politeness().pause()
 
     except Exception as e:
+        driver_failed = True
         print(f"ERROR: [{rating_name}] 오류 발생: {e}")
         traceback.print_exc()
     finally:
-        if driver:
-            try: driver.quit()
-            except: pass
+        # 드라이버를 종료하지 않고 풀에 반납하여 다음 요청에서 재사용합니다.
+        driver_pool.checkin(driver, discard=driver_failed)
     
     return collected[:MAX_REVIEWS_PER_RATING]
 
@@ -301,6 +516,7 @@ def scrape_wrapper(args):
     return scrape_single_rating(*args)
 
 if __name__ == "__main__":
+    import pandas as pd # 엑셀 저장용 (웹 서버/워커 프로세스에서는 불필요)
     freeze_support()
 
     target_url = "https://www.coupang.com/vp/products/7666070794?itemId=26528256734&searchId=feed-916be5672b844ae3a868a9ae4de0a60d-view_together_ads-P7224339339&vendorItemId=93409074156&sourceType=SDP_ADS&clickEventId=42651fd0-cb6e-11f0-bf3a-f1516b466eb7"
@@ -6,9 +6,7 @@
 """
 
 import time
-import pandas as pd
 import traceback
-import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -17,43 +15,9 @@ from selenium.common.exceptions import TimeoutException
 # (참고: ActionChains, random, NoSuchElementException 등은
 #  이 파일에서 사용하는 함수에 필요하지 않아 import에서 제외하거나 주석 처리 가능합니다.)
 
-def setup_driver():
-    """undetected_chromedriver 초기화 (이미지 로딩 차단 + 오류 수정 포함)"""
-    
-    # 이미지 로딩을 차단하는 설정값
-    # 2 = 이미지 로딩 차단, 0 = 기본값(로딩 허용)
-    prefs = {"profile.managed_default_content_settings.images": 2}
-    
-    # -----------------------------------------------------------
-    # 1. 첫 번째 시도를 위한 옵션 생성
-    # -----------------------------------------------------------
-    options = uc.ChromeOptions()
-    options.add_argument("--disable-blink-features=AutomationControlled")
-    options.add_argument("--start-maximized")
-    # [추가됨] 이미지 로딩 차단 옵션 적용
-    options.add_experimental_option("prefs", prefs)
-    
-    try:
-        # 첫 번째 시도 (버전 지정)
-        driver = uc.Chrome(options=options, version_main=141)
-        
-    except Exception as e:
-        print(f"[드라이버 로드 오류] {e}")
-        print("version_main=141을 제거하고 자동 감지 모드로 다시 시도합니다.")
-        
-        # -----------------------------------------------------------
-        # 2. 재시도를 위해 options 객체를 '새로' 생성 (RuntimeError 방지)
-        # -----------------------------------------------------------
-        new_options = uc.ChromeOptions()
-        new_options.add_argument("--disable-blink-features=AutomationControlled")
-        new_options.add_argument("--start-maximized")
-        # [추가됨] 재시도용 옵션에도 이미지 차단 적용
-        new_options.add_experimental_option("prefs", prefs)
-        
-        # 새로 만든 옵션으로 드라이버 생성
-        driver = uc.Chrome(options=new_options)
-        
-    return driver
+# 드라이버는 리뷰 크롤러와 같은 드라이버 풀에서 빌려 씁니다. (setup_driver는 driver_pool이 담당)
+from .driver_pool import get_driver_pool
+
 # ===================================================================
 # [유사 상품 링크 수집 함수]
 # : 상품 URL을 기반으로 키워드를 추출하고,
@@ -66,13 +30,18 @@ def get_related_product_links(target_url):
     상위 3개 상품의 링크를 반환합니다.
     """
     print(f"\n--- [유사 상품 링크 수집 시작] URL: {target_url[:50]}... ---")
+    driver_pool = get_driver_pool()
     driver = None
+    driver_failed = False
     search_keyword = None
     links = []
 
     try:
-        # 1. 드라이버 설정 및 페이지 접근
-        driver = setup_driver()
+        # 1. 드라이버 풀에서 드라이버를 빌려 페이지 접근
+        driver = driver_pool.checkout()
+        if driver is None:
+            print("  [치명적 오류] 드라이버를 가져오지 못했습니다.")
+            return []
         wait = WebDriverWait(driver, 30) # 로딩/캡차 대기 시간 30초
         driver.get(target_url)
         print("  -> 페이지 로드 대기 중...")
@@ -174,21 +143,21 @@ def get_related_product_links(target_url):
         traceback.print_exc()
 
     except Exception as main_e:
+        driver_failed = True
         print(f"  [치명적 오류] get_related_product_links 함수 실행 중단: {main_e}")
         traceback.print_exc()
     
     finally:
         if driver:
-            try: 
-                driver.quit()
-                print(f"--- [유사 상품 링크 수집 종료] 총 {len(links)}개 링크 반환 ---")
-            except: 
-                pass
+            # 종료하지 않고 풀에 반납 (오류가 난 드라이버는 폐기)
+            driver_pool.checkin(driver, discard=driver_failed)
+            print(f"--- [유사 상품 링크 수집 종료] 총 {len(links)}개 링크 반환 ---")
     
     return links
 
 
 if __name__ == "__main__":
+    import pandas as pd # 엑셀 저장용 (웹 서버/워커 프로세스에서는 불필요)
     # 대상 URL (예: 참치액)
     target_url = "https://www.coupang.com/vp/products/7224339339?vendorItemId=3051369121&sourceType=SDP_ALSO_VIEWED"
     
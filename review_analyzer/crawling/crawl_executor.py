@@ -0,0 +1,311 @@
+# RA/review_analyzer/crawling/crawl_executor.py
+
+"""
+앱 전체가 공유하는 크롤링 실행기(Executor) 모듈입니다.
+분석 요청마다 Manager/Pool을 새로 만드는 대신, create_app에서 한 번 만든 프로세스 풀을 재사용합니다.
+
+- 전역 동시성 제한: 워커 프로세스 수(CRAWL_MAX_WORKERS)가 곧 동시에 뜨는 Chrome 수의 상한입니다.
+- 작업 대기열: 동시에 크롤링하는 분석 요청 수(CRAWL_MAX_CONCURRENT_JOBS)를 넘으면 대기열에서 기다립니다.
+- 백프레셔: 대기열(CRAWL_MAX_QUEUE)까지 가득 차면 CrawlQueueFullError를 발생시켜 429로 응답하게 합니다.
+- 페이지 구간 분할(CRAWL_PAGE_SPLIT): 별점 단위가 아닌 (별점, 페이지 구간) 단위로 작업을 나눠,
+  리뷰가 한 별점에 몰린 상품에서도 먼저 끝난 워커가 남은 페이지를 가져가도록 합니다.
+- 조기 종료: 수집된 리뷰를 작업(페이지 구간) 단위로 호출한 쪽에 바로 넘기고, 호출한 쪽이 충분하다고 하면
+  해당 별점의 남은 구간을 취소합니다. (워커는 공유 취소 플래그를 페이지마다 확인)
+"""
+
+import math
+import uuid
+import queue
+import atexit
+import threading
+import multiprocessing
+from flask import current_app
+
+from . import Crapping_module_ver1 as crawl_module
+
+# --- 기본 설정 (config.py에서 덮어쓸 수 있음) ---
+DEFAULT_MAX_WORKERS = 5
+DEFAULT_MAX_CONCURRENT_JOBS = 2
+DEFAULT_MAX_QUEUE = 8
+DEFAULT_TASK_TIMEOUT = 300    # 다음 작업 결과를 기다리는 최대 시간 (초, 워커가 죽으면 결과가 오지 않음)
+DEFAULT_SHUTDOWN_TIMEOUT = 30  # 정상 종료(close/join)를 기다리는 최대 시간 (초)
+DEFAULT_PAGE_CHUNK_MIN = 2   # 구간 하나의 최소 페이지 수 (구간마다 상품 페이지 로딩 + 필터 적용 비용이 듦)
+
+
+def _scrape_indexed(indexed_task):
+    """ 완료 순서대로 결과를 받을 수 있도록 작업 순번을 함께 돌려주는 워커 함수입니다. """
+    index, task = indexed_task
+    return index, crawl_module.scrape_wrapper(task)
+
+
+class CrawlQueueFullError(Exception):
+    """ 크롤링 대기열이 가득 찼을 때 발생하는 예외입니다. """
+
+    def __init__(self, active_jobs, waiting_jobs):
+        self.active_jobs = active_jobs
+        self.waiting_jobs = waiting_jobs
+        super().__init__("현재 분석 요청이 많아 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.")
+
+
+class CrawlExecutor:
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, max_concurrent_jobs=DEFAULT_MAX_CONCURRENT_JOBS,
+                 max_queue=DEFAULT_MAX_QUEUE, worker_settings=None, split_pages=True,
+                 page_chunk_min=DEFAULT_PAGE_CHUNK_MIN, task_timeout=DEFAULT_TASK_TIMEOUT):
+        self.max_workers = max_workers
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.max_queue = max_queue
+        self.split_pages = split_pages
+        self.page_chunk_min = page_chunk_min
+        self.worker_settings = worker_settings or {}   # 워커 프로세스에 전달할 크롤링 설정
+
+        self.task_timeout = task_timeout
+        self._pool = None
+        self._driver_lock = None      # 워커 간 드라이버 생성 직렬화용 (기존 Manager().Lock() 대체)
+        self._manager = None
+        self._cancel_flags = None     # 조기 종료된 "작업ID:별점" 키 (Manager().dict(), 풀 생성 시 한 번만 생성)
+        self._start_guard = threading.Lock()
+        self._cond = threading.Condition()
+        self._active = 0
+        self._waiting = 0
+
+    def _ensure_started(self):
+        """
+        프로세스 풀을 처음 사용할 때 생성합니다.
+        (spawn 방식 OS에서 run.py 임포트 중에 프로세스가 생성되는 문제를 피하기 위해 지연 생성)
+        """
+        with self._start_guard:
+            if self._pool is None:
+                print(f"LOG: Starting crawl worker pool (workers={self.max_workers})")
+                self._driver_lock = multiprocessing.Lock()
+                self._manager = multiprocessing.Manager()
+                self._cancel_flags = self._manager.dict()
+                settings = dict(self.worker_settings, cancel_flags=self._cancel_flags)
+                self._pool = multiprocessing.Pool(
+                    processes=self.max_workers,
+                    initializer=crawl_module.init_worker,
+                    initargs=(self._driver_lock, settings),
+                )
+        return self._pool
+
+    def _acquire_slot(self):
+        """ 크롤링 슬롯을 얻을 때까지 대기합니다. 대기열이 가득 차면 예외를 발생시킵니다. """
+        with self._cond:
+            if self._active >= self.max_concurrent_jobs and self._waiting >= self.max_queue:
+                raise CrawlQueueFullError(self._active, self._waiting)
+
+            self._waiting += 1
+            queue_position = self._waiting
+            try:
+                if self._active >= self.max_concurrent_jobs:
+                    print(f"LOG: Crawl job queued (position: {queue_position})")
+                while self._active >= self.max_concurrent_jobs:
+                    self._cond.wait()
+            finally:
+                self._waiting -= 1
+            self._active += 1
+
+    def _release_slot(self):
+        with self._cond:
+            self._active -= 1
+            self._cond.notify()
+
+    def map_ratings(self, link, ratings, since=None, on_progress=None, on_batch=None):
+        """
+        별점 필터별 크롤링 작업을 공용 워커 풀에 제출하고, 결과 리스트(별점 순서 유지)를 반환합니다.
+        since({rating: datetime})가 주어진 별점은 해당 날짜 이후의 리뷰만 증분 수집합니다.
+        on_progress(rating, reviews, stopped_early)는 별점 하나의 수집이 끝날 때마다 호출됩니다.
+        stopped_early는 조기 종료로 실제로 남은 구간을 취소했거나 페이지 넘김을 멈췄는지(= 일부만 수집했는지)입니다.
+        on_batch(rating, reviews)는 리뷰 묶음(첫 페이지, 페이지 구간)이 도착할 때마다 호출되며,
+        True를 반환하면 그 별점의 남은 페이지 수집을 취소합니다. (페이지 구간 분할 모드에서만 적용)
+        """
+        since = since or {}
+        pool = self._ensure_started()
+        self._acquire_slot()
+        try:
+            if self.split_pages:
+                return self._map_page_ranges(pool, link, ratings, since, on_progress, on_batch)
+
+            tasks = [(i, (link, rating, None, since.get(rating))) for i, rating in enumerate(ratings)]
+            results = [[] for _ in ratings]
+            for index, result in pool.imap_unordered(_scrape_indexed, tasks):
+                results[index] = result
+                if on_batch:
+                    on_batch(ratings[index], result)
+                if on_progress:
+                    # 별점 단위 실행은 취소할 남은 구간이 없으므로 항상 끝까지 수집한 결과입니다.
+                    on_progress(ratings[index], result, False)
+            return results
+        finally:
+            self._release_slot()
+
+    def _split_pages(self, first_page, last_page):
+        """
+        first_page~last_page를 워커 수에 맞춰 구간으로 나눕니다.
+        구간이 작을수록 먼저 끝난 워커가 남은 구간을 가져가기 쉽지만, 구간마다 페이지 로딩 비용이 들므로 최소 크기를 둡니다.
+        """
+        page_count = last_page - first_page + 1
+        if page_count <= 0:
+            return []
+        chunk = max(self.page_chunk_min, math.ceil(page_count / self.max_workers))
+        return [(start, min(start + chunk - 1, last_page)) for start in range(first_page, last_page + 1, chunk)]
+
+    def _map_page_ranges(self, pool, link, ratings, since, on_progress, on_batch=None):
+        """
+        (별점, 페이지 구간) 단위로 작업을 나눠 실행합니다.
+        1) 별점마다 첫 페이지를 수집하며 페이지 수를 알아내고 (probe_rating)
+        2) 남은 페이지를 구간으로 나눠 워커 풀의 공용 작업 큐에 넣으면, 먼저 일을 끝낸 워커가 다음 구간을 가져갑니다.
+        증분 수집 대상 별점은 최신순으로 읽다가 캐시 시점에서 멈춰야 하므로 기존처럼 별점 단위로 실행합니다.
+        on_batch가 True를 반환한 별점은 취소 플래그를 세워 아직 시작하지 않은 구간과 진행 중인 구간의 남은 페이지를 건너뜁니다.
+        task_timeout 초 동안 어떤 작업 결과도 오지 않으면(워커 프로세스 종료 등으로 콜백이 오지 않는 경우)
+        남은 작업을 실패로 처리하고, 그 별점은 on_progress를 호출하지 않습니다. (불완전한 결과가 캐시되지 않도록)
+        """
+        done = queue.Queue()
+        parts = {rating: {} for rating in ratings}      # rating -> {시작 페이지: 리뷰 리스트}
+        remaining = {rating: 0 for rating in ratings}   # rating -> 아직 끝나지 않은 작업 수
+        stopped = set()
+        truncated = set()     # 조기 종료로 실제로 수집하지 않은 페이지가 남은 별점
+        abandoned = set()
+        job_id = uuid.uuid4().hex
+        pending = 0
+
+        def submit(rating, kind, start_page, func, args):
+            nonlocal pending
+            pending += 1
+            remaining[rating] += 1
+            key = (rating, kind, start_page)
+            pool.apply_async(func, args,
+                             callback=lambda result: done.put((key, result, None)),
+                             error_callback=lambda error: done.put((key, None, error)))
+
+        def collected(rating):
+            reviews = [r for _, chunk in sorted(parts[rating].items()) for r in chunk]
+            return reviews[:crawl_module.MAX_REVIEWS_PER_RATING]
+
+        for rating in ratings:
+            if since.get(rating) is not None:
+                submit(rating, 'rating', 1, crawl_module.scrape_single_rating, (link, rating, None, since[rating]))
+            else:
+                submit(rating, 'probe', 1, crawl_module.probe_rating, (link, rating))
+
+        def stop(rating):
+            stopped.add(rating)
+            try:
+                self._cancel_flags[f"{job_id}:{rating}"] = True
+            except Exception as e:
+                print(f"WARNING: [{rating}] 조기 종료 플래그 설정 실패: {e}")
+
+        try:
+            while pending:
+                try:
+                    (rating, kind, start_page), result, error = done.get(timeout=self.task_timeout)
+                except queue.Empty:
+                    abandoned = {r for r in ratings if remaining[r] > 0}
+                    print(f"ERROR: 크롤링 작업 {pending}개가 {self.task_timeout}초 동안 응답하지 않아 실패 처리합니다. "
+                          f"(별점: {sorted(abandoned)})")
+                    # 아직 실행 중일 수 있는 구간은 취소 플래그로 남은 페이지를 건너뛰게 합니다.
+                    for rating in abandoned:
+                        stop(rating)
+                    break
+                pending -= 1
+                remaining[rating] -= 1
+                if error is not None:
+                    print(f"ERROR: [{rating}] 크롤링 작업 실패 ({kind}, {start_page}페이지~): {error}")
+
+                batch = result['reviews'] if kind == 'probe' and result is not None else (result or [])
+                parts[rating][start_page] = batch
+                if batch and on_batch and rating not in stopped and on_batch(rating, batch):
+                    # 첫 페이지에서 멈추면 나눌 구간이 남아 있을 때만, 구간에서 멈추면 아직 끝나지 않은 구간이 있을 때만 실제로 취소됩니다.
+                    if kind == 'probe':
+                        cancels = result['last_page'] > 1
+                    else:
+                        cancels = remaining[rating] > 0
+                    if cancels:
+                        print(f"LOG: [{rating}] 충분한 리뷰를 수집하여 남은 페이지 수집을 취소합니다.")
+                        truncated.add(rating)
+                    stop(rating)
+
+                if kind == 'probe' and result is not None and rating not in stopped:
+                    ranges = self._split_pages(2, result['last_page'])
+                    if ranges:
+                        print(f"LOG: [{rating}] 2~{result['last_page']}페이지를 {len(ranges)}개 구간으로 분할")
+                    for start, end in ranges:
+                        submit(rating, 'pages', start, crawl_module.scrape_page_range,
+                               (link, rating, start, end, None, result['mode'], f"{job_id}:{rating}"))
+
+                if remaining[rating] == 0 and on_progress:
+                    on_progress(rating, collected(rating), rating in truncated)
+        finally:
+            # 응답하지 않은 작업이 나중에라도 플래그를 확인할 수 있도록, 실패 처리한 별점의 플래그는 남겨 둡니다.
+            for rating in stopped - abandoned:
+                try:
+                    self._cancel_flags.pop(f"{job_id}:{rating}", None)
+                except Exception:
+                    pass
+
+        return [collected(rating) for rating in ratings]
+
+    def stats(self):
+        """ 실행기 상태를 딕셔너리로 반환합니다. """
+        with self._cond:
+            return {
+                "max_workers": self.max_workers,
+                "max_concurrent_jobs": self.max_concurrent_jobs,
+                "max_queue": self.max_queue,
+                "split_pages": self.split_pages,
+                "active_jobs": self._active,
+                "waiting_jobs": self._waiting,
+                "started": self._pool is not None,
+            }
+
+    def shutdown(self, timeout=DEFAULT_SHUTDOWN_TIMEOUT):
+        """
+        워커 프로세스를 모두 종료합니다.
+        close()/join()으로 정상 종료시켜 워커의 Finalize(드라이버 풀 정리)가 실행되게 하고,
+        timeout(초) 안에 끝나지 않을 때만 terminate()로 강제 종료합니다.
+        """
+        with self._start_guard:
+            if self._pool is not None:
+                pool = self._pool
+                self._pool = None
+                pool.close()
+                joiner = threading.Thread(target=pool.join, daemon=True)
+                joiner.start()
+                joiner.join(timeout)
+                if joiner.is_alive():
+                    print("WARNING: 크롤링 워커가 제한 시간 안에 종료되지 않아 강제 종료합니다.")
+                    pool.terminate()
+                    pool.join()
+            if self._manager is not None:
+                self._manager.shutdown()
+                self._manager = None
+                self._cancel_flags = None
+
+
+def init_app(app):
+    """
+    Flask 앱 팩토리(create_app)에서 호출될 초기화 함수입니다.
+    앱 전체에서 공유할 크롤링 실행기를 만들어 app.extensions에 등록합니다.
+    """
+    executor = CrawlExecutor(
+        max_workers=app.config.get('CRAWL_MAX_WORKERS', DEFAULT_MAX_WORKERS),
+        max_concurrent_jobs=app.config.get('CRAWL_MAX_CONCURRENT_JOBS', DEFAULT_MAX_CONCURRENT_JOBS),
+        max_queue=app.config.get('CRAWL_MAX_QUEUE', DEFAULT_MAX_QUEUE),
+        split_pages=app.config.get('CRAWL_PAGE_SPLIT', True),
+        page_chunk_min=app.config.get('CRAWL_PAGE_CHUNK_MIN', DEFAULT_PAGE_CHUNK_MIN),
+        task_timeout=app.config.get('CRAWL_TASK_TIMEOUT', DEFAULT_TASK_TIMEOUT),
+        worker_settings={
+            'fetch_mode': app.config.get('CRAWL_FETCH_MODE', crawl_module.FETCH_MODE),
+            'parser_backend': app.config.get('CRAWL_PARSER_BACKEND', crawl_module.PARSER_BACKEND),
+            'politeness_min_delay': app.config.get('CRAWL_POLITENESS_MIN_DELAY'),
+            'politeness_max_delay': app.config.get('CRAWL_POLITENESS_MAX_DELAY'),
+            'politeness_factor': app.config.get('CRAWL_POLITENESS_FACTOR'),
+        },
+    )
+    app.extensions['crawl_executor'] = executor
+    atexit.register(executor.shutdown)
+    return executor
+
+
+def get_crawl_executor():
+    """ 현재 앱에 등록된 크롤링 실행기를 반환합니다. """
+    return current_app.extensions['crawl_executor']
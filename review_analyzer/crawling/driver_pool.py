@@ -0,0 +1,268 @@
+# RA/review_analyzer/crawling/driver_pool.py
+
+"""
+Chrome 드라이버를 매 요청마다 새로 띄우지 않고 재사용하기 위한 드라이버 풀 모듈입니다.
+프로세스마다 하나의 풀을 두며, 크롤링 함수들은 checkout/checkin(borrow)으로 드라이버를 빌려 씁니다.
+
+- 헬스 체크: 빌려주기 전에 간단한 스크립트 실행으로 드라이버 생존 여부를 확인합니다.
+- 재활용: MAX_USES 회 사용한 드라이버는 메모리 누수를 막기 위해 종료 후 새로 만듭니다.
+- 유휴 제거: IDLE_TIMEOUT 초 이상 사용되지 않은 드라이버는 정리합니다. (요청이 없어도 백그라운드 스레드가 주기적으로 정리)
+- 종료 정리: 워커 프로세스가 끝날 때(multiprocessing Finalize) 남은 브라우저를 모두 종료합니다.
+"""
+
+import time
+import atexit
+import threading
+from contextlib import contextmanager
+from multiprocessing import util as mp_util
+
+# --- 설정 ---
+DRIVER_POOL_MAX_SIZE = 2      # 프로세스당 최대 드라이버 수
+DRIVER_MAX_USES = 20          # 드라이버 1개당 최대 사용 횟수 (초과 시 재생성)
+DRIVER_IDLE_TIMEOUT = 300     # 유휴 드라이버 정리 기준 (초)
+DRIVER_CHECKOUT_TIMEOUT = 60  # 드라이버를 빌리기 위해 기다리는 최대 시간 (초)
+DRIVER_EVICT_INTERVAL = 60    # 유휴 드라이버 정리 주기 (초)
+
+
+class _PooledDriver:
+    """ 풀에서 관리하는 드라이버와 사용 이력을 묶어두는 내부 클래스입니다. """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+        self.last_used = time.time()
+
+
+class DriverPool:
+    def __init__(self, factory, max_size=DRIVER_POOL_MAX_SIZE, max_uses=DRIVER_MAX_USES,
+                 idle_timeout=DRIVER_IDLE_TIMEOUT):
+        self.factory = factory
+        self.max_size = max_size
+        self.max_uses = max_uses
+        self.idle_timeout = idle_timeout
+        self._idle = []            # 반납되어 대기 중인 _PooledDriver 목록
+        self._in_use = {}          # id(driver) -> _PooledDriver
+        self._cond = threading.Condition()
+        self._closed = False
+        self._evictor = None
+        self._evictor_stop = threading.Event()
+
+    # ------------------------------------------------------------------
+    # 내부 유틸
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _is_alive(driver):
+        """ 드라이버(브라우저)가 살아있는지 확인합니다. """
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _evict_idle_locked(self):
+        """
+        (lock 보유 상태에서) 오래 쉬고 있는 드라이버를 풀에서 빼고 목록으로 반환합니다.
+        브라우저 종료(quit)는 느리므로 호출한 쪽에서 lock 밖에서 수행합니다.
+        """
+        now = time.time()
+        keep, expired = [], []
+        for pooled in self._idle:
+            (expired if now - pooled.last_used > self.idle_timeout else keep).append(pooled)
+        self._idle = keep
+        return [pooled.driver for pooled in expired]
+
+    def _quit_all(self, drivers):
+        for driver in drivers:
+            self._quit(driver)
+
+    def _total_locked(self):
+        return len(self._idle) + len(self._in_use)
+
+    # ------------------------------------------------------------------
+    # 공개 API
+    # ------------------------------------------------------------------
+    def checkout(self, lock=None, timeout=DRIVER_CHECKOUT_TIMEOUT):
+        """
+        풀에서 사용 가능한 드라이버를 꺼냅니다. 없으면 새로 생성합니다.
+        lock은 드라이버 생성 시 setup_driver에 그대로 전달됩니다. (프로세스 간 생성 직렬화)
+        생성에 실패하면 None을 반환합니다.
+        """
+        deadline = time.time() + timeout
+        while True:
+            expired = []
+            candidate = None
+            placeholder = None
+            with self._cond:
+                while True:
+                    expired += self._evict_idle_locked()
+                    if self._idle:
+                        # 생존 확인(execute_script)은 느릴 수 있으므로 자리를 예약한 뒤 lock 밖에서 합니다.
+                        candidate = self._idle.pop()
+                        self._in_use[id(candidate.driver)] = candidate
+                        break
+                    if self._total_locked() < self.max_size:
+                        # 자리를 먼저 예약하고, 생성은 lock 밖에서 수행합니다.
+                        placeholder = object()
+                        self._in_use[id(placeholder)] = placeholder
+                        break
+
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+            self._quit_all(expired)
+
+            if candidate is not None:
+                if self._is_alive(candidate.driver):
+                    candidate.uses += 1
+                    return candidate.driver
+                self._quit(candidate.driver)
+                with self._cond:
+                    self._in_use.pop(id(candidate.driver), None)
+                    self._cond.notify()
+                continue
+            if placeholder is None:
+                print("WARNING: 드라이버 풀 대기 시간 초과")
+                return None
+            break
+
+        driver = None
+        try:
+            driver = self.factory(lock)
+        finally:
+            with self._cond:
+                self._in_use.pop(id(placeholder), None)
+                if driver is not None:
+                    pooled = _PooledDriver(driver)
+                    pooled.uses = 1
+                    self._in_use[id(driver)] = pooled
+                self._cond.notify()
+        return driver
+
+    def checkin(self, driver, discard=False):
+        """
+        사용이 끝난 드라이버를 풀에 반납합니다.
+        discard=True 이거나 최대 사용 횟수를 넘긴 드라이버는 종료합니다.
+        """
+        if driver is None:
+            return
+        with self._cond:
+            pooled = self._in_use.get(id(driver)) or _PooledDriver(driver)
+
+        # 생존 확인과 페이지 비우기는 lock 밖에서 합니다. (그동안 이 드라이버의 자리는 사용 중으로 유지)
+        keep = False
+        if not (discard or self._closed or pooled.uses >= self.max_uses) and self._is_alive(driver):
+            try:
+                # 다음 사용자를 위해 이전 페이지의 메모리를 비웁니다. (쿠키는 유지)
+                driver.get("about:blank")
+                keep = True
+            except Exception:
+                pass
+        if not keep:
+            self._quit(driver)
+
+        with self._cond:
+            self._in_use.pop(id(driver), None)
+            if keep and self._closed:
+                # 확인하는 사이 풀이 닫혔으면 풀에 넣지 않고 종료합니다.
+                expired = [driver]
+            else:
+                if keep:
+                    pooled.last_used = time.time()
+                    self._idle.append(pooled)
+                expired = []
+            expired += self._evict_idle_locked()
+            self._cond.notify()
+        self._quit_all(expired)
+
+    @contextmanager
+    def borrow(self, lock=None):
+        """
+        with 문으로 드라이버를 빌리고 자동으로 반납합니다.
+        블록 안에서 예외가 발생하면 해당 드라이버는 폐기합니다.
+        """
+        driver = self.checkout(lock)
+        failed = False
+        try:
+            yield driver
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self.checkin(driver, discard=failed)
+
+    def evict_idle(self):
+        """ 유휴 드라이버 정리를 수동으로 실행합니다. """
+        with self._cond:
+            expired = self._evict_idle_locked()
+        self._quit_all(expired)
+
+    def start_evictor(self, interval=DRIVER_EVICT_INTERVAL):
+        """ 요청이 없어도 유휴 드라이버가 정리되도록 주기적으로 evict_idle을 실행하는 스레드를 시작합니다. """
+        if self._evictor is not None:
+            return
+
+        def _run():
+            while not self._evictor_stop.wait(interval):
+                try:
+                    self.evict_idle()
+                except Exception as e:
+                    print(f"WARNING: 유휴 드라이버 정리 실패: {e}")
+
+        self._evictor = threading.Thread(target=_run, name='driver-pool-evictor', daemon=True)
+        self._evictor.start()
+
+    def close(self):
+        """ 풀을 닫고 모든 유휴 드라이버를 종료합니다. (사용 중인 드라이버는 반납될 때 종료) """
+        self._evictor_stop.set()
+        with self._cond:
+            self._closed = True
+            drivers = [pooled.driver for pooled in self._idle]
+            self._idle = []
+            self._cond.notify_all()
+        self._quit_all(drivers)
+
+    def stats(self):
+        """ 풀 상태를 딕셔너리로 반환합니다. """
+        with self._cond:
+            return {
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                "max_size": self.max_size,
+            }
+
+
+_driver_pool_instance = None
+_driver_pool_guard = threading.Lock()
+
+def get_driver_pool():
+    """ 현재 프로세스의 드라이버 풀을 가져오거나, 없으면 새로 생성하여 반환합니다. (싱글턴 패턴) """
+    global _driver_pool_instance
+    with _driver_pool_guard:
+        if _driver_pool_instance is None:
+            # 순환 임포트를 피하기 위해 함수 안에서 임포트합니다.
+            from .Crapping_module_ver1 import setup_driver
+            _driver_pool_instance = DriverPool(factory=setup_driver)
+            _driver_pool_instance.start_evictor()
+            atexit.register(_driver_pool_instance.close)
+    return _driver_pool_instance
+
+
+def _close_driver_pool():
+    if _driver_pool_instance is not None:
+        _driver_pool_instance.close()
+
+
+def install_worker_finalizer():
+    """
+    multiprocessing.Pool 워커 프로세스에서는 atexit이 실행되지 않으므로,
+    워커가 정상 종료될 때(Pool.close/join) 드라이버 풀을 닫도록 Finalize를 등록합니다. (워커 initializer에서 호출)
+    """
+    mp_util.Finalize(None, _close_driver_pool, exitpriority=10)
@@ -0,0 +1,209 @@
+# RA/review_analyzer/crawling/http_fetcher.py
+
+"""
+브라우저 UI 조작 없이 쿠팡 리뷰 목록을 HTTP로 직접 가져오는 모듈입니다.
+드라이버 풀의 (이미 쿠팡에 접속한) 브라우저에서 쿠키와 User-Agent를 복사한 뒤,
+상품평 탭이 내부적으로 호출하는 페이지 단위 리뷰 엔드포인트를 requests.Session으로 호출합니다.
+
+실패(차단, 응답 형식 변경 등) 시 None을 반환하며, 호출한 쪽은 기존 Selenium 경로로 대체합니다.
+"""
+
+import time
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .driver_pool import get_driver_pool
+from .review_parser import parse_review_page, is_last_page
+from . import waits
+
+# --- 설정 ---
+REVIEW_ENDPOINT = "https://www.coupang.com/vp/product/reviews"
+REVIEW_PAGE_SIZE = 20           # 요청하는 페이지 크기 (서버가 다른 크기로 응답할 수 있으므로 종료 판단에는 쓰지 않음)
+REQUEST_TIMEOUT = 10          # 요청 1건당 타임아웃 (초)
+COOKIE_TTL = 60 * 10          # 브라우저에서 복사한 쿠키를 재사용하는 시간 (초)
+
+# 별점 필터 이름 -> 엔드포인트의 ratings 파라미터 값
+RATING_SCORES = {'최고': 5, '좋음': 4, '보통': 3, '별로': 2, '나쁨': 1}
+
+SORT_BEST = 'ORDER_SCORE_ASC'
+SORT_LATEST = 'DATE_DESC'
+
+
+class ReviewFetchError(Exception):
+    """ HTTP 리뷰 수집에 실패했을 때 발생하는 예외입니다. (Selenium 경로로 대체) """
+
+
+_session = None
+_session_warmed_at = 0
+_session_lock = threading.Lock()
+
+
+def _create_session():
+    """ 커넥션 풀과 재시도 정책이 설정된 requests.Session을 생성합니다. """
+    session = requests.Session()
+    retry = Retry(total=2, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504],
+                  allowed_methods=["GET"])
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+    session.mount("https://", adapter)
+    session.headers.update({
+        "Accept": "text/html, */*; q=0.01",
+        "Accept-Language": "ko-KR,ko;q=0.9",
+        "X-Requested-With": "XMLHttpRequest",
+    })
+    return session
+
+
+def _warm_session(session, target_url, lock=None):
+    """ 드라이버 풀의 브라우저로 상품 페이지에 접속해 쿠키/User-Agent를 세션에 복사합니다. """
+    with get_driver_pool().borrow(lock) as driver:
+        if driver is None:
+            raise ReviewFetchError("쿠키를 가져올 드라이버가 없습니다.")
+        driver.get(target_url)
+        user_agent = driver.execute_script("return navigator.userAgent")
+        cookies = driver.get_cookies()
+
+    session.cookies.clear()
+    for cookie in cookies:
+        session.cookies.set(cookie['name'], cookie['value'],
+                            domain=cookie.get('domain'), path=cookie.get('path', '/'))
+    session.headers["User-Agent"] = user_agent
+
+
+def get_session(target_url, lock=None, force_warm=False):
+    """ 현재 프로세스의 HTTP 세션을 반환합니다. 쿠키가 없거나 오래되었으면 브라우저로 다시 데웁니다. """
+    global _session, _session_warmed_at
+    with _session_lock:
+        if _session is None:
+            _session = _create_session()
+        if force_warm or time.time() - _session_warmed_at > COOKIE_TTL:
+            _warm_session(_session, target_url, lock)
+            _session_warmed_at = time.time()
+        return _session
+
+
+def fetch_review_page(session, product_id, rating_name, page, target_url, sort_by=SORT_BEST):
+    """ 리뷰 목록 1페이지의 HTML을 가져옵니다. """
+    params = {
+        "productId": product_id,
+        "page": page,
+        "size": REVIEW_PAGE_SIZE,
+        "sortBy": sort_by,
+        "ratings": RATING_SCORES[rating_name],
+        "q": "",
+        "viRoleCode": 3,
+        "ratingSummary": "true",
+    }
+    started = time.time()
+    response = session.get(REVIEW_ENDPOINT, params=params, timeout=REQUEST_TIMEOUT,
+                           headers={"Referer": target_url})
+    waits.get_politeness().observe(time.time() - started)
+    if response.status_code != 200:
+        raise ReviewFetchError(f"HTTP {response.status_code}")
+    return response.text
+
+
+def _product_id(target_url, rating_name):
+    """ HTTP로 수집할 수 있는 요청이면 상품 ID를, 아니면 None을 반환합니다. """
+    # 순환 임포트를 피하기 위해 함수 안에서 임포트합니다.
+    from .review_store import normalize_product_id
+
+    product_id = normalize_product_id(target_url)
+    if not product_id.isdigit() or rating_name not in RATING_SCORES:
+        return None
+    return product_id
+
+
+def _fetch_first_html(session, product_id, rating_name, page, target_url, sort_by, lock):
+    """ 작업의 첫 요청: 실패하면 쿠키 만료/차단 가능성이 있으므로 한 번만 다시 데운 뒤 재시도합니다. """
+    try:
+        return session, fetch_review_page(session, product_id, rating_name, page, target_url, sort_by)
+    except ReviewFetchError:
+        session = get_session(target_url, lock, force_warm=True)
+        return session, fetch_review_page(session, product_id, rating_name, page, target_url, sort_by)
+
+
+def fetch_first_page(target_url, rating_name, lock=None):
+    """
+    HTTP로 한 별점 필터의 첫 페이지 리뷰와 페이지네이션 정보를 가져옵니다.
+    반환값: (reviews, page_info 또는 None), 실패하면 None
+    (page_info는 parse_review_page의 정보 dict이며, 페이지네이션이 없거나 리뷰가 0개면 None)
+    """
+    product_id = _product_id(target_url, rating_name)
+    if product_id is None:
+        return None
+
+    try:
+        session = get_session(target_url, lock)
+        session, html = _fetch_first_html(session, product_id, rating_name, 1, target_url, SORT_BEST, lock)
+        reviews, page_info = parse_review_page(html, rating_name)
+        if not reviews:
+            if page_info['empty']:
+                # 해당 별점의 리뷰가 실제로 0개인 경우: Selenium으로 다시 확인할 필요가 없습니다.
+                print(f"INFO: [{rating_name}] (HTTP) 등록된 리뷰 없음")
+                return [], None
+            raise ReviewFetchError("첫 페이지에서 리뷰를 찾지 못했습니다.")
+    except Exception as e:
+        print(f"INFO: [{rating_name}] HTTP 수집 실패 -> Selenium 경로로 전환 ({e})")
+        return None
+
+    print(f"ING: [{rating_name}] (HTTP) 1페이지 {len(reviews)}개")
+    return reviews, (page_info if page_info['start'] is not None else None)
+
+
+def fetch_reviews(target_url, rating_name, max_reviews, lock=None, since_date=None, parse_date=None,
+                  start_page=1, end_page=None, should_stop=None):
+    """
+    HTTP로 한 별점 필터의 리뷰를 수집합니다.
+    since_date가 주어지면 최신순으로 받아 그보다 오래된 리뷰를 만나면 멈춥니다. (parse_date로 날짜 변환)
+    start_page/end_page로 페이지 구간만 수집할 수 있습니다. (end_page=None이면 끝까지)
+    should_stop()이 True를 반환하면 다음 페이지를 요청하지 않고 지금까지 수집한 리뷰를 반환합니다.
+    실패하면 None을 반환합니다.
+    """
+    product_id = _product_id(target_url, rating_name)
+    if product_id is None:
+        return None
+
+    sort_by = SORT_LATEST if since_date is not None else SORT_BEST
+    collected = []
+    page = start_page
+
+    try:
+        session = get_session(target_url, lock)
+        while len(collected) < max_reviews and (end_page is None or page <= end_page):
+            if page == start_page:
+                session, html = _fetch_first_html(session, product_id, rating_name, page, target_url, sort_by, lock)
+            else:
+                html = fetch_review_page(session, product_id, rating_name, page, target_url, sort_by)
+
+            reviews, page_info = parse_review_page(html, rating_name)
+            if not reviews:
+                if page == 1 and not page_info['empty']:
+                    # 첫 페이지가 '리뷰 없음' 표시 없이 비어 있으면 차단/형식 변경인지 구분할 수 없으므로 Selenium에 맡깁니다.
+                    raise ReviewFetchError("첫 페이지에서 리뷰를 찾지 못했습니다.")
+                break
+
+            if since_date is not None and parse_date is not None:
+                recent = [r for r in reviews if (parse_date(r.get("날짜")) or since_date) >= since_date]
+                collected.extend(recent)
+                if len(recent) < len(reviews):
+                    break
+            else:
+                collected.extend(reviews)
+
+            print(f"ING: [{rating_name}] (HTTP) {page}페이지 {len(reviews)}개 (누적: {len(collected)})")
+            # 서버가 알려주는 마지막 페이지(다음 그룹 버튼 없이 data-end에 도달)면 멈춥니다.
+            if is_last_page(page_info, page):
+                break
+            if should_stop is not None and should_stop():
+                print(f"INFO: [{rating_name}] (HTTP) 조기 종료 요청으로 수집 중단")
+                break
+            page += 1
+            waits.get_politeness().pause()
+
+    except Exception as e:
+        print(f"INFO: [{rating_name}] HTTP 수집 실패 -> Selenium 경로로 전환 ({e})")
+        return None
+
+    return collected[:max_reviews]
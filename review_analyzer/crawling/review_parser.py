@@ -0,0 +1,329 @@
+# RA/review_analyzer/crawling/review_parser.py
+
+"""
+리뷰 목록 HTML에서 리뷰 데이터를 추출하는 파서 모듈입니다.
+파서 백엔드를 선택할 수 있으며, lxml이 설치되어 있으면 미리 컴파일한 XPath를 쓰는 고속 경로를 기본으로 사용합니다.
+
+- 'lxml': lxml.html + 컴파일된 XPath (빠름, 기본값)
+- 'bs4' : BeautifulSoup(html.parser) (기존 방식, lxml이 없을 때 대체)
+
+직접 실행하면 저장된 HTML 파일들로 백엔드별 파싱 속도를 비교합니다.
+파일을 지정하지 않으면 함께 커밋된 crawling/fixtures/*.html(기존 마크업, twc 마크업 리뷰 목록)을 사용합니다.
+    python -m review_analyzer.crawling.review_parser [html 파일 또는 glob 패턴...]
+"""
+
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import etree, html as lxml_html
+except ImportError:  # lxml은 선택 의존성
+    etree = None
+    lxml_html = None
+
+HELPFUL_TEXT = "명에게 도움되었습니다"
+NO_REVIEW_TEXT = "등록된 상품평이 없습니다"
+
+
+def _to_int(text):
+    """ '1,234명에게 도움되었습니다' -> 1234 """
+    return int(text.split('명')[0].replace(',', '').strip())
+
+
+# ======================================================================
+#                          BeautifulSoup 백엔드
+# ======================================================================
+
+def _bs4_tree(html):
+    return BeautifulSoup(html or "", 'html.parser')
+
+
+def _parse_bs4(html, current_rating_filter):
+    return _reviews_bs4(_bs4_tree(html), current_rating_filter)
+
+
+def _reviews_bs4(soup, current_rating_filter):
+    reviews_data = []
+    articles = soup.find_all('article', class_=lambda x: x and ('sdp-review__article__list' in x or 'twc-pt-[16px]' in x))
+
+    for article in articles:
+        try:
+            def get_text(selector):
+                el = article.select_one(selector)
+                return el.get_text(strip=True) if el else ""
+
+            author_el = article.select_one("span[data-member-id]")
+            author = author_el.get_text(strip=True) if author_el else ""
+
+            rating = len(article.select("i.twc-bg-full-star"))
+
+            date = get_text("div.sdp-review__article__list__info__product-info__reg-date")
+            if not date:
+                try:
+                    stars_div = article.select_one("div:has(> i.twc-bg-full-star)")
+                    if stars_div:
+                        date_div = stars_div.find_next_sibling("div")
+                        if date_div: date = date_div.get_text(strip=True)
+                except: pass
+
+            product_option = get_text("div.sdp-review__article__list__info__product-info__name")
+            if not product_option:
+                product_option = get_text("div.twc-my-\\[16px\\]")
+
+            review_title = get_text("div.sdp-review__article__list__headline")
+            if not review_title:
+                review_title = get_text("div.twc-mb-\\[8px\\].twc-font-bold")
+
+            review_body = get_text("div.sdp-review__article__list__review__content")
+            if not review_body:
+                review_body = get_text("div.twc-break-all")
+
+            helpful = 0
+            try:
+                help_div = article.select_one("div.sdp-review__article__list__help")
+                if help_div and help_div.has_attr("data-count"):
+                    helpful = int(help_div["data-count"])
+                else:
+                    help_text_div = article.find("div", string=lambda text: text and HELPFUL_TEXT in text)
+                    if help_text_div:
+                        helpful = _to_int(help_text_div.get_text(strip=True))
+            except:
+                pass
+
+            reviews_data.append({
+                "별점필터": current_rating_filter,
+                "작성자": author, "평점": rating, "날짜": date, "구매옵션": product_option,
+                "제목": review_title, "내용": review_body, "도움됨": helpful
+            })
+        except:
+            continue
+
+    return reviews_data
+
+
+def _is_next_group_button_bs4(button):
+    """ 다음 페이지 그룹(>) 버튼인지 판단합니다. (신규 UI: 회전되지 않은 화살표 svg, 기존 UI: page__next 클래스) """
+    if any('page__next' in c for c in button.get('class') or []):
+        return True
+    svg = button.find('svg')
+    return svg is not None and 'twc-rotate' not in ' '.join(svg.get('class') or [])
+
+
+def _page_info_bs4(soup):
+    info = _empty_page_info()
+    pagination = soup.find('div', attrs={'data-page': True, 'data-start': True, 'data-end': True})
+    if pagination is not None:
+        try:
+            info['start'], info['end'] = int(pagination['data-start']), int(pagination['data-end'])
+        except ValueError:
+            pass
+        info['has_next_group'] = any(
+            _is_next_group_button_bs4(button) and not button.has_attr('disabled')
+            for button in pagination.find_all('button')
+        )
+    info['empty'] = (
+        soup.find(class_=lambda x: x and 'no-review' in x) is not None
+        or NO_REVIEW_TEXT in soup.get_text()
+    )
+    return info
+
+
+# ======================================================================
+#                     lxml 백엔드 (컴파일된 XPath)
+# ======================================================================
+
+def _has_class(name):
+    """ class 속성에 name 토큰이 있는지 검사하는 XPath 조건 (CSS의 .name과 동일) """
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+if etree is not None:
+    _X_ARTICLES = etree.XPath(
+        "//article[contains(@class, 'sdp-review__article__list') or contains(@class, 'twc-pt-[16px]')]"
+    )
+    _X_AUTHOR = etree.XPath(".//span[@data-member-id][1]")
+    _X_STARS = etree.XPath(f"count(.//i[{_has_class('twc-bg-full-star')}])")
+    _X_DATE = etree.XPath(f"(.//div[{_has_class('sdp-review__article__list__info__product-info__reg-date')}])[1]")
+    _X_DATE_FALLBACK = etree.XPath(
+        f"(.//div[i[{_has_class('twc-bg-full-star')}]])[1]/following-sibling::div[1]"
+    )
+    _X_OPTION = etree.XPath(f"(.//div[{_has_class('sdp-review__article__list__info__product-info__name')}])[1]")
+    _X_OPTION_FALLBACK = etree.XPath(f"(.//div[{_has_class('twc-my-[16px]')}])[1]")
+    _X_TITLE = etree.XPath(f"(.//div[{_has_class('sdp-review__article__list__headline')}])[1]")
+    _X_TITLE_FALLBACK = etree.XPath(f"(.//div[{_has_class('twc-mb-[8px]')} and {_has_class('twc-font-bold')}])[1]")
+    _X_BODY = etree.XPath(f"(.//div[{_has_class('sdp-review__article__list__review__content')}])[1]")
+    _X_BODY_FALLBACK = etree.XPath(f"(.//div[{_has_class('twc-break-all')}])[1]")
+    _X_HELP = etree.XPath(f"(.//div[{_has_class('sdp-review__article__list__help')}])[1]")
+    _X_HELP_TEXT = etree.XPath(f"(.//div[text()[contains(., '{HELPFUL_TEXT}')]])[1]")
+    _X_PAGINATION = etree.XPath("(//div[@data-page and @data-start and @data-end])[1]")
+    _X_BUTTONS = etree.XPath(".//button")
+    _X_NEXT_GROUP = etree.XPath(
+        "boolean(self::*[contains(@class, 'page__next')] | .//svg[not(contains(@class, 'twc-rotate'))])"
+    )
+    _X_EMPTY = etree.XPath(
+        f"boolean(//*[contains(@class, 'no-review')] | //text()[contains(., '{NO_REVIEW_TEXT}')])"
+    )
+
+
+def _lxml_text(article, *xpaths):
+    """ 주어진 XPath들을 순서대로 시도하여 처음으로 비어있지 않은 텍스트를 반환합니다. (bs4의 get_text(strip=True)와 동일) """
+    for xpath in xpaths:
+        found = xpath(article)
+        if found:
+            text = ''.join(t.strip() for t in found[0].itertext())
+            if text:
+                return text
+    return ""
+
+
+def _lxml_tree(html):
+    return lxml_html.fromstring(html) if html else None
+
+
+def _parse_lxml(html, current_rating_filter):
+    return _reviews_lxml(_lxml_tree(html), current_rating_filter)
+
+
+def _reviews_lxml(root, current_rating_filter):
+    reviews_data = []
+    if root is None:
+        return reviews_data
+
+    for article in _X_ARTICLES(root):
+        try:
+            author = _lxml_text(article, _X_AUTHOR)
+            rating = int(_X_STARS(article))
+            date = _lxml_text(article, _X_DATE, _X_DATE_FALLBACK)
+            product_option = _lxml_text(article, _X_OPTION, _X_OPTION_FALLBACK)
+            review_title = _lxml_text(article, _X_TITLE, _X_TITLE_FALLBACK)
+            review_body = _lxml_text(article, _X_BODY, _X_BODY_FALLBACK)
+
+            helpful = 0
+            try:
+                help_div = _X_HELP(article)
+                if help_div and help_div[0].get("data-count") is not None:
+                    helpful = int(help_div[0].get("data-count"))
+                else:
+                    text = _lxml_text(article, _X_HELP_TEXT)
+                    if text:
+                        helpful = _to_int(text)
+            except ValueError:
+                pass
+
+            reviews_data.append({
+                "별점필터": current_rating_filter,
+                "작성자": author, "평점": rating, "날짜": date, "구매옵션": product_option,
+                "제목": review_title, "내용": review_body, "도움됨": helpful
+            })
+        except Exception:
+            continue
+
+    return reviews_data
+
+
+def _page_info_lxml(root):
+    info = _empty_page_info()
+    if root is None:
+        return info
+    found = _X_PAGINATION(root)
+    if found:
+        pagination = found[0]
+        try:
+            info['start'], info['end'] = int(pagination.get('data-start')), int(pagination.get('data-end'))
+        except ValueError:
+            pass
+        info['has_next_group'] = any(
+            _X_NEXT_GROUP(button) and button.get('disabled') is None
+            for button in _X_BUTTONS(pagination)
+        )
+    info['empty'] = bool(_X_EMPTY(root))
+    return info
+
+
+# ======================================================================
+#                             공개 API
+# ======================================================================
+
+BACKENDS = {'bs4': _parse_bs4}
+# 백엔드 이름 -> (트리 생성, 리뷰 추출, 페이지 정보 추출): 한 번 만든 트리로 리뷰와 페이지 정보를 함께 읽기 위함
+_TREE_BACKENDS = {'bs4': (_bs4_tree, _reviews_bs4, _page_info_bs4)}
+if etree is not None:
+    BACKENDS['lxml'] = _parse_lxml
+    _TREE_BACKENDS['lxml'] = (_lxml_tree, _reviews_lxml, _page_info_lxml)
+
+DEFAULT_BACKEND = 'lxml' if 'lxml' in BACKENDS else 'bs4'
+
+
+def _empty_page_info():
+    return {'start': None, 'end': None, 'has_next_group': False, 'empty': False}
+
+
+def _tree_backend(backend):
+    return _TREE_BACKENDS.get(backend or DEFAULT_BACKEND, _TREE_BACKENDS[DEFAULT_BACKEND])
+
+
+def parse_reviews(html, current_rating_filter, backend=None):
+    """
+    리뷰 목록 HTML(#sdpReview 영역 또는 페이지 전체)에서 리뷰 딕셔너리 리스트를 추출합니다.
+    backend를 지정하지 않거나 사용할 수 없는 백엔드면 DEFAULT_BACKEND를 사용합니다.
+    """
+    parser = BACKENDS.get(backend or DEFAULT_BACKEND, BACKENDS[DEFAULT_BACKEND])
+    return parser(html, current_rating_filter)
+
+
+def parse_review_page(html, current_rating_filter, backend=None):
+    """
+    리뷰 목록 HTML을 한 번만 파싱하여 리뷰 리스트와 페이지 정보(parse_page_info와 같은 형식)를 함께 반환합니다.
+    반환값: (reviews, page_info)
+    """
+    make_tree, read_reviews, read_page_info = _tree_backend(backend)
+    tree = make_tree(html)
+    return read_reviews(tree, current_rating_filter), read_page_info(tree)
+
+
+def parse_page_info(html, backend=None):
+    """
+    리뷰 목록 HTML에서 페이지 정보를 읽습니다.
+    반환값: {'start', 'end': 보이는 페이지 번호 범위 (페이지네이션이 없으면 None),
+             'has_next_group': 활성화된 다음 그룹(>) 버튼이 있는지,
+             'empty': 서버가 '등록된 상품평 없음' 상태로 응답했는지}
+    """
+    make_tree, _, read_page_info = _tree_backend(backend)
+    return read_page_info(make_tree(html))
+
+
+def is_last_page(info, page):
+    """ parse_page_info 결과로 page가 마지막 페이지인지 판단합니다. (페이지네이션이 없으면 한 페이지뿐인 목록) """
+    if info['start'] is None:
+        return True
+    return page >= info['end'] and not info['has_next_group']
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+    import glob
+    import timeit
+
+    # 사용법: python -m review_analyzer.crawling.review_parser [html 파일 또는 glob 패턴...]
+    patterns = sys.argv[1:] or [os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', '*.html')]
+    paths = sorted(p for pattern in patterns for p in glob.glob(pattern))
+    if not paths:
+        print("사용법: python -m review_analyzer.crawling.review_parser [html 파일 또는 glob 패턴...]")
+        sys.exit(1)
+
+    fixtures = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            fixtures.append((path, f.read()))
+
+    print(f"=== 리뷰 파서 벤치마크 (파일 {len(fixtures)}개, 백엔드: {', '.join(BACKENDS)}) ===")
+    for path, html in fixtures:
+        baseline = None
+        print(f"\n[{path}] ({len(html) / 1024:.1f} KB)")
+        for name, parser in BACKENDS.items():
+            result = parser(html, "벤치마크")
+            repeat = 20
+            elapsed = min(timeit.repeat(lambda: parser(html, "벤치마크"), number=repeat, repeat=3)) / repeat
+            same = "" if baseline is None else (" (결과 일치)" if result == baseline else " (결과 불일치!)")
+            baseline = baseline if baseline is not None else result
+            print(f"  {name:>5}: {elapsed * 1000:8.2f} ms/page, 리뷰 {len(result)}개{same}")
@@ -0,0 +1,183 @@
+# RA/review_analyzer/crawling/review_store.py
+
+"""
+크롤링한 리뷰를 상품 ID + 별점 필터(TARGET_RATINGS) 단위로 보관하는 리뷰 저장소(캐시) 모듈입니다.
+같은 상품을 키워드만 바꿔 다시 분석할 때 Selenium 크롤링을 건너뛸 수 있게 합니다.
+
+- 마지막 수집(빈 증분 수집 포함) 후 TTL(REVIEW_CACHE_TTL) 안의 데이터는 그대로 재사용합니다.
+- TTL이 지난 데이터는 증분 모드(REVIEW_CACHE_INCREMENTAL)일 때, 캐시된 가장 최신 리뷰 날짜 이후의
+  리뷰만 새로 수집하여 기존 데이터와 병합합니다.
+- 키워드 문장을 충분히 모아 조기 종료한 별점은 '부분' 데이터로 표시하여, 다른 키워드로 분석할 때
+  부족하면 다시 수집할 수 있게 합니다.
+- 별점 데이터마다 세대 번호(generation)를 붙입니다. 새로 수집하거나 새 리뷰가 병합될 때만 바뀌고,
+  부분 데이터를 다른 키워드 때문에 끝까지 다시 수집(확장)할 때는 유지됩니다.
+  키워드 단위 분석 캐시는 이 세대 번호를 키로 쓰므로, 조기 종료 범위가 키워드 조합마다 달라도 결과를 재사용합니다.
+"""
+
+import re
+import time
+import itertools
+import threading
+from collections import OrderedDict
+from flask import current_app
+
+from .Crapping_module_ver1 import MAX_REVIEWS_PER_RATING, parse_review_date
+
+# --- 기본 설정 (config.py에서 덮어쓸 수 있음) ---
+DEFAULT_TTL = 60 * 60 * 6      # 6시간
+DEFAULT_MAX_PRODUCTS = 200     # 메모리에 보관할 최대 상품 수 (LRU)
+
+PRODUCT_ID_PATTERN = re.compile(r'/vp/products/(\d+)')
+
+# plan()이 돌려주는 별점별 수집 방식
+MODE_FRESH = 'fresh'              # 캐시 그대로 사용 (크롤링 없음)
+MODE_PARTIAL = 'partial'          # 조기 종료로 일부만 캐시됨 (충분하면 그대로 사용, 아니면 전체 수집)
+MODE_INCREMENTAL = 'incremental'  # 최신 리뷰만 추가 수집
+MODE_FULL = 'full'                # 전체 수집
+
+# 별점 데이터의 세대 번호 (프로세스 전체에서 단조 증가하므로, LRU로 밀려난 상품을 다시 수집해도 번호가 겹치지 않음)
+_generations = itertools.count(1)
+
+
+def normalize_product_id(url):
+    """
+    쿠팡 상품 URL(/vp/products/<id>)에서 상품 ID를 추출합니다.
+    패턴이 없으면 쿼리스트링을 제외한 URL을 그대로 키로 사용합니다.
+    """
+    match = PRODUCT_ID_PATTERN.search(url or '')
+    if match:
+        return match.group(1)
+    return (url or '').split('?')[0].rstrip('/')
+
+
+def _review_key(review):
+    """ 리뷰 중복 판별용 키 (작성자 + 날짜 + 내용) """
+    return (review.get('작성자'), review.get('날짜'), review.get('내용'))
+
+
+class _Entry:
+    def __init__(self, reviews, complete=True, generation=None):
+        self.reviews = reviews
+        self.complete = complete
+        self.generation = generation or next(_generations)
+        self.fetched_at = time.time()   # 리뷰 데이터를 실제로 수집한 시각
+        self.checked_at = self.fetched_at  # 마지막으로 수집(전체/증분)을 끝낸 시각 (TTL 기준)
+        dates = [d for d in (parse_review_date(r.get('날짜')) for r in reviews) if d]
+        self.newest_date = max(dates) if dates else None
+
+
+class ReviewStore:
+    def __init__(self, ttl=DEFAULT_TTL, incremental=True, max_products=DEFAULT_MAX_PRODUCTS):
+        self.ttl = ttl
+        self.incremental = incremental
+        self.max_products = max_products
+        self._products = OrderedDict()   # product_id -> {rating: _Entry}
+        self._lock = threading.Lock()
+
+    def _touch_locked(self, product_id):
+        """ (lock 보유 상태에서) 상품 항목을 가져오고 LRU 순서를 갱신합니다. """
+        ratings = self._products.get(product_id)
+        if ratings is None:
+            ratings = {}
+            self._products[product_id] = ratings
+            while len(self._products) > self.max_products:
+                self._products.popitem(last=False)
+        else:
+            self._products.move_to_end(product_id)
+        return ratings
+
+    def plan(self, product_id, ratings):
+        """
+        별점별로 어떻게 수집할지 결정합니다.
+        반환값: {rating: (mode, since_date)}  (mode: MODE_FRESH / MODE_PARTIAL / MODE_INCREMENTAL / MODE_FULL)
+        """
+        now = time.time()
+        plan = {}
+        with self._lock:
+            cached = self._products.get(product_id, {})
+            for rating in ratings:
+                entry = cached.get(rating)
+                if entry is None:
+                    plan[rating] = (MODE_FULL, None)
+                elif now - entry.checked_at < self.ttl:
+                    plan[rating] = (MODE_FRESH if entry.complete else MODE_PARTIAL, None)
+                elif self.incremental and entry.complete and entry.newest_date is not None:
+                    plan[rating] = (MODE_INCREMENTAL, entry.newest_date)
+                else:
+                    plan[rating] = (MODE_FULL, None)
+        return plan
+
+    def put(self, product_id, rating, reviews, complete=True):
+        """
+        전체 수집 결과로 캐시를 교체합니다. 빈 결과(크롤링 실패 가능성)는 저장하지 않습니다.
+        complete=False는 조기 종료로 일부 페이지만 수집했다는 뜻입니다.
+        TTL 안의 부분 데이터를 다시 수집한 경우(키워드가 달라 범위만 넓힌 경우)는 세대 번호를 유지합니다.
+        """
+        if not reviews:
+            return
+        with self._lock:
+            ratings = self._touch_locked(product_id)
+            old = ratings.get(rating)
+            extends = old is not None and not old.complete and time.time() - old.checked_at < self.ttl
+            ratings[rating] = _Entry(list(reviews)[:MAX_REVIEWS_PER_RATING], complete,
+                                     generation=old.generation if extends else None)
+
+    def merge(self, product_id, rating, new_reviews):
+        """
+        증분 수집 결과를 기존 캐시 앞쪽에 병합합니다. (중복 제거, 최대 개수 유지)
+        빈 결과는 '새 리뷰 없음'과 '크롤링 실패'를 구분할 수 없으므로, put()처럼 데이터와 fetched_at은 그대로 두고
+        checked_at만 갱신합니다. plan()은 checked_at 기준으로 TTL을 판단하므로, 새 리뷰가 없는 상품은
+        다음 TTL까지 다시 증분 수집하지 않습니다.
+        """
+        if not new_reviews:
+            with self._lock:
+                entry = self._products.get(product_id, {}).get(rating)
+                if entry is not None:
+                    entry.checked_at = time.time()
+            return
+        with self._lock:
+            ratings = self._touch_locked(product_id)
+            old = ratings[rating].reviews if rating in ratings else []
+            merged, seen = [], set()
+            for review in list(new_reviews) + old:
+                key = _review_key(review)
+                if key in seen:
+                    continue
+                seen.add(key)
+                merged.append(review)
+            ratings[rating] = _Entry(merged[:MAX_REVIEWS_PER_RATING])
+
+    def generation(self, product_id, ratings):
+        """ 별점별 세대 번호 튜플을 반환합니다. (캐시에 없는 별점은 0, 키워드 분석 캐시의 키) """
+        with self._lock:
+            cached = self._products.get(product_id, {})
+            return tuple(cached[r].generation if r in cached else 0 for r in ratings)
+
+    def get_reviews(self, product_id, rating):
+        """ 캐시된 리뷰 리스트를 반환합니다. 없으면 빈 리스트 """
+        with self._lock:
+            entry = self._products.get(product_id, {}).get(rating)
+            return list(entry.reviews) if entry else []
+
+    def invalidate(self, product_id):
+        with self._lock:
+            self._products.pop(product_id, None)
+
+
+def init_app(app):
+    """
+    Flask 앱 팩토리(create_app)에서 호출될 초기화 함수입니다.
+    리뷰 저장소를 만들어 app.extensions에 등록합니다.
+    """
+    store = ReviewStore(
+        ttl=app.config.get('REVIEW_CACHE_TTL', DEFAULT_TTL),
+        incremental=app.config.get('REVIEW_CACHE_INCREMENTAL', True),
+        max_products=app.config.get('REVIEW_CACHE_MAX_PRODUCTS', DEFAULT_MAX_PRODUCTS),
+    )
+    app.extensions['review_store'] = store
+    return store
+
+
+def get_review_store():
+    """ 현재 앱에 등록된 리뷰 저장소를 반환합니다. """
+    return current_app.extensions['review_store']
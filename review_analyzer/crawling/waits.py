@@ -0,0 +1,162 @@
+# RA/review_analyzer/crawling/waits.py
+
+"""
+크롤러의 고정 대기(time.sleep)를 대신하는 이벤트 기반 대기 모듈입니다.
+
+- 리뷰 목록 변경 감지: 이전 첫 리뷰(article)가 DOM에서 사라졌거나(stale) 첫 리뷰의 내용이 바뀌었을 때만
+  목록이 바뀐 것으로 봅니다. (#sdpReview 안의 다른 변경, 예: 도움돼요 카운터/이미지 로딩은 무시)
+  그 뒤 #sdpReview의 MutationObserver 변경 횟수가 잠잠해질 때까지(settle)만 기다립니다.
+- 예의(politeness) 대기: 사이트의 실제 응답 시간을 지수 이동 평균으로 추적하여 요청 간격을 조절합니다.
+  (배포 환경별로 CRAWL_POLITENESS_* 설정으로 조절)
+"""
+
+import time
+import random
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException, WebDriverException
+
+# --- 기본 설정 (config.py의 CRAWL_POLITENESS_*로 덮어쓸 수 있음) ---
+POLITENESS_MIN_DELAY = 0.2    # 요청 간 최소 간격 (초)
+POLITENESS_MAX_DELAY = 2.0    # 요청 간 최대 간격 (초)
+POLITENESS_FACTOR = 0.5       # 관측된 평균 응답 시간 대비 대기 비율
+CHANGE_TIMEOUT = 10           # 목록 변경을 기다리는 최대 시간 (초)
+SETTLE_TIME = 0.15            # 마지막 DOM 변경 후 이 시간 동안 조용하면 렌더링 완료로 판단 (초)
+POLL_FREQUENCY = 0.05
+
+REVIEW_ARTICLE_XPATH = "//article[contains(@class, 'sdp-review__article__list') or contains(@class, 'twc-pt-[16px]')]"
+
+_OBSERVER_JS = """
+const target = document.getElementById('sdpReview');
+if (!target) { return -1; }
+if (window.__raObservedTarget !== target) {
+    if (window.__raObserver) { window.__raObserver.disconnect(); }
+    window.__raMutations = 0;
+    window.__raObserver = new MutationObserver(function (records) { window.__raMutations += records.length; });
+    window.__raObserver.observe(target, {childList: true, subtree: true, characterData: true});
+    window.__raObservedTarget = target;
+}
+return window.__raMutations;
+"""
+
+# 첫 리뷰(article)의 내용 (목록이 다른 리뷰로 바뀌었는지 비교하는 용도, 없으면 null)
+_FIRST_ARTICLE_TEXT_JS = """
+const article = document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+return article ? article.textContent.trim().slice(0, 500) : null;
+"""
+
+
+class PolitenessBudget:
+    """ 관측된 응답 시간에 맞춰 요청 간격을 조절하는 적응형 대기 예산 """
+
+    def __init__(self, min_delay=POLITENESS_MIN_DELAY, max_delay=POLITENESS_MAX_DELAY,
+                 factor=POLITENESS_FACTOR, alpha=0.3):
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.factor = factor
+        self.alpha = alpha
+        self.avg_response = None
+
+    def observe(self, seconds):
+        """ 한 번의 요청/페이지 전환에 걸린 시간을 기록합니다. """
+        if self.avg_response is None:
+            self.avg_response = seconds
+        else:
+            self.avg_response = self.alpha * seconds + (1 - self.alpha) * self.avg_response
+
+    def delay(self):
+        base = self.min_delay if self.avg_response is None else self.factor * self.avg_response
+        base = min(max(base, self.min_delay), self.max_delay)
+        return base * random.uniform(0.8, 1.2)
+
+    def pause(self):
+        time.sleep(self.delay())
+
+
+_politeness = PolitenessBudget()
+
+def get_politeness():
+    """ 현재 프로세스의 예의 대기 예산을 반환합니다. """
+    return _politeness
+
+def configure_politeness(min_delay=None, max_delay=None, factor=None):
+    """ 워커 초기화 시 config.py의 설정으로 예의 대기 예산을 재설정합니다. """
+    global _politeness
+    _politeness = PolitenessBudget(
+        min_delay=POLITENESS_MIN_DELAY if min_delay is None else min_delay,
+        max_delay=POLITENESS_MAX_DELAY if max_delay is None else max_delay,
+        factor=POLITENESS_FACTOR if factor is None else factor,
+    )
+
+
+def _mutation_count(driver):
+    try:
+        return driver.execute_script(_OBSERVER_JS)
+    except WebDriverException:
+        return -1
+
+
+def _first_article_text(driver):
+    try:
+        return driver.execute_script(_FIRST_ARTICLE_TEXT_JS, REVIEW_ARTICLE_XPATH)
+    except WebDriverException:
+        return None
+
+
+def _is_stale(element):
+    if element is None:
+        return False
+    try:
+        element.is_enabled()
+        return False
+    except StaleElementReferenceException:
+        return True
+
+
+def snapshot_reviews(driver):
+    """
+    리뷰 목록 변경 감지를 준비합니다. 클릭 등 목록을 바꾸는 동작 직전에 호출합니다.
+    반환값: (첫 리뷰 element 또는 None, 첫 리뷰 내용 또는 None)
+    """
+    # settle 단계에서 쓸 MutationObserver를 미리 설치해 둡니다.
+    _mutation_count(driver)
+    try:
+        first_article = driver.find_element(By.XPATH, REVIEW_ARTICLE_XPATH)
+    except WebDriverException:
+        first_article = None
+    first_text = _first_article_text(driver) if first_article is not None else None
+    return first_article, first_text
+
+
+def wait_for_review_change(driver, snapshot, timeout=CHANGE_TIMEOUT):
+    """
+    snapshot 이후 리뷰 목록이 실제로 바뀌고 렌더링이 잠잠해질 때까지 기다립니다.
+    걸린 시간을 예의 대기 예산에 기록하고 반환합니다. 제한 시간 안에 바뀌지 않으면 False를 반환합니다.
+    """
+    first_article, first_text = snapshot
+    started = time.time()
+
+    def changed(d):
+        if first_article is None:
+            # 이전에 리뷰가 없었으면 리뷰가 나타날 때까지 기다립니다.
+            return _first_article_text(d) is not None
+        if _is_stale(first_article):
+            return True
+        text = _first_article_text(d)
+        return text is not None and text != first_text
+
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY).until(changed)
+    except TimeoutException:
+        return False
+
+    # 변경이 연달아 일어나는 동안(React 재렌더링)은 조금 더 기다립니다.
+    last_count, last_change = _mutation_count(driver), time.time()
+    while time.time() - last_change < SETTLE_TIME and time.time() - started < timeout:
+        time.sleep(POLL_FREQUENCY)
+        count = _mutation_count(driver)
+        if count != last_count:
+            last_count, last_change = count, time.time()
+
+    _politeness.observe(time.time() - started)
+    return True
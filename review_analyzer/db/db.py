@@ -6,46 +6,97 @@
 """
 
 import pymysql
+from pymysql.constants import SERVER_STATUS
+import atexit
+import threading
+from contextlib import contextmanager
 from flask import current_app, g
 import json
 
+from .pool import (
+    ConnectionPool, DEFAULT_POOL_SIZE, DEFAULT_MAX_LIFETIME, DEFAULT_TIMEOUT
+)
+
+
+def _get_pool():
+    """ 현재 앱에 등록된 DB 커넥션 풀을 반환합니다. """
+    return current_app.extensions['db_pool']
+
+
 def get_db():
     """
-    Flask 애플리케이션 컨텍스트(g)를 사용하여 현재 요청 내에서 DB 연결을 가져오거나 생성합니다.
-    한 번의 요청(request) 동안에는 동일한 DB 연결 객체가 재사용됩니다.
+    Flask 애플리케이션 컨텍스트(g)를 사용하여 현재 요청 내에서 DB 연결을 가져옵니다.
+    연결은 커넥션 풀에서 빌려오며, 한 번의 요청(request) 동안에는 동일한 DB 연결 객체가 재사용됩니다.
     """
     if 'db' not in g:
-        # g 객체에 'db' 연결이 없으면, config.py의 설정으로 새로 생성합니다.
-        app_config = current_app.config
-        g.db = pymysql.connect(
-            host=app_config['DB_HOST'],
-            user=app_config['DB_USER'],
-            password=app_config['DB_PASSWORD'],
-            database=app_config['DB_NAME'],
-            port=app_config.get('DB_PORT', 3306),
-            charset='utf8mb4',
-            cursorclass=pymysql.cursors.DictCursor # 결과를 딕셔너리 형태로 받기 위함
-        )
+        g.db = _get_pool().acquire()
     return g.db
 
 
 def close_db(e=None):
     """
-    요청이 끝나면(teardown) g 객체에서 DB 연결을 찾아 닫습니다.
+    요청이 끝나면(teardown) g 객체에서 DB 연결을 찾아 풀에 반납합니다.
     """
     db = g.pop('db', None)
+    pending = g.pop('_pending_id_names', None)
     if db is not None:
-        db.close()
+        # 커밋되지 않은 채 끝난 요청에서 새로 만든 키워드/카테고리 ID는 반납 시 롤백되므로 캐시에서 제거
+        if pending and db.server_status & SERVER_STATUS.SERVER_STATUS_IN_TRANS:
+            _keyword_id_cache.invalidate(pending['keywords'])
+            _category_id_cache.invalidate(pending['categories'])
+        _get_pool().release(db)
+
+
+@contextmanager
+def short_lived_connection():
+    """
+    블록 안의 짧은 조회/저장 동안만 g.db 연결을 빌리고, 블록이 끝나면 바로 풀에 반납합니다.
+    크롤링/AI 호출처럼 오래 걸리는 작업 앞뒤의 DB 작업에 사용하여, 요청이 끝날 때까지 연결을 붙잡지 않게 합니다.
+    (블록에 들어오기 전에 이미 빌린 연결이 있으면 그 요청의 트랜잭션이므로 반납하지 않습니다.)
+    """
+    already_held = 'db' in g
+    try:
+        yield get_db()
+    finally:
+        if not already_held:
+            close_db()
 
 
 def init_app(app):
     """
     Flask 앱 팩토리(create_app)에서 호출될 초기화 함수입니다.
-    애플리케이션 컨텍스트가 종료될 때마다 close_db가 호출되도록 등록합니다.
+    DB 커넥션 풀을 만들어 등록하고, 애플리케이션 컨텍스트가 종료될 때마다 close_db가 호출되도록 등록합니다.
     """
+    def connect():
+        # config.py의 설정으로 새 연결을 생성합니다. (풀이 필요할 때만 호출)
+        app_config = app.config
+        return pymysql.connect(
+            host=app_config['DB_HOST'],
+            user=app_config['DB_USER'],
+            password=app_config['DB_PASSWORD'],
+            database=app_config['DB_NAME'],
+            port=app_config.get('DB_PORT', 3306),
+            charset='utf8mb4',
+            cursorclass=pymysql.cursors.DictCursor # 결과를 딕셔너리 형태로 받기 위함
+        )
+
+    pool = ConnectionPool(
+        connect,
+        max_size=app.config.get('DB_POOL_SIZE', DEFAULT_POOL_SIZE),
+        max_lifetime=app.config.get('DB_POOL_MAX_LIFETIME', DEFAULT_MAX_LIFETIME),
+        timeout=app.config.get('DB_POOL_TIMEOUT', DEFAULT_TIMEOUT),
+        pre_ping=app.config.get('DB_POOL_PRE_PING', True),
+    )
+    app.extensions['db_pool'] = pool
+    atexit.register(pool.close_all)
     app.teardown_appcontext(close_db)
 
 
+def get_pool_stats():
+    """ DB 커넥션 풀 지표(생성/재사용/대기 횟수 등)를 반환합니다. """
+    return _get_pool().stats()
+
+
 # ======================================================================
 #                            USER 테이블 관련 함수
 # ======================================================================
@@ -91,6 +142,11 @@ def delete_user(user_id):
 #                  ANALYSIS 및 LIBRARY 관련 함수
 # ======================================================================
 
+def _analysis_text(analysis):
+    """ 분석 결과 객체(AnalysisResult)는 JSON 문자열로 직렬화하고, 문자열은 그대로 저장합니다. """
+    return analysis.to_json() if hasattr(analysis, 'to_json') else analysis
+
+
 def save_analysis(analysis_id, url, analysis_text, category_id, recommended_info=None):
     """ 
     분석 결과와 (선택적으로) 추천 상품 정보를 ANALYSES 테이블에 저장합니다.
@@ -98,6 +154,7 @@ def save_analysis(analysis_id, url, analysis_text, category_id, recommended_info
     db = get_db()
     cursor = db.cursor()
     
+    analysis_text = _analysis_text(analysis_text)
     # 리스트나 딕셔너리를 JSON 문자열로 변환 (None이면 NULL로 저장)
     recommended_info_json = json.dumps(recommended_info, ensure_ascii=False) if recommended_info else None
     
@@ -117,38 +174,132 @@ def link_analysis_to_keywords(analysis_id, keyword_ids):
     cursor.executemany(sql, data_tuples)
 
 
+class _IdCache:
+    """
+    이름(키워드/카테고리) -> ID 매핑을 프로세스 안에 보관하는 캐시입니다.
+    키워드/카테고리는 삭제되지 않으므로 한 번 확인된 ID는 계속 재사용할 수 있습니다.
+    단, 롤백된 트랜잭션에서 새로 만든 ID는 invalidate로 제거해야 합니다.
+    """
+
+    def __init__(self):
+        self._ids = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, names):
+        """ 반환값: (찾은 {name: id}, 캐시에 없는 name 리스트) """
+        with self._lock:
+            found = {name: self._ids[name] for name in names if name in self._ids}
+        return found, [name for name in names if name not in found]
+
+    def put_many(self, mapping):
+        with self._lock:
+            self._ids.update(mapping)
+
+    def invalidate(self, names):
+        with self._lock:
+            for name in names:
+                self._ids.pop(name, None)
+
+    def clear(self):
+        with self._lock:
+            self._ids.clear()
+
+
+_keyword_id_cache = _IdCache()
+_category_id_cache = _IdCache()
+
+
+def _mark_pending(kind, names):
+    """ 현재 요청의 트랜잭션에서 INSERT를 시도한 이름을 기록합니다. (커밋 전 종료 시 close_db에서 캐시 제거) """
+    pending = g.setdefault('_pending_id_names', {'keywords': set(), 'categories': set()})
+    pending[kind].update(names)
+
+
+def invalidate_id_caches(keywords=None, category_name=None):
+    """
+    키워드/카테고리 ID 캐시에서 항목을 제거합니다.
+    find_or_create_* 호출 후 트랜잭션을 롤백했다면, 새로 만들어졌다가 취소된 ID가 남지 않도록 호출해야 합니다.
+    """
+    if keywords:
+        _keyword_id_cache.invalidate(keywords)
+    if category_name:
+        _category_id_cache.invalidate([category_name])
+
+
 def find_or_create_category(category_name):
-    """ 카테고리 이름으로 ID를 찾고, 없으면 새로 생성 후 ID를 반환합니다. """
+    """
+    카테고리 이름으로 ID를 찾고, 없으면 새로 생성 후 ID를 반환합니다.
+    INSERT ... ON DUPLICATE KEY UPDATE + LAST_INSERT_ID로 조회/생성을 한 번의 쿼리로 처리합니다.
+    """
+    cached, _ = _category_id_cache.get_many([category_name])
+    if category_name in cached:
+        return cached[category_name]
+
     db = get_db()
     cursor = db.cursor()
-    
-    cursor.execute("SELECT category_id FROM CATEGORIES WHERE category_name = %s", (category_name,))
-    result = cursor.fetchone()
+    sql = """
+        INSERT INTO CATEGORIES (category_name) VALUES (%s)
+        ON DUPLICATE KEY UPDATE category_id = LAST_INSERT_ID(category_id)
+    """
+    cursor.execute(sql, (category_name,))
+    category_id = cursor.lastrowid
+    _mark_pending('categories', [category_name])
+    _category_id_cache.put_many({category_name: category_id})
+    return category_id
 
-    if result:
-        return result['category_id']
-    else:
-        cursor.execute("INSERT INTO CATEGORIES (category_name) VALUES (%s)", (category_name,))
-        return cursor.lastrowid
+
+def _select_keyword_ids(cursor, keywords, locking=False):
+    """
+    KEYWORDS 테이블에서 여러 키워드의 ID를 한 번에 조회합니다. (SELECT ... IN)
+    locking=True이면 공유 잠금 읽기(LOCK IN SHARE MODE)로 조회합니다.
+    REPEATABLE READ의 일반 SELECT는 트랜잭션 시작 시점의 스냅샷을 읽으므로, 다른 트랜잭션이 방금 커밋한 행
+    (INSERT가 중복 키로 건너뛴 행)을 보지 못할 수 있습니다. 잠금 읽기는 항상 최신 커밋된 행을 읽습니다.
+    """
+    placeholders = ', '.join(['%s'] * len(keywords))
+    sql = f"SELECT keyword, keyword_id FROM KEYWORDS WHERE keyword IN ({placeholders})"
+    if locking:
+        sql += " LOCK IN SHARE MODE"
+    cursor.execute(sql, tuple(keywords))
+    rows = cursor.fetchall()
+
+    # 테이블 collation(utf8mb4_general_ci)은 대소문자를 구분하지 않으므로, 입력값과 표기가 달라도 매칭합니다.
+    found = {row['keyword']: row['keyword_id'] for row in rows}
+    found_ci = {row['keyword'].casefold(): row['keyword_id'] for row in rows}
+    result = {}
+    for keyword in keywords:
+        keyword_id = found.get(keyword, found_ci.get(keyword.casefold()))
+        if keyword_id is not None:
+            result[keyword] = keyword_id
+    return result
 
 
 def find_or_create_keywords(keyword_list):
-    """ 키워드 리스트를 받아 각 키워드의 ID를 찾거나 생성하여 ID 리스트를 반환합니다. """
-    db = get_db()
-    cursor = db.cursor()
-    keyword_ids = []
+    """
+    키워드 리스트를 받아 각 키워드의 ID를 찾거나 생성하여 ID 리스트를 반환합니다.
+    키워드 개수와 관계없이 최대 3번(조회, 일괄 생성, 생성분 조회)의 쿼리로 처리합니다.
+    """
+    unique_keywords = list(dict.fromkeys(keyword_list))
+    keyword_ids, missing = _keyword_id_cache.get_many(unique_keywords)
 
-    for keyword in keyword_list:
-        cursor.execute("SELECT keyword_id FROM KEYWORDS WHERE keyword = %s", (keyword,))
-        result = cursor.fetchone()
-        
-        if result:
-            keyword_ids.append(result['keyword_id'])
-        else:
-            cursor.execute("INSERT INTO KEYWORDS (keyword) VALUES (%s)", (keyword,))
-            keyword_ids.append(cursor.lastrowid)
-            
-    return keyword_ids
+    if missing:
+        db = get_db()
+        cursor = db.cursor()
+
+        found = _select_keyword_ids(cursor, missing)
+        to_insert = [keyword for keyword in missing if keyword not in found]
+
+        if to_insert:
+            values = ', '.join(['(%s)'] * len(to_insert))
+            sql = f"INSERT INTO KEYWORDS (keyword) VALUES {values} ON DUPLICATE KEY UPDATE keyword = keyword"
+            cursor.execute(sql, tuple(to_insert))
+            _mark_pending('keywords', to_insert)
+            # 동시에 같은 키워드를 만든 다른 트랜잭션의 행도 보이도록 잠금 읽기로 다시 조회합니다.
+            found.update(_select_keyword_ids(cursor, to_insert, locking=True))
+
+        _keyword_id_cache.put_many(found)
+        keyword_ids.update(found)
+
+    return [keyword_ids[keyword] for keyword in keyword_list]
 
 
 def add_to_library(user_id, analysis_id):
@@ -169,31 +320,48 @@ def find_library_item(user_id, analysis_id):
     return cursor.fetchone()
 
 
-def get_library_by_user_id(user_id):
-    """ 특정 사용자의 라이브러리에 저장된 모든 analysis_id 리스트를 반환합니다. """
-    db = get_db()
-    cursor = db.cursor()
-    sql = "SELECT analysis_id FROM LIBRARY WHERE user_id = %s ORDER BY saved_at DESC"
-    cursor.execute(sql, (user_id,))
-    items = cursor.fetchall()
-    return [item['analysis_id'] for item in items]
-
+def get_library_page(user_id, limit, cursor=None, include_text=True):
+    """
+    사용자의 라이브러리 목록을 LIBRARY + ANALYSES 조인 한 번으로 조회합니다. (keyset 페이지네이션)
+    saved_at 최신순으로 정렬하며, cursor는 이전 페이지 마지막 항목의 (saved_at, analysis_id)입니다.
+    include_text=False이면 무거운 analysis_text 컬럼을 제외합니다.
 
-def get_analyses_by_ids(analysis_id_list):
-    """ 
-    analysis_id 리스트를 받아 상세 분석 정보를 반환합니다. 
-    (recommended_info 포함)
+    Returns:
+        (items, next_cursor): 다음 페이지가 없으면 next_cursor는 None
     """
-    if not analysis_id_list:
-        return []
     db = get_db()
-    cursor = db.cursor()
-    placeholders = ', '.join(['%s'] * len(analysis_id_list))
-    
-    # SELECT 절에 recommended_info 추가
-    sql = f"SELECT analysis_id, url, analysis_text, category_id, analyzed_at, recommended_info FROM ANALYSES WHERE analysis_id IN ({placeholders})"
-    cursor.execute(sql, tuple(analysis_id_list))
-    return cursor.fetchall()
+    cursor_obj = db.cursor()
+
+    columns = "a.analysis_id, a.url, a.category_id, a.analyzed_at, a.recommended_info, l.saved_at"
+    if include_text:
+        columns += ", a.analysis_text"
+
+    where = "l.user_id = %s"
+    params = [user_id]
+    if cursor:
+        saved_at, last_analysis_id = cursor
+        where += " AND (l.saved_at < %s OR (l.saved_at = %s AND l.analysis_id < %s))"
+        params.extend([saved_at, saved_at, last_analysis_id])
+
+    # 다음 페이지 존재 여부 확인을 위해 1개 더 조회
+    sql = f"""
+        SELECT {columns}
+        FROM LIBRARY l
+        JOIN ANALYSES a ON a.analysis_id = l.analysis_id
+        WHERE {where}
+        ORDER BY l.saved_at DESC, l.analysis_id DESC
+        LIMIT %s
+    """
+    params.append(limit + 1)
+    cursor_obj.execute(sql, tuple(params))
+    items = cursor_obj.fetchall()
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = (last['saved_at'], last['analysis_id'])
+    return items, next_cursor
 
 
 def delete_from_library(user_id, analysis_id):
@@ -231,11 +399,20 @@ def does_analysis_exist(analysis_id):
     return cursor.fetchone()
 
 
+def get_analysis_by_id(analysis_id):
+    """ analysis_id로 저장된 분석 결과(analysis_text, analyzed_at 등)를 조회합니다. 없으면 None """
+    db = get_db()
+    cursor = db.cursor()
+    sql = "SELECT analysis_id, url, analysis_text, analyzed_at FROM ANALYSES WHERE analysis_id = %s"
+    cursor.execute(sql, (analysis_id,))
+    return cursor.fetchone()
+
+
 def update_analysis_text(analysis_id, analysis_text):
     """ 기존 분석 결과의 analysis_text를 업데이트합니다. """
     # [!] 이 함수는 commit을 하지 않습니다. 호출한 쪽(facade)에서 트랜잭션을 관리합니다.
     db = get_db()
     cursor = db.cursor()
     sql = "UPDATE ANALYSES SET analysis_text = %s WHERE analysis_id = %s"
-    cursor.execute(sql, (analysis_text, analysis_id))
+    cursor.execute(sql, (_analysis_text(analysis_text), analysis_id))
     
@@ -0,0 +1,172 @@
+# RA/review_analyzer/db/pool.py
+
+"""
+PyMySQL 연결을 재사용하기 위한 커넥션 풀 모듈입니다.
+요청마다 TCP 연결 + 인증을 새로 하지 않고, get_db/close_db가 이 풀에서 연결을 빌리고 반납합니다.
+
+- 최대 연결 수 제한 (DB_POOL_SIZE), 모두 사용 중이면 DB_POOL_TIMEOUT 초까지 대기
+- pre-ping: 빌려주기 전에 ping으로 끊긴 연결을 걸러냅니다.
+- 최대 수명(DB_POOL_MAX_LIFETIME)이 지난 연결은 닫고 새로 만듭니다. (MySQL wait_timeout 대비)
+- 풀 상태 지표(stats)를 제공합니다.
+"""
+
+import time
+import threading
+from collections import deque
+
+# --- 기본 설정 (config.py에서 덮어쓸 수 있음) ---
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_LIFETIME = 60 * 30   # 30분
+DEFAULT_TIMEOUT = 10             # 연결을 빌리기 위해 기다리는 최대 시간 (초)
+
+
+class PoolTimeoutError(Exception):
+    """ 제한 시간 안에 사용 가능한 DB 연결을 얻지 못했을 때 발생하는 예외입니다. """
+
+
+class ConnectionPool:
+    def __init__(self, connect, max_size=DEFAULT_POOL_SIZE, max_lifetime=DEFAULT_MAX_LIFETIME,
+                 timeout=DEFAULT_TIMEOUT, pre_ping=True):
+        self._connect = connect          # 새 연결을 만드는 함수
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.timeout = timeout
+        self.pre_ping = pre_ping
+
+        self._idle = deque()             # (conn, created_at)
+        self._created_at = {}            # id(conn) -> created_at (사용 중인 연결 포함)
+        self._size = 0                   # 현재 열려 있는(또는 생성 중인) 연결 수
+        self._cond = threading.Condition()
+        self._metrics = {
+            "created": 0,
+            "reused": 0,
+            "recycled": 0,        # 최대 수명 초과로 교체
+            "ping_failed": 0,     # pre-ping 실패로 폐기
+            "discarded": 0,       # 반납 시 오류로 폐기
+            "waits": 0,
+            "wait_time_total": 0.0,
+            "timeouts": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # 내부 유틸
+    # ------------------------------------------------------------------
+    def _inc(self, name, value=1):
+        with self._cond:
+            self._metrics[name] += value
+
+    def _close(self, conn):
+        """ 연결을 닫고 풀 크기에서 제외합니다. (lock 밖에서 호출) """
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._created_at.pop(id(conn), None)
+            self._size -= 1
+            self._cond.notify()
+
+    def _is_usable(self, conn, created_at):
+        if time.time() - created_at > self.max_lifetime:
+            self._inc("recycled")
+            return False
+        if self.pre_ping:
+            try:
+                conn.ping(reconnect=False)
+            except Exception:
+                self._inc("ping_failed")
+                return False
+        return True
+
+    # ------------------------------------------------------------------
+    # 공개 API
+    # ------------------------------------------------------------------
+    def acquire(self):
+        """ 풀에서 사용 가능한 연결을 꺼냅니다. 없으면 새로 만들거나 반납될 때까지 기다립니다. """
+        deadline = time.time() + self.timeout
+        waited_from = None
+
+        while True:
+            with self._cond:
+                if self._idle:
+                    conn, created_at = self._idle.pop()
+                elif self._size < self.max_size:
+                    self._size += 1
+                    conn = None
+                else:
+                    if waited_from is None:
+                        waited_from = time.time()
+                        self._metrics["waits"] += 1
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        self._metrics["timeouts"] += 1
+                        raise PoolTimeoutError("DB 연결 풀에서 연결을 얻지 못했습니다. (대기 시간 초과)")
+                    self._cond.wait(remaining)
+                    continue
+
+            if waited_from is not None:
+                self._inc("wait_time_total", time.time() - waited_from)
+                waited_from = None
+
+            if conn is None:
+                # 새 연결 생성 (네트워크 작업이므로 lock 밖에서 수행)
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._created_at[id(conn)] = time.time()
+                    self._metrics["created"] += 1
+                return conn
+
+            # 기존 연결 재사용 전 검증 (ping은 lock 밖에서 수행)
+            if self._is_usable(conn, created_at):
+                self._inc("reused")
+                return conn
+            self._close(conn)
+
+    def release(self, conn, discard=False):
+        """
+        사용이 끝난 연결을 반납합니다.
+        커밋되지 않은 트랜잭션은 롤백하여 다음 사용자에게 상태가 넘어가지 않도록 합니다.
+        """
+        if conn is None:
+            return
+        if not discard:
+            try:
+                conn.rollback()
+            except Exception:
+                discard = True
+
+        if discard:
+            self._inc("discarded")
+            self._close(conn)
+            return
+
+        with self._cond:
+            created_at = self._created_at.get(id(conn), time.time())
+            self._idle.append((conn, created_at))
+            self._cond.notify()
+
+    def close_all(self):
+        """ 유휴 연결을 모두 닫습니다. """
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+        for conn, _ in idle:
+            self._close(conn)
+
+    def stats(self):
+        """ 풀 상태 지표를 딕셔너리로 반환합니다. """
+        with self._cond:
+            stats = dict(self._metrics)
+            stats.update({
+                "max_size": self.max_size,
+                "open": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+            })
+        return stats
@@ -37,6 +37,7 @@ CREATE TABLE LIBRARY (
     analysis_id CHAR(64) NOT NULL COMMENT '분석 ID',
     saved_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '저장일',
     PRIMARY KEY (user_id, analysis_id), -- 동일한 사용자가 동일한 분석을 중복 저장하는 것을 방지
+    INDEX idx_library_user_saved (user_id, saved_at, analysis_id), -- 라이브러리 목록 keyset 페이지네이션용
     FOREIGN KEY (user_id) REFERENCES USERS(user_id) ON DELETE CASCADE,
     FOREIGN KEY (analysis_id) REFERENCES ANALYSES(analysis_id) ON DELETE CASCADE
 ) COMMENT '사용자 라이브러리 테이블';
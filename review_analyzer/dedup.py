@@ -0,0 +1,123 @@
+# RA/review_analyzer/dedup.py
+
+"""
+AI 분석 전에 거의 같은 리뷰(템플릿/복붙 리뷰, 여러 별점 필터에 중복 수집된 리뷰)를 제거하는 모듈입니다.
+리뷰 '내용'의 글자 n-gram 집합으로 MinHash 서명을 만들고, LSH(banding)로 후보 쌍만 골라
+추정 자카드 유사도가 임계값(ANALYSIS_DEDUP_THRESHOLD) 이상인 리뷰를 한 묶음으로 봅니다.
+묶음마다 도움됨 수가 가장 많은 리뷰 하나만 남깁니다.
+"""
+
+import hashlib
+from array import array
+from collections import defaultdict
+
+from .keyword_matcher import normalize_text
+
+DEFAULT_THRESHOLD = 0.8     # 추정 자카드 유사도가 이 값 이상이면 중복으로 판단
+SHINGLE_SIZE = 3            # 글자 n-gram 크기 (공백 제거 후)
+NUM_PERM = 64               # MinHash 해시 함수 수
+
+
+def _shingles(text, size=SHINGLE_SIZE):
+    normalized = normalize_text(text)
+    if len(normalized) <= size:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+
+
+def _shingle_hashes(shingle):
+    """ n-gram 하나에 대한 NUM_PERM개의 32비트 해시 (SHAKE-128 출력을 잘라 서로 다른 해시 함수로 사용) """
+    return array('I', hashlib.shake_128(shingle.encode('utf-8')).digest(NUM_PERM * 4))
+
+
+def minhash_signature(text):
+    """ 리뷰 텍스트의 MinHash 서명(NUM_PERM개 정수 튜플)을 만듭니다. 텍스트가 비어 있으면 None """
+    shingles = _shingles(text)
+    if not shingles:
+        return None
+    # 해시 함수(열)마다 모든 n-gram 중 최솟값을 취합니다.
+    return tuple(map(min, zip(*map(_shingle_hashes, shingles))))
+
+
+def _choose_bands(threshold):
+    """
+    LSH 후보가 임계값보다 조금 낮은 유사도부터 잡히도록 밴드 수/밴드당 행 수를 고릅니다.
+    (후보는 실제 추정 유사도로 다시 검증하므로 재현율 쪽으로 치우치게 설정)
+    """
+    best = (NUM_PERM, 1)
+    for rows in range(1, NUM_PERM + 1):
+        if NUM_PERM % rows:
+            continue
+        bands = NUM_PERM // rows
+        if (1 / bands) ** (1 / rows) <= threshold - 0.1:
+            best = (bands, rows)
+    return best
+
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def _helpful(review):
+    try:
+        return int(review.get('도움됨') or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def dedup_reviews(reviews_by_rating, threshold=DEFAULT_THRESHOLD):
+    """
+    별점별 리뷰({rating: [review, ...]})에서 거의 같은 리뷰를 제거합니다. (별점 간 중복 포함)
+    내용이 비어 있어 서명을 만들 수 없는 리뷰는 비교하지 않고 그대로 남깁니다. (통계의 skipped_empty)
+    반환값: (중복을 제거한 {rating: [review, ...]}, 통계 dict)
+    """
+    items = [(rating, review) for rating, reviews in reviews_by_rating.items() for review in reviews]
+    signatures = [minhash_signature(str(review.get('내용') or '')) for _, review in items]
+    indexed = [i for i, signature in enumerate(signatures) if signature is not None]
+
+    parent = list(range(len(items)))
+    bands, rows = _choose_bands(threshold)
+    buckets = defaultdict(list)
+    for i in indexed:
+        for band in range(bands):
+            buckets[(band, signatures[i][band * rows:(band + 1) * rows])].append(i)
+
+    compared = set()
+    for members in buckets.values():
+        for a_pos in range(len(members)):
+            for b_pos in range(a_pos + 1, len(members)):
+                a, b = members[a_pos], members[b_pos]
+                root_a, root_b = _find(parent, a), _find(parent, b)
+                # 이미 같은 묶음이거나 비교한 쌍은 건너뜁니다. (복붙 리뷰가 많으면 같은 버킷에 몰림)
+                if root_a == root_b or (a, b) in compared:
+                    continue
+                compared.add((a, b))
+                similarity = sum(x == y for x, y in zip(signatures[a], signatures[b])) / NUM_PERM
+                if similarity >= threshold:
+                    parent[root_b] = root_a
+
+    # 묶음마다 도움됨 수가 가장 많은 리뷰(같으면 먼저 나온 리뷰)를 남깁니다.
+    keep = {}
+    for i in indexed:
+        root = _find(parent, i)
+        if root not in keep or _helpful(items[i][1]) > _helpful(items[keep[root]][1]):
+            keep[root] = i
+    skipped = [i for i, signature in enumerate(signatures) if signature is None]
+    kept = set(keep.values()).union(skipped)
+
+    result = {rating: [] for rating in reviews_by_rating}
+    for i, (rating, review) in enumerate(items):
+        if i in kept:
+            result[rating].append(review)
+
+    stats = {
+        "input": len(items),
+        "kept": len(kept),
+        "removed": len(items) - len(kept),
+        "skipped_empty": len(skipped),
+        "compared_pairs": len(compared),
+    }
+    return result, stats
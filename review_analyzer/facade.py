@@ -8,94 +8,384 @@
 # 현재 패키지 내의 모듈들을 상대 경로로 임포트합니다.
 from .crawling import Crapping_module_ver1 as crawl_module
 from .crawling import Recommend_Product as recommend_module
+from .crawling import crawl_executor
+from .crawling import review_store
 from .ai import analyzer as ai_module
+from .ai import tokens as token_module
+from .ai.result import AnalysisResult, AnalysisFormatError, KeywordAnalysis, UNAVAILABLE_SUMMARY
+from .ai.resilience import AIUnavailableError
 from .db import db
+from . import result_cache
+from . import pipeline
+from . import keyword_matcher
+from . import dedup
+from . import keyword_cache
+from .singleflight import SingleFlight
 
 # 기본 라이브러리
-import pandas as pd
 import hashlib
-from multiprocessing import Pool, Manager
 import os
-import json
 import traceback # 오류 로깅을 위해 추가
-import re # 텍스트 마이닝(데이터 전처리)
+import threading
+from dataclasses import asdict, replace
+from datetime import datetime
+from flask import current_app
 
-def analyze_reviews(link, keywords):
+# 같은 analysis_id에 대한 동시 분석 요청을 하나의 실행으로 합칩니다.
+_inflight_analyses = SingleFlight()
+
+# 별점마다 키워드별로 이만큼의 문장을 모으면 그 별점의 크롤링을 멈춥니다. (config.py에서 덮어쓸 수 있음)
+DEFAULT_STOP_SENTENCES_PER_KEYWORD = 10
+# map-reduce 분석 시 묶음 하나의 최대 토큰 수 (토큰 예산(8000) 이상: 예산을 넘는 입력만 나눠 분석)
+DEFAULT_CHUNK_TOKENS = 16000
+
+def _sample_for_analysis(reviews_by_rating, matcher):
+    """
+    토큰 예산(ANALYSIS_TOKEN_BUDGET) 안에서 별점/키워드별로 고르게 키워드 포함 문장을 고릅니다.
+    ANALYSIS_COUNT_TOKENS가 켜져 있으면 결과를 모델의 토크나이저로 한 번 세어 추정치를 보정하고,
+    예산을 넘었으면 보정된 추정치로 같은 예산 안에서 다시 고릅니다.
+    반환값: (문장 리스트, 통계 dict)
+    """
+    budget = current_app.config.get('ANALYSIS_TOKEN_BUDGET', pipeline.DEFAULT_TOKEN_BUDGET)
+    estimator = token_module.get_token_estimator()
+    sentences, stats = pipeline.sample_analysis_sentences(reviews_by_rating, matcher, budget, estimator.estimate)
+
+    if not sentences or not current_app.config.get('ANALYSIS_COUNT_TOKENS', True):
+        return sentences, stats
+
+    text = " ".join(sentences)
+    actual = ai_module.count_tokens(text)
+    if actual:
+        estimator.calibrate(text, actual)
+        stats['estimated_tokens'] = actual
+        if actual > budget:
+            # 추정기가 이미 실제 토큰 수로 보정되었으므로 예산을 따로 줄이지 않습니다. (이중 보정 방지)
+            print(f"LOG: Sampled text exceeds token budget ({actual} > {budget}), resampling")
+            sentences, stats = pipeline.sample_analysis_sentences(
+                reviews_by_rating, matcher, budget, estimator.estimate)
+    return sentences, stats
+
+
+def _run_ai_analysis(keywords, sentences, progress_callback=None):
+    """
+    AI 분석을 수행하고 검증된 분석 결과(AnalysisResult)를 반환합니다.
+    AI_MAP_REDUCE가 켜져 있고 문장이 AI_CHUNK_TOKENS보다 많으면, 묶음으로 나눠 동시에 분석한 뒤 합칩니다.
+    (묶음마다 system_message를 다시 보내고 reduce 호출이 더해지며 스트리밍 이벤트도 끝에야 나가므로,
+    AI_CHUNK_TOKENS는 ANALYSIS_TOKEN_BUDGET 이상으로 두어 예산을 넘는 큰 입력에만 쓰이게 합니다.)
+    한 번에 분석하는 경우 AI_STREAMING이 켜져 있고 진행 상황을 받을 곳이 있으면, 응답을 스트리밍으로 받아
+    키워드 분석 결과가 완성되는 대로 'keyword_result' / 'analysis_field' 이벤트로 전달합니다.
+    """
+    if current_app.config.get('AI_MAP_REDUCE', True):
+        chunk_tokens = current_app.config.get('AI_CHUNK_TOKENS', DEFAULT_CHUNK_TOKENS)
+        estimate = token_module.get_token_estimator().estimate
+        chunks = list(pipeline.chunk_sentences(sentences, chunk_tokens, estimate))
+        if len(chunks) > 1:
+            print(f"LOG: Map-reduce AI analysis over {len(chunks)} chunks")
+            return ai_module.analyze_reviews_map_reduce(keywords, chunks)
+
+    if progress_callback and current_app.config.get('AI_STREAMING', True):
+        return ai_module.analyze_reviews_stream(
+            keywords, " ".join(sentences),
+            on_item=lambda item: _report(progress_callback, 'keyword_result', keyword_analysis=item),
+            on_field=lambda name, value: _report(progress_callback, 'analysis_field', name=name, value=value),
+        )
+    return ai_module.analyze_reviews(keywords, " ".join(sentences))
+
+
+def _get_matcher(keywords):
+    """ 설정(KEYWORD_MATCH_*)에 맞춰 키워드 집합의 다중 패턴 매처를 반환합니다. """
+    return keyword_matcher.get_matcher(
+        keywords,
+        ignore_spaces=current_app.config.get('KEYWORD_MATCH_IGNORE_SPACES', True),
+        jamo=current_app.config.get('KEYWORD_MATCH_JAMO', False),
+    )
+
+
+def _analyze_keywords(product_id, generation, reviews_by_rating, keywords, progress_callback=None):
+    """
+    키워드 단위 분석 캐시(상품 ID + 리뷰 저장소 세대 + 키워드)를 먼저 확인하고,
+    캐시에 없는 키워드만 문장을 골라 AI로 분석한 뒤 입력 키워드 순서대로 결과를 조립합니다.
+    AI를 쓸 수 없을 때(서킷 열림, 재시도 초과) 캐시된 키워드가 있으면, 나머지 키워드를 '분석하지 못함'으로 채운
+    부분 결과를 반환합니다. 캐시된 키워드도 없으면 AIUnavailableError를 그대로 전달합니다.
+    일부 리뷰 묶음의 분석이 실패한 결과(partial)는 키워드 캐시에 저장하지 않고, coverage를 그대로 넘깁니다.
+    캐시된 키워드의 개수는 그 키워드를 분석한 당시의 키워드 조합으로 뽑은 표본(문장 예산)에서 센 값이므로,
+    같은 결과 안의 다른 키워드와 표본 크기가 다를 수 있습니다. (긍정/부정 비율 비교용, 키워드 간 절대 개수 비교용 아님)
+    반환값: (AnalysisResult, 분석하지 못한 키워드 리스트) (AI 응답을 해석할 수 없으면 AnalysisFormatError)
+    """
+    cache = keyword_cache.get_keyword_cache() if current_app.config.get('KEYWORD_CACHE_ENABLED', True) else None
+    cached, missing = cache.lookup(product_id, generation, keywords) if cache else ({}, list(keywords))
+    summary = cache.product_summary(product_id, generation) if cache else None
+    if not missing and summary is None:
+        # 키워드 결과는 남아 있지만 제품 요약이 만료된 경우: 전체를 다시 분석합니다.
+        cached, missing = {}, list(keywords)
+
+    cached = {k: replace(item, keyword=k) for k, item in cached.items()}
+    if cached:
+        print(f"LOG: Keyword cache hit for {list(cached)} (analyzing {missing})")
+        for item in cached.values():
+            _report(progress_callback, 'keyword_result', keyword_analysis=asdict(item), cached=True)
+
+    fresh_items = {}
+    if missing:
+        # ----------- 키워드 텍스트 마이닝(키워드 포함 문장 추출) -------------
+        sentences, sample_stats = _sample_for_analysis(reviews_by_rating, _get_matcher(missing))
+        final_string = " ".join(sentences)
+        _report(progress_callback, 'analyzing', review_count=sample_stats['reviews'],
+                sentence_count=sample_stats['sentences'], token_count=sample_stats['estimated_tokens'])
+        print(final_string, len(final_string))
+        print(f"LOG: Sampled {sample_stats['sentences']} sentences (~{sample_stats['estimated_tokens']} tokens), "
+              f"per rating: {sample_stats['per_rating']}, keyword hits: {sample_stats['hit_counts']}")
+        # ------------ review_string 전처리 끝 -------------
+        try:
+            fresh = _run_ai_analysis(missing, sentences, progress_callback)
+        except AIUnavailableError as e:
+            if not cached:
+                raise
+            # 이미 끝난 크롤링과 캐시된 키워드 결과를 버리지 않고 부분 결과로 응답합니다.
+            print(f"WARNING: AI unavailable, returning partial result without {missing}: {e}")
+            partial = AnalysisResult(
+                product_name=summary[0] if summary else "",
+                overall_sentiment_summary=summary[1] if summary else "",
+                keywords_analysis=[
+                    cached.get(k) or KeywordAnalysis(keyword=k, positive_summary=UNAVAILABLE_SUMMARY,
+                                                     negative_summary=UNAVAILABLE_SUMMARY)
+                    for k in keywords
+                ],
+            )
+            return partial, missing
+        if cache and not fresh.partial:
+            cache.put(product_id, generation, fresh)
+        fresh_items = {item.keyword: item for item in fresh.keywords_analysis}
+        summary = (fresh.product_name, fresh.overall_sentiment_summary)
+
+    product_name, overall_summary = summary
+    analysis = AnalysisResult(
+        product_name=product_name,
+        overall_sentiment_summary=overall_summary,
+        keywords_analysis=[cached.get(k) or fresh_items[k] for k in keywords],
+        coverage=fresh.coverage if missing else None,
+    )
+    return analysis, []
+
+
+def _report(progress_callback, event, **data):
+    """ 진행 상황 콜백이 있으면 이벤트를 전달합니다. (비동기 작업의 진행률 표시용) """
+    if progress_callback:
+        try:
+            progress_callback(event, data)
+        except Exception as e:
+            print(f"WARNING: progress callback failed: {e}")
+
+
+def make_analysis_id(link, keywords):
+    """ 링크 + 정렬된 키워드 목록으로 분석 고유 ID(sha256)를 만듭니다. """
+    keywords_str = ",".join(sorted(keywords))
+    unique_string = link + keywords_str
+    return hashlib.sha256(unique_string.encode('utf-8')).hexdigest()
+
+
+def _strip_library_fields(analysis_text):
+    """
+    라이브러리 저장 시 analysis_text에 덧붙인 유사 상품 링크(related_products)를 제거합니다.
+    DB의 분석 결과를 일반 분석 응답으로 돌려줄 때, 다른 사용자의 저장 내용이 섞이지 않도록 합니다.
+    """
+    try:
+        analysis = AnalysisResult.from_json(analysis_text)
+    except AnalysisFormatError:
+        return analysis_text
+    if analysis.related_products is None:
+        return analysis_text
+    analysis.related_products = None
+    return analysis.to_json()
+
+
+def _lookup_cached_result(analysis_id, link, keywords):
+    """
+    결과 캐시(LRU) -> DB(ANALYSES) 순서로 이미 분석된 결과를 찾습니다.
+    반환값: (result_data, is_stale) / 없으면 (None, False)
+    """
+    cache = result_cache.get_result_cache()
+    cached_data, is_stale = cache.get(analysis_id)
+    if cached_data is not None:
+        return cached_data, is_stale
+
+    if not cache.use_db:
+        return None, False
+
+    try:
+        # 이후의 크롤링/AI 호출 동안 연결을 붙잡지 않도록 조회가 끝나면 바로 반납합니다.
+        with db.short_lived_connection():
+            row = db.get_analysis_by_id(analysis_id)
+    except Exception as e:
+        # DB 조회 실패가 분석 자체를 막지 않도록 경고만 남깁니다.
+        print(f"WARNING: Result cache DB lookup failed: {e}")
+        return None, False
+
+    if not row:
+        return None, False
+
+    result_data = {
+        "analysis_id": analysis_id,
+        "url": link,
+        "keywords": keywords,
+        "analysis_text": _strip_library_fields(row['analysis_text']),
+    }
+    analyzed_at = row.get('analyzed_at')
+    stored_at = analyzed_at.timestamp() if isinstance(analyzed_at, datetime) else None
+    cache.put(analysis_id, result_data, stored_at=stored_at)
+    return cache.get(analysis_id)
+
+
+def _revalidate_in_background(link, keywords, analysis_id):
+    """ 오래된(stale) 캐시 결과를 반환한 뒤, 백그라운드 스레드에서 다시 분석하여 캐시를 갱신합니다. """
+    cache = result_cache.get_result_cache()
+    if not cache.start_refresh(analysis_id):
+        return
+
+    app = current_app._get_current_object()
+
+    def _revalidate():
+        try:
+            with app.app_context():
+                print(f"LOG: Revalidating stale analysis {analysis_id} in background")
+                _run_analysis_once(link, keywords, analysis_id)
+        finally:
+            cache.finish_refresh(analysis_id)
+
+    threading.Thread(target=_revalidate, daemon=True).start()
+
+
+def analyze_reviews(link, keywords, progress_callback=None):
     """
     주어진 URL과 키워드로 리뷰를 분석하는 전체 과정을 수행합니다.
+    이미 분석된 결과가 캐시/DB에 있으면 크롤링과 AI 호출 없이 바로 반환합니다.
+    progress_callback(event, data)가 주어지면 단계별 진행 상황을 전달합니다.
+    """
+    analysis_id = make_analysis_id(link, keywords)
+
+    cached_data, is_stale = _lookup_cached_result(analysis_id, link, keywords)
+    if cached_data is not None:
+        print(f"LOG: Result cache hit for {analysis_id} (stale={is_stale})")
+        _report(progress_callback, 'cache_hit', analysis_id=analysis_id, stale=is_stale)
+        if is_stale:
+            _revalidate_in_background(link, keywords, analysis_id)
+        return {"status": "success", "data": cached_data}
+
+    return _run_analysis_once(link, keywords, analysis_id, progress_callback)
+
+
+def _run_analysis_once(link, keywords, analysis_id, progress_callback=None):
+    """
+    같은 analysis_id의 분석이 이미 진행 중이면 새로 크롤링/AI 호출을 하지 않고 그 결과를 함께 받습니다.
+    합류한 요청도 진행 중인 분석의 진행 이벤트를 전달받습니다.
+    """
+    if _inflight_analyses.in_flight(analysis_id):
+        print(f"LOG: Joining in-flight analysis {analysis_id}")
+        _report(progress_callback, 'joined', analysis_id=analysis_id)
+
+    result, shared = _inflight_analyses.do(
+        analysis_id,
+        lambda notify: _run_analysis(link, keywords, analysis_id, notify),
+        subscriber=progress_callback,
+    )
+    if shared:
+        print(f"LOG: Shared in-flight result for {analysis_id}")
+    return result
+
+
+def _run_analysis(link, keywords, analysis_id, progress_callback=None):
+    """
+    실제 분석 파이프라인을 수행하고 결과를 캐시에 저장합니다.
     (병렬 크롤링 -> 데이터 취합 -> AI 분석)
     """
     print(keywords)
     try:
         # --- 크롤링 ---
-        print("LOG: Starting parallel crawling...")
-        manager = Manager()
-        lock = manager.Lock()
-        tasks = [(link, rating, lock) for rating in crawl_module.TARGET_RATINGS]
-
-        # 동시에 실행할 프로세스 수 결정 (CPU 코어 수와 작업 수 중 작은 값, 최대 4개로 제한)
-        num_processes = 5
-
-        all_reviews = []
-        with Pool(processes=num_processes) as pool:
-            results_list = pool.map(crawl_module.scrape_wrapper, tasks)
-            for result in results_list:
-                all_reviews.extend(result)
-        
-        if not all_reviews:
+        # 리뷰 저장소(캐시)를 먼저 확인하여, 캐시가 없거나 만료된 별점만 크롤링합니다.
+        store = review_store.get_review_store()
+        product_id = review_store.normalize_product_id(link)
+        crawl_plan = store.plan(product_id, crawl_module.TARGET_RATINGS)
+
+        # 키워드 문장을 충분히 모은 별점은 남은 페이지를 크롤링하지 않습니다. (조기 종료)
+        early_stop = current_app.config.get('CRAWL_EARLY_STOP', True)
+        stop_target = current_app.config.get('CRAWL_STOP_SENTENCES_PER_KEYWORD', DEFAULT_STOP_SENTENCES_PER_KEYWORD)
+        # 키워드 집합으로 만든 다중 패턴 매처로 조기 종료를 판단합니다. (문장 추출은 캐시에 없는 키워드만 대상)
+        matcher = _get_matcher(keywords)
+        coverage = pipeline.KeywordCoverage(matcher, stop_target)
+
+        # 조기 종료로 일부만 캐시된 별점: 이번 키워드에도 충분하면 그대로 쓰고, 아니면 다시 전체 수집
+        for rating, (mode, _) in crawl_plan.items():
+            if mode == review_store.MODE_PARTIAL:
+                enough = early_stop and pipeline.KeywordCoverage(matcher, stop_target).add(
+                    rating, store.get_reviews(product_id, rating))
+                crawl_plan[rating] = (review_store.MODE_FRESH if enough else review_store.MODE_FULL, None)
+
+        ratings_to_crawl = [r for r, (mode, _) in crawl_plan.items() if mode != review_store.MODE_FRESH]
+
+        for rating in crawl_module.TARGET_RATINGS:
+            if rating not in ratings_to_crawl:
+                _report(progress_callback, 'rating_done', rating=rating,
+                        count=len(store.get_reviews(product_id, rating)), cached=True)
+
+        if ratings_to_crawl:
+            print(f"LOG: Starting parallel crawling... (ratings: {ratings_to_crawl})")
+            # 앱 전체가 공유하는 워커 풀에 작업을 제출합니다. (동시성 제한 + 대기열)
+            executor = crawl_executor.get_crawl_executor()
+            since = {r: crawl_plan[r][1] for r in ratings_to_crawl if crawl_plan[r][0] == review_store.MODE_INCREMENTAL}
+            _report(progress_callback, 'crawl_start', ratings=ratings_to_crawl)
+
+            def on_batch(rating, reviews):
+                # 증분 수집은 캐시된 리뷰와 합쳐야 하므로 조기 종료하지 않습니다.
+                if not early_stop or rating in since:
+                    return False
+                return coverage.add(rating, reviews)
+
+            def on_rating_done(rating, result, stopped_early):
+                # stopped_early: 실행기가 실제로 남은 페이지를 취소했을 때만 True (일부만 수집된 데이터)
+                if rating in since:
+                    store.merge(product_id, rating, result)
+                else:
+                    store.put(product_id, rating, result, complete=not stopped_early)
+                _report(progress_callback, 'rating_done', rating=rating, count=len(result), cached=False,
+                        early_stopped=stopped_early)
+
+            executor.map_ratings(link, ratings_to_crawl, since=since, on_progress=on_rating_done, on_batch=on_batch)
+        else:
+            print(f"LOG: Using cached reviews for product {product_id} (crawling skipped)")
+
+        generation = store.generation(product_id, crawl_module.TARGET_RATINGS)
+        reviews_by_rating = {r: store.get_reviews(product_id, r) for r in crawl_module.TARGET_RATINGS}
+        if not any(reviews_by_rating.values()):
             raise Exception("크롤링을 통해 수집된 리뷰가 없습니다.")
 
         # --- AI 분석 ---
         print("LOG: Starting AI analysis...")
-        temp_df = pd.DataFrame(all_reviews)
-        if '내용' not in temp_df.columns:
-             raise Exception("수집된 리뷰 데이터에 '내용' 컬럼이 없습니다.")
-             
-        clean_df = temp_df.dropna(subset=['내용'])
-        review_string = ' '.join(clean_df['내용'].astype(str).tolist())[:15000]
-        print(review_string, len(review_string))
-        # ----------- 키워드 텍스트 마이닝(키워드 포함 문장 추출) -------------
-        target_keywords = keywords
-        sep_sentences = re.split(r'[.?!]\s*', review_string)
-        extracted_sentences = []
-        for sentence in sep_sentences:
-            sentence = sentence.strip()
-            if not sentence:
-                continue
-
-            for keyword in target_keywords:
-                if keyword in sentence:
-                    extracted_sentences.append(sentence)
-                    break
-        
-        final_string = " ".join(extracted_sentences)
-        print(final_string, len(final_string))
-        # ------------ review_string 전처리 끝 -------------
-        ai_response_json_str = ai_module.analyze_reviews(keywords, final_string)
-        # ai_response_json_str = ai_module.analyze_reviews(keywords, review_string)
-       
-        print("DEBUG: ================= AI RAW RESPONSE START =================")
-        print(ai_response_json_str)
-        print("DEBUG: ================= AI RAW RESPONSE END ===================")
-
+        # 템플릿/복붙 리뷰, 여러 필터에 중복 수집된 리뷰를 문장 추출 전에 제거합니다.
+        dedup_threshold = current_app.config.get('ANALYSIS_DEDUP_THRESHOLD', dedup.DEFAULT_THRESHOLD)
+        if dedup_threshold:
+            reviews_by_rating, dedup_stats = dedup.dedup_reviews(reviews_by_rating, dedup_threshold)
+            print(f"LOG: Near-duplicate reviews removed: {dedup_stats['removed']} / {dedup_stats['input']}")
+        # 모델 응답은 ai 모듈에서 한 번만 파싱/검증되어 AnalysisResult로 넘어오고, 여기서 한 번만 직렬화합니다.
+        unanalyzed = []
+        chunk_coverage = None
         try:
-            clean_json_str = ai_response_json_str.replace("```json", "").replace("```", "").strip()
-            
-            ai_data = json.loads(clean_json_str)
-            print("LOG: AI response successfully parsed to JSON.")
-            
-            final_analysis_text = json.dumps(ai_data, ensure_ascii=False)
-        except json.JSONDecodeError as e:
-            print(f"ERROR: JSON Parsing failed. Reason: {e}")
-            # 파싱 실패 시, 원본 텍스트를 그대로 넘김 (프론트에서 처리하도록)
-            # 하지만 위에서 replace 처리를 했으므로 성공 확률이 훨씬 높아짐
-            final_analysis_text = ai_response_json_str
+            analysis, unanalyzed = _analyze_keywords(
+                product_id, generation, reviews_by_rating, keywords, progress_callback)
+            chunk_coverage = analysis.coverage if analysis.partial else None
+            final_analysis_text = analysis.to_json()
+            print("LOG: AI response validated as analysis result.")
+        except AnalysisFormatError as e:
+            if e.raw_text is None:
+                raise
+            print(f"ERROR: AI response is not a valid analysis result. Reason: {e}")
+            # 해석 실패 시, 원본 텍스트를 그대로 넘김 (프론트에서 처리하도록)
+            final_analysis_text = e.raw_text
+
+        print("DEBUG: ================= AI RESPONSE START =================")
+        print(final_analysis_text)
+        print("DEBUG: ================= AI RESPONSE END ===================")
 
         # --- 최종 결과 데이터 생성 ---
-        keywords_str = ",".join(sorted(keywords))
-        unique_string = link + keywords_str
-        analysis_id = hashlib.sha256(unique_string.encode('utf-8')).hexdigest()
-        
         result_data = {
             "analysis_id": analysis_id,
             "url": link,
@@ -106,8 +396,28 @@ def analyze_reviews(link, keywords):
         # [DEBUG] 최종 반환 데이터 구조 확인
         print(f"DEBUG: Final Result Data Keys: {result_data.keys()}")
 
+        if unanalyzed or chunk_coverage:
+            # 부분 결과는 캐시하지 않아 다음 요청에서 다시 분석합니다. (리뷰는 리뷰 캐시에 남아 크롤링은 생략됨)
+            result_data["partial"] = True
+            if unanalyzed:
+                result_data["unanalyzed_keywords"] = unanalyzed
+            if chunk_coverage:
+                # 일부 리뷰 묶음의 분석이 실패하여 개수가 표본 전체보다 적게 집계됨
+                result_data["coverage"] = {"analyzed_chunks": chunk_coverage[0], "total_chunks": chunk_coverage[1]}
+            return {"status": "success", "data": result_data}
+
+        result_cache.get_result_cache().put(analysis_id, result_data)
         return {"status": "success", "data": result_data}
 
+    except crawl_executor.CrawlQueueFullError as e:
+        print(f"WARNING: Crawl queue is full (active={e.active_jobs}, waiting={e.waiting_jobs})")
+        return {"status": "busy", "message": str(e), "waiting_jobs": e.waiting_jobs}
+
+    except AIUnavailableError as e:
+        # AI 제공자 장애/요청 한도 초과: 수집한 리뷰는 리뷰 캐시에 남아 있으므로 재시도 시 크롤링 없이 분석합니다.
+        print(f"WARNING: AI analysis unavailable: {e}")
+        return {"status": "busy", "message": str(e)}
+
     except Exception as e:
         print(f"ERROR in analyze_reviews: {e}")
         traceback.print_exc() 
@@ -138,11 +448,11 @@ def save_analysis_to_library(analysis_data, user_id):
         # 유사 상품 링크가 있으면 analysis_text JSON에 포함
         if related_products:
             try:
-                # analysis_text를 파싱하여 유사 상품 링크 추가
-                analysis_json = json.loads(analysis_text)
-                analysis_json['related_products'] = related_products
-                analysis_text = json.dumps(analysis_json, ensure_ascii=False)
-            except json.JSONDecodeError:
+                # analysis_text를 분석 결과 객체로 검증한 뒤 유사 상품 링크 추가 (직렬화는 DB 계층에서 한 번)
+                analysis = AnalysisResult.from_json(analysis_text)
+                analysis.related_products = related_products
+                analysis_text = analysis
+            except AnalysisFormatError:
                 # JSON 파싱 실패 시, 기존 텍스트에 추가 정보를 포함시키는 방식
                 # 하지만 이 경우는 거의 발생하지 않을 것으로 예상
                 print("WARNING: Could not parse analysis_text as JSON. Related products not saved.")
@@ -166,6 +476,8 @@ def save_analysis_to_library(analysis_data, user_id):
 
     except Exception as e:
         db_conn.rollback()
+        # 롤백으로 취소된 키워드/카테고리 ID가 캐시에 남지 않도록 제거
+        db.invalidate_id_caches(keywords=keywords, category_name=category_name)
         print(f"ERROR in save_analysis_to_library: {e}")
         traceback.print_exc()
         return {"status": "error", "message": "라이브러리 저장 중 오류가 발생했습니다."}
@@ -0,0 +1,176 @@
+# RA/review_analyzer/jobs.py
+
+"""
+리뷰 분석을 비동기 작업(Job)으로 실행하기 위한 모듈입니다.
+분석 요청은 작업 ID를 즉시 돌려받고, 실제 분석(facade.analyze_reviews)은 백그라운드 스레드에서 수행됩니다.
+클라이언트는 상태 조회(GET /api/analyze/<job_id>) 또는 SSE 스트림으로 진행 상황과 결과를 받습니다.
+시작을 기다리는 작업이 JOB_MAX_PENDING개를 넘으면 새 작업을 받지 않고 JobQueueFullError를 발생시킵니다.
+(동기 요청의 CrawlQueueFullError처럼 429로 응답하여, 작업이 끝없이 쌓이지 않게 합니다)
+"""
+
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+
+# --- 기본 설정 (config.py에서 덮어쓸 수 있음) ---
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_JOB_TTL = 60 * 30    # 완료된 작업을 보관하는 시간 (초)
+DEFAULT_MAX_PENDING = 16     # 시작을 기다리는(queued) 작업의 최대 수
+
+# 작업 상태
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_DONE = 'done'
+STATUS_ERROR = 'error'
+
+
+class JobQueueFullError(Exception):
+    """ 시작을 기다리는 분석 작업이 가득 찼을 때 발생하는 예외입니다. """
+
+    def __init__(self, pending_jobs):
+        self.pending_jobs = pending_jobs
+        super().__init__("현재 분석 요청이 많아 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.")
+
+
+class AnalysisJob:
+    def __init__(self, link, keywords):
+        self.job_id = uuid.uuid4().hex
+        self.link = link
+        self.keywords = keywords
+        self.status = STATUS_QUEUED
+        self.progress = {}       # rating -> {"count": n, "cached": bool}
+        self.result = None       # facade.analyze_reviews의 반환값
+        self.events = []         # SSE로 전달할 이벤트 목록 [{"seq", "event", "data"}]
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self._cond = threading.Condition()
+
+    @property
+    def finished(self):
+        return self.status in (STATUS_DONE, STATUS_ERROR)
+
+    def report(self, event, data=None):
+        """ 진행 이벤트를 기록하고, 대기 중인 스트림에 알립니다. (facade의 progress_callback) """
+        data = data or {}
+        with self._cond:
+            if event == 'rating_done':
+                self.progress[data.get('rating')] = {"count": data.get('count', 0), "cached": data.get('cached', False)}
+            self.events.append({"seq": len(self.events) + 1, "event": event, "data": data})
+            self.updated_at = time.time()
+            self._cond.notify_all()
+
+    def set_status(self, status, result=None):
+        with self._cond:
+            self.status = status
+            if result is not None:
+                self.result = result
+            self.updated_at = time.time()
+        self.report(status, result if status in (STATUS_DONE, STATUS_ERROR) else None)
+
+    def wait_for_events(self, after_seq, timeout=15):
+        """ after_seq 이후의 이벤트를 반환합니다. 새 이벤트가 없으면 timeout 초까지 기다립니다. """
+        with self._cond:
+            if len(self.events) <= after_seq and not self.finished:
+                self._cond.wait(timeout)
+            return self.events[after_seq:]
+
+    def to_dict(self):
+        with self._cond:
+            return {
+                "job_id": self.job_id,
+                "status": self.status,
+                "url": self.link,
+                "keywords": self.keywords,
+                "progress": dict(self.progress),
+                "result": self.result,
+            }
+
+
+class JobManager:
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, job_ttl=DEFAULT_JOB_TTL, max_pending=DEFAULT_MAX_PENDING):
+        self.job_ttl = job_ttl
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='analysis-job')
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def _prune_locked(self):
+        """ (lock 보유 상태에서) 보관 시간이 지난 완료 작업을 정리합니다. """
+        now = time.time()
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished and now - job.updated_at > self.job_ttl]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def _pending_locked(self):
+        """ (lock 보유 상태에서) 시작을 기다리는 작업을 등록 순서대로 반환합니다. """
+        return sorted((job for job in self._jobs.values() if job.status == STATUS_QUEUED),
+                      key=lambda job: job.created_at)
+
+    def queue_position(self, job):
+        """ 대기 중인 작업의 순번(1부터)을 반환합니다. 이미 시작했거나 끝난 작업은 None """
+        with self._lock:
+            pending = self._pending_locked()
+        return pending.index(job) + 1 if job in pending else None
+
+    def submit(self, link, keywords):
+        """
+        분석 작업을 등록하고 백그라운드 실행을 예약한 뒤, 작업 객체를 즉시 반환합니다.
+        대기 중인 작업이 max_pending개 이상이면 JobQueueFullError를 발생시킵니다.
+        """
+        app = current_app._get_current_object()
+        job = AnalysisJob(link, keywords)
+        with self._lock:
+            self._prune_locked()
+            pending = len(self._pending_locked())
+            if pending >= self.max_pending:
+                raise JobQueueFullError(pending)
+            self._jobs[job.job_id] = job
+        job.report(STATUS_QUEUED, {"queue_position": pending + 1})
+        self._executor.submit(self._run, app, job)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    @staticmethod
+    def _run(app, job):
+        # 순환 임포트를 피하기 위해 함수 안에서 임포트합니다.
+        from . import facade
+
+        job.set_status(STATUS_RUNNING)
+        try:
+            with app.app_context():
+                result = facade.analyze_reviews(job.link, job.keywords, progress_callback=job.report)
+        except Exception as e:
+            result = {"status": "error", "message": str(e)}
+
+        if result.get('status') == 'success':
+            job.set_status(STATUS_DONE, result)
+        else:
+            job.set_status(STATUS_ERROR, result)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+def init_app(app):
+    """
+    Flask 앱 팩토리(create_app)에서 호출될 초기화 함수입니다.
+    비동기 분석 작업 관리자를 만들어 app.extensions에 등록합니다.
+    """
+    manager = JobManager(
+        max_workers=app.config.get('JOB_MAX_WORKERS', DEFAULT_MAX_WORKERS),
+        job_ttl=app.config.get('JOB_TTL', DEFAULT_JOB_TTL),
+        max_pending=app.config.get('JOB_MAX_PENDING', DEFAULT_MAX_PENDING),
+    )
+    app.extensions['job_manager'] = manager
+    return manager
+
+
+def get_job_manager():
+    """ 현재 앱에 등록된 작업 관리자를 반환합니다. """
+    return current_app.extensions['job_manager']
@@ -0,0 +1,111 @@
+# RA/review_analyzer/keyword_cache.py
+
+"""
+키워드 하나 단위로 AI 분석 결과(keywords_analysis 항목)를 보관하는 캐시 모듈입니다.
+analysis_id는 링크 + 키워드 집합 전체의 해시라서 ["음질", "배터리"]를 분석한 뒤 ["음질"]만 다시 분석해도
+결과 캐시가 맞지 않습니다. 이 캐시는 (상품 ID, 리뷰 저장소 세대, 키워드) 단위로 결과를 저장하여,
+새 키워드 조합에서도 이미 분석한 키워드는 Gemini에 다시 보내지 않고 조립합니다.
+
+- 리뷰 저장소 세대(generation): ReviewStore.generation()이 돌려주는 별점별 세대 번호 튜플입니다.
+  리뷰를 새로 수집하거나 새 리뷰가 병합되면 바뀌므로 예전 분석 결과를 쓰지 않고,
+  조기 종료한 별점을 다른 키워드 때문에 끝까지 수집(확장)한 경우에는 그대로이므로 결과를 재사용합니다.
+- 키워드는 매칭과 같은 방식으로 정규화(공백/대소문자 무시)하여 키로 사용합니다.
+- 키워드별 긍정/부정 개수는 처음 분석할 때의 키워드 조합으로 뽑은 문장 표본(그때의 수집 범위)에서 센 값입니다.
+  문장 예산은 키워드 수에 따라 나뉘므로, 캐시된 키워드와 새로 분석한 키워드의 개수는 표본 크기가 다를 수 있습니다.
+- 프로세스 내 LRU 캐시 (KEYWORD_CACHE_SIZE, KEYWORD_CACHE_TTL)
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from flask import current_app
+
+from .keyword_matcher import normalize_text
+
+# --- 기본 설정 (config.py에서 덮어쓸 수 있음) ---
+DEFAULT_MAX_SIZE = 2048              # 보관할 최대 키워드 결과 수
+DEFAULT_TTL = 60 * 60 * 24           # 24시간
+
+
+class KeywordAnalysisCache:
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, ttl=DEFAULT_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._items = OrderedDict()    # (product_id, generation, keyword) -> (stored_at, KeywordAnalysis)
+        self._products = {}            # (product_id, generation) -> (stored_at, product_name, overall_summary)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(product_id, generation, keyword):
+        return (product_id, generation, normalize_text(keyword))
+
+    def lookup(self, product_id, generation, keywords):
+        """
+        키워드별 캐시 결과를 조회합니다.
+        반환값: ({keyword: KeywordAnalysis}, 캐시에 없는 키워드 리스트(입력 순서))
+        """
+        now = time.time()
+        cached, missing = {}, []
+        with self._lock:
+            for keyword in keywords:
+                key = self._key(product_id, generation, keyword)
+                item = self._items.get(key)
+                if item is not None and now - item[0] >= self.ttl:
+                    del self._items[key]
+                    item = None
+                if item is None:
+                    missing.append(keyword)
+                    continue
+                self._items.move_to_end(key)
+                cached[keyword] = item[1]
+        return cached, missing
+
+    def product_summary(self, product_id, generation):
+        """ 같은 리뷰 집합으로 분석했을 때의 (제품명, 종합 요약)을 반환합니다. 없으면 None """
+        with self._lock:
+            item = self._products.get((product_id, generation))
+            if item is None or time.time() - item[0] >= self.ttl:
+                return None
+            return item[1], item[2]
+
+    def put(self, product_id, generation, analysis):
+        """ 분석 결과(AnalysisResult)의 키워드별 항목과 제품 요약을 저장합니다. """
+        now = time.time()
+        with self._lock:
+            for item in analysis.keywords_analysis:
+                key = self._key(product_id, generation, item.keyword)
+                self._items[key] = (now, item)
+                self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+            self._products[(product_id, generation)] = (now, analysis.product_name, analysis.overall_sentiment_summary)
+            # 제품 요약은 키워드 결과가 남아 있는 (상품, 지문)만 보관합니다.
+            if len(self._products) > self.max_size:
+                alive = {(p, f) for p, f, _ in self._items}
+                self._products = {k: v for k, v in self._products.items() if k in alive}
+
+    def invalidate(self, product_id):
+        with self._lock:
+            for key in [k for k in self._items if k[0] == product_id]:
+                del self._items[key]
+            for key in [k for k in self._products if k[0] == product_id]:
+                del self._products[key]
+
+
+def init_app(app):
+    """
+    Flask 앱 팩토리(create_app)에서 호출될 초기화 함수입니다.
+    키워드 단위 분석 캐시를 만들어 app.extensions에 등록합니다.
+    """
+    cache = KeywordAnalysisCache(
+        max_size=app.config.get('KEYWORD_CACHE_SIZE', DEFAULT_MAX_SIZE),
+        ttl=app.config.get('KEYWORD_CACHE_TTL', DEFAULT_TTL),
+    )
+    app.extensions['keyword_cache'] = cache
+    return cache
+
+
+def get_keyword_cache():
+    """ 현재 앱에 등록된 키워드 분석 캐시를 반환합니다. """
+    return current_app.extensions['keyword_cache']
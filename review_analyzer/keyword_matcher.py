@@ -0,0 +1,163 @@
+# RA/review_analyzer/keyword_matcher.py
+
+"""
+여러 키워드를 한 번에 찾는 다중 패턴 매처(Aho–Corasick) 모듈입니다.
+문장마다 키워드 수만큼 `keyword in sentence`를 반복하지 않고, 키워드 집합으로 한 번 만든 오토마톤으로
+문장을 한 번만 훑어 포함된 키워드를 모두 찾습니다. (문장 길이 + 찾은 키워드 수에 비례)
+
+매칭 백엔드 (키워드 집합마다 자동 선택):
+- 'pyahocorasick': C 구현 오토마톤 (pyahocorasick 설치 시, 기본값)
+- 'python'       : 순수 파이썬 오토마톤 (키워드가 많을 때)
+- 'substring'    : 키워드별 `in` 검사 (키워드가 적을 때는 순수 파이썬 오토마톤보다 빠름)
+
+정규화 옵션 (키워드와 문장에 똑같이 적용):
+- ignore_spaces: 공백을 무시합니다. ("노이즈 캔슬링" == "노이즈캔슬링")
+- jamo: 한글을 자모 단위로 분해(NFKD)하여 비교합니다. (조합형/완성형, 호환 자모 입력 차이 흡수)
+- 영문은 대소문자를 구분하지 않습니다.
+"""
+
+import unicodedata
+from collections import deque
+from functools import lru_cache
+
+try:
+    import ahocorasick  # pyahocorasick은 선택 의존성
+except ImportError:
+    ahocorasick = None
+
+# pyahocorasick이 없을 때, 키워드가 이보다 많으면 순수 파이썬 오토마톤을 사용합니다.
+# (문자 단위 파이썬 루프의 고정 비용 때문에 키워드가 적으면 substring 검사가 더 빠름)
+PYTHON_AUTOMATON_MIN_KEYWORDS = 64
+
+
+def normalize_text(text, ignore_spaces=True, jamo=False):
+    """ 매칭용으로 텍스트를 정규화합니다. """
+    if jamo:
+        text = unicodedata.normalize('NFKD', text)
+    if ignore_spaces:
+        text = ''.join(text.split())
+    return text.casefold()
+
+
+class KeywordMatcher:
+    def __init__(self, keywords, ignore_spaces=True, jamo=False, backend=None):
+        self.keywords = list(keywords)
+        self.ignore_spaces = ignore_spaces
+        self.jamo = jamo
+
+        # 정규화된 패턴 -> 키워드 인덱스 목록 (정규화 후 같아지는 키워드는 함께 매칭)
+        self._patterns = {}
+        for index, keyword in enumerate(self.keywords):
+            pattern = normalize_text(keyword, ignore_spaces, jamo)
+            if pattern:
+                self._patterns.setdefault(pattern, []).append(index)
+
+        if backend is None:
+            if ahocorasick is not None:
+                backend = 'pyahocorasick'
+            elif len(self._patterns) > PYTHON_AUTOMATON_MIN_KEYWORDS:
+                backend = 'python'
+            else:
+                backend = 'substring'
+        self.backend = backend
+
+        if backend == 'pyahocorasick':
+            self._automaton = ahocorasick.Automaton()
+            for pattern, indices in self._patterns.items():
+                self._automaton.add_word(pattern, tuple(indices))
+            if self._patterns:
+                self._automaton.make_automaton()
+            self._find = self._find_pyahocorasick
+        elif backend == 'python':
+            # 상태 0이 루트. goto[state] = {문자: 다음 상태}, output[state] = 이 상태에서 끝나는 키워드 인덱스
+            self._goto = [{}]
+            self._fail = [0]
+            self._output = [set()]
+            for pattern, indices in self._patterns.items():
+                self._add(indices, pattern)
+            self._build_failure_links()
+            self._find = self._find_python
+        else:
+            self._pattern_items = list(self._patterns.items())
+            self._find = self._find_substring
+
+    def _add(self, indices, pattern):
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(set())
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state].update(indices)
+
+    def _build_failure_links(self):
+        """ BFS로 실패 링크를 만들고, 실패 링크를 따라 도달하는 키워드를 출력 집합에 미리 합쳐 둡니다. """
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] |= self._output[self._fail[next_state]]
+
+    # ------------------------------------------------------------------
+    # 백엔드별 검색 (정규화된 텍스트를 받음)
+    # ------------------------------------------------------------------
+    def _find_pyahocorasick(self, normalized):
+        found = set()
+        if self._patterns:
+            for _, indices in self._automaton.iter(normalized):
+                found.update(indices)
+        return found
+
+    def _find_python(self, normalized):
+        found = set()
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for char in normalized:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found |= output[state]
+        return found
+
+    def _find_substring(self, normalized):
+        found = set()
+        for pattern, indices in self._pattern_items:
+            if pattern in normalized:
+                found.update(indices)
+        return found
+
+    # ------------------------------------------------------------------
+    # 공개 API
+    # ------------------------------------------------------------------
+    def find_indices(self, text):
+        """ text에 포함된 키워드의 인덱스 집합을 반환합니다. """
+        return self._find(normalize_text(text, self.ignore_spaces, self.jamo))
+
+    def find(self, text):
+        """ text에 포함된 키워드 리스트를 (원래 키워드 순서대로) 반환합니다. """
+        return [self.keywords[index] for index in sorted(self.find_indices(text))]
+
+    def matches(self, text):
+        """ 키워드가 하나라도 포함되어 있는지 반환합니다. """
+        return bool(self.find_indices(text))
+
+
+@lru_cache(maxsize=128)
+def _cached_matcher(keywords, ignore_spaces, jamo):
+    return KeywordMatcher(keywords, ignore_spaces=ignore_spaces, jamo=jamo)
+
+
+def get_matcher(keywords, ignore_spaces=True, jamo=False):
+    """ 키워드 집합별로 한 번만 만든 매처를 반환합니다. (같은 키워드로 반복 분석 시 재사용) """
+    return _cached_matcher(tuple(keywords), ignore_spaces, jamo)
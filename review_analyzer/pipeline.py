@@ -0,0 +1,201 @@
+# RA/review_analyzer/pipeline.py
+
+"""
+크롤링한 리뷰를 AI 분석용 텍스트로 만드는 전처리 파이프라인 모듈입니다.
+리뷰 리스트 전체를 DataFrame/하나의 문자열로 만들지 않고, 리뷰 단위로 흘려보내는 제너레이터 단계로 구성됩니다.
+
+    리뷰(dict) -> 정제(내용 텍스트) -> 문장 분리 -> 키워드 필터 -> 토큰 예산 샘플링
+
+샘플링은 앞에서부터 글자 수로 자르지 않고, (별점, 키워드) 묶음마다 도움됨 수가 많은 문장부터
+번갈아 골라 토큰 예산을 채웁니다. (중복 문장 제외)
+"""
+
+import re
+import math
+from collections import Counter, deque
+
+from .keyword_matcher import KeywordMatcher, normalize_text
+
+SENTENCE_SPLIT_PATTERN = re.compile(r'[.?!]\s*')
+DEFAULT_TOKEN_BUDGET = 8000   # AI에 넘길 리뷰 문장의 최대 토큰 수
+
+
+def split_sentences(text):
+    """ 리뷰 텍스트를 문장 단위로 나눕니다. """
+    return [s.strip() for s in SENTENCE_SPLIT_PATTERN.split(text) if s.strip()]
+
+
+# ======================================================================
+#                            파이프라인 단계
+# ======================================================================
+
+def iter_review_texts(reviews):
+    """ 리뷰 레코드에서 비어 있지 않은 '내용' 텍스트만 꺼냅니다. (기존 dropna 대체) """
+    for review in reviews:
+        text = review.get('내용')
+        if text is None or (isinstance(text, float) and math.isnan(text)):
+            continue
+        text = str(text)
+        if text:
+            yield text
+
+
+def iter_sentences(texts):
+    """ 텍스트를 문장 단위로 나눠 흘려보냅니다. (리뷰 경계를 넘어 문장이 합쳐지지 않음) """
+    for text in texts:
+        yield from split_sentences(text)
+
+
+def filter_keyword_sentences(sentences, matcher, hit_counts=None):
+    """
+    키워드가 하나라도 포함된 문장만 흘려보냅니다. (matcher: KeywordMatcher)
+    hit_counts(Counter)가 주어지면 키워드별로 포함된 문장 수를 누적합니다.
+    """
+    for sentence in sentences:
+        found = matcher.find(sentence)
+        if found:
+            if hit_counts is not None:
+                hit_counts.update(found)
+            yield sentence
+
+
+def _as_matcher(keywords):
+    return keywords if isinstance(keywords, KeywordMatcher) else KeywordMatcher(keywords)
+
+
+def _helpful(review):
+    try:
+        return int(review.get('도움됨') or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+class _Candidate:
+    __slots__ = ('rating', 'sentence', 'keywords', 'review_id', 'selected')
+
+    def __init__(self, rating, sentence, keywords, review_id):
+        self.rating = rating
+        self.sentence = sentence
+        self.keywords = keywords
+        self.review_id = review_id
+        self.selected = False
+
+
+def _build_strata(reviews_by_rating, matcher):
+    """
+    (별점, 키워드) 묶음별로 키워드 포함 문장 후보를 도움됨 수가 많은 리뷰 순서로 모읍니다.
+    같은 문장(공백/대소문자 무시)은 한 번만 후보가 됩니다.
+    """
+    strata = {}
+    seen = set()
+    for rating, reviews in reviews_by_rating.items():
+        ranked = sorted(reviews, key=_helpful, reverse=True)
+        for review_id, review in enumerate(ranked):
+            for sentence in iter_sentences(iter_review_texts([review])):
+                key = normalize_text(sentence)
+                if key in seen:
+                    continue
+                found = matcher.find(sentence)
+                if not found:
+                    continue
+                seen.add(key)
+                candidate = _Candidate(rating, sentence, found, (rating, review_id))
+                for keyword in found:
+                    strata.setdefault((rating, keyword), deque()).append(candidate)
+
+    # 별점 순서 -> 키워드 순서로 정렬하여 라운드로빈 순서를 고정합니다.
+    order = [(rating, keyword) for rating in reviews_by_rating for keyword in matcher.keywords]
+    return [strata[key] for key in order if key in strata]
+
+
+def sample_analysis_sentences(reviews_by_rating, keywords, token_budget=DEFAULT_TOKEN_BUDGET, estimate_tokens=None):
+    """
+    별점별 리뷰({rating: [review, ...]})에서 AI 분석에 넘길 키워드 포함 문장을 토큰 예산 안에서 고릅니다.
+    (별점, 키워드) 묶음들을 라운드로빈으로 돌며 각 묶음의 다음 문장(도움됨 수 순)을 하나씩 추가하므로,
+    리뷰가 적은 별점이나 언급이 적은 키워드도 예산을 나눠 받고, 남는 예산은 나머지 묶음이 가져갑니다.
+    keywords는 키워드 리스트 또는 미리 만든 KeywordMatcher, estimate_tokens(text)는 토큰 수 추정 함수입니다.
+    반환값: (별점 순서로 정렬한 문장 리스트, 통계 dict)
+    """
+    matcher = _as_matcher(keywords)
+    if estimate_tokens is None:
+        estimate_tokens = lambda text: max(1, len(text) // 2)
+
+    queues = _build_strata(reviews_by_rating, matcher)
+    selected = []
+    used_tokens = 0
+    hit_counts = Counter()
+
+    while queues and used_tokens < token_budget:
+        remaining_queues = []
+        for queue in queues:
+            while queue and queue[0].selected:
+                queue.popleft()
+            if not queue:
+                continue
+            candidate = queue.popleft()
+            cost = estimate_tokens(candidate.sentence) + 1   # 구분자 공백 포함
+            if used_tokens + cost <= token_budget:
+                candidate.selected = True
+                selected.append(candidate)
+                used_tokens += cost
+                hit_counts.update(candidate.keywords)
+            if queue:
+                remaining_queues.append(queue)
+        queues = remaining_queues
+
+    by_rating = {rating: [] for rating in reviews_by_rating}
+    for candidate in selected:
+        by_rating[candidate.rating].append(candidate.sentence)
+
+    stats = {
+        "sentences": len(selected),
+        "reviews": len({candidate.review_id for candidate in selected}),
+        "estimated_tokens": used_tokens,
+        "per_rating": {rating: len(sentences) for rating, sentences in by_rating.items()},
+        "hit_counts": dict(hit_counts),
+    }
+    return [sentence for sentences in by_rating.values() for sentence in sentences], stats
+
+
+def chunk_sentences(sentences, chunk_tokens, estimate_tokens):
+    """ 문장들을 순서대로 묶어 chunk_tokens 이하의 텍스트 묶음을 흘려보냅니다. (map-reduce 분석용) """
+    chunk, used = [], 0
+    for sentence in sentences:
+        cost = estimate_tokens(sentence) + 1
+        if chunk and used + cost > chunk_tokens:
+            yield " ".join(chunk)
+            chunk, used = [], 0
+        chunk.append(sentence)
+        used += cost
+    if chunk:
+        yield " ".join(chunk)
+
+
+# ======================================================================
+#                       크롤링 조기 종료 기준
+# ======================================================================
+
+class KeywordCoverage:
+    """
+    별점별로 키워드가 포함된 문장 수를 세어, 모든 키워드가 목표 문장 수를 채웠는지 판단합니다.
+    (크롤링 조기 종료 기준)
+    """
+
+    def __init__(self, keywords, target):
+        self.matcher = _as_matcher(keywords)
+        self.keywords = self.matcher.keywords
+        self.target = target
+        self._counts = {}   # rating -> Counter(keyword: 문장 수)
+
+    def add(self, rating, reviews):
+        """ 새로 수집된 리뷰를 반영하고, 이 별점이 충분해졌는지 반환합니다. """
+        counts = self._counts.setdefault(rating, Counter())
+        for _ in filter_keyword_sentences(iter_sentences(iter_review_texts(reviews)), self.matcher, counts):
+            pass
+        return self.is_satisfied(rating)
+
+    def is_satisfied(self, rating):
+        counts = self._counts.get(rating)
+        if not self.keywords or not self.target or counts is None:
+            return False
+        return all(counts[keyword] >= self.target for keyword in self.keywords)
@@ -0,0 +1,94 @@
+# RA/review_analyzer/result_cache.py
+
+"""
+AI 분석 결과를 analysis_id 기준으로 보관하는 결과 캐시 모듈입니다.
+크롤링과 Gemini 호출 전에 먼저 조회하여, 인기 상품의 반복 분석을 즉시 응답합니다.
+
+- 프로세스 내 LRU 캐시 (RESULT_CACHE_SIZE)
+- fresh TTL(RESULT_CACHE_FRESH_TTL) 안의 결과는 그대로 반환합니다.
+- stale TTL(RESULT_CACHE_STALE_TTL) 안의 결과는 우선 반환하고, 백그라운드에서 다시 분석합니다.
+  (stale-while-revalidate)
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from flask import current_app
+
+# --- 기본 설정 (config.py에서 덮어쓸 수 있음) ---
+DEFAULT_MAX_SIZE = 256
+DEFAULT_FRESH_TTL = 60 * 60            # 1시간
+DEFAULT_STALE_TTL = 60 * 60 * 24       # 24시간
+
+
+class ResultCache:
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, fresh_ttl=DEFAULT_FRESH_TTL, stale_ttl=DEFAULT_STALE_TTL,
+                 use_db=True):
+        self.max_size = max_size
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = stale_ttl
+        self.use_db = use_db
+        self._items = OrderedDict()    # analysis_id -> (stored_at, data)
+        self._refreshing = set()       # 백그라운드 재분석 중인 analysis_id
+        self._lock = threading.Lock()
+
+    def get(self, analysis_id):
+        """
+        캐시에서 결과를 조회합니다.
+        반환값: (data, is_stale) / 없거나 stale TTL까지 지난 경우 (None, False)
+        """
+        with self._lock:
+            item = self._items.get(analysis_id)
+            if item is None:
+                return None, False
+            stored_at, data = item
+            age = time.time() - stored_at
+            if age >= self.stale_ttl:
+                del self._items[analysis_id]
+                return None, False
+            self._items.move_to_end(analysis_id)
+            return data, age >= self.fresh_ttl
+
+    def put(self, analysis_id, data, stored_at=None):
+        """ 결과를 저장합니다. stored_at을 주면 해당 시점에 분석된 결과로 취급합니다. """
+        with self._lock:
+            self._items[analysis_id] = (stored_at or time.time(), data)
+            self._items.move_to_end(analysis_id)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def invalidate(self, analysis_id):
+        with self._lock:
+            self._items.pop(analysis_id, None)
+
+    def start_refresh(self, analysis_id):
+        """ 재분석을 시작해도 되면 True를 반환합니다. (같은 ID의 중복 재분석 방지) """
+        with self._lock:
+            if analysis_id in self._refreshing:
+                return False
+            self._refreshing.add(analysis_id)
+            return True
+
+    def finish_refresh(self, analysis_id):
+        with self._lock:
+            self._refreshing.discard(analysis_id)
+
+
+def init_app(app):
+    """
+    Flask 앱 팩토리(create_app)에서 호출될 초기화 함수입니다.
+    결과 캐시를 만들어 app.extensions에 등록합니다.
+    """
+    cache = ResultCache(
+        max_size=app.config.get('RESULT_CACHE_SIZE', DEFAULT_MAX_SIZE),
+        fresh_ttl=app.config.get('RESULT_CACHE_FRESH_TTL', DEFAULT_FRESH_TTL),
+        stale_ttl=app.config.get('RESULT_CACHE_STALE_TTL', DEFAULT_STALE_TTL),
+        use_db=app.config.get('RESULT_CACHE_USE_DB', True),
+    )
+    app.extensions['result_cache'] = cache
+    return cache
+
+
+def get_result_cache():
+    """ 현재 앱에 등록된 결과 캐시를 반환합니다. """
+    return current_app.extensions['result_cache']
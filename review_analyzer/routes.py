@@ -6,12 +6,16 @@
 """
 
 from flask import (
-    Blueprint, render_template, jsonify, request, session, current_app
+    Blueprint, render_template, jsonify, request, session, current_app, Response
 )
+import json
+import base64
+from datetime import datetime
 
 # 현재 패키지 내의 다른 모듈들을 상대 경로로 임포트합니다.
 from . import auth
 from . import facade
+from . import jobs
 from .db import db
 
 # Blueprint 객체를 생성합니다.
@@ -31,7 +35,10 @@ def index():
 
 @bp.route('/api/analyze', methods=['POST'])
 def analyze_endpoint():
-    """ 리뷰 분석 API: 링크와 키워드를 받아 분석 결과만 반환합니다. """
+    """
+    리뷰 분석 API: 링크와 키워드를 받아 분석 결과만 반환합니다.
+    요청에 "async": true 가 있으면 작업 ID를 즉시 반환하고 분석은 백그라운드에서 수행합니다.
+    """
     data = request.get_json()
     link = data.get('link')
     keywords = data.get('keywords')
@@ -39,15 +46,77 @@ def analyze_endpoint():
     if not all([link, keywords]):
         return jsonify({"status": "error", "message": "link와 keywords는 필수 항목입니다."}), 400
 
+    if data.get('async'):
+        try:
+            job = jobs.get_job_manager().submit(link, keywords)
+        except jobs.JobQueueFullError as e:
+            # 대기 중인 분석 작업이 가득 찬 경우: 429 Too Many Requests
+            return jsonify({"status": "busy", "message": str(e), "waiting_jobs": e.pending_jobs}), 429, \
+                {'Retry-After': '30'}
+        return jsonify({
+            "status": "accepted",
+            "data": {
+                "job_id": job.job_id,
+                "status_url": f"/api/analyze/{job.job_id}",
+                "stream_url": f"/api/analyze/{job.job_id}/stream",
+            }
+        }), 202
+
     # 핵심 로직은 facade 모듈에 위임합니다.
     result = facade.analyze_reviews(link, keywords)
 
+    if result.get('status') == 'busy':
+        # 크롤링 대기열이 가득 찬 경우: 429 Too Many Requests
+        return jsonify(result), 429, {'Retry-After': '30'}
+
     if result.get('status') == 'error':
         return jsonify(result), 500
     
     return jsonify(result), 200
 
 
+@bp.route('/api/analyze/<string:job_id>', methods=['GET'])
+def analyze_job_status(job_id):
+    """ 비동기 분석 작업 상태 조회 API: 대기 순번, 별점별 크롤링 진행률과 (완료 시) 최종 결과를 반환합니다. """
+    manager = jobs.get_job_manager()
+    job = manager.get(job_id)
+    if not job:
+        return jsonify({"status": "error", "message": "존재하지 않거나 만료된 작업입니다."}), 404
+
+    data = job.to_dict()
+    data["queue_position"] = manager.queue_position(job)
+    return jsonify({"status": "success", "data": data}), 200
+
+
+@bp.route('/api/analyze/<string:job_id>/stream', methods=['GET'])
+def analyze_job_stream(job_id):
+    """ 비동기 분석 작업 진행 스트림(SSE): 진행 이벤트와 최종 결과를 순서대로 전송합니다. """
+    job = jobs.get_job_manager().get(job_id)
+    if not job:
+        return jsonify({"status": "error", "message": "존재하지 않거나 만료된 작업입니다."}), 404
+
+    # 재연결 시 브라우저가 보내는 Last-Event-ID 이후의 이벤트부터 이어서 전송
+    last_seq = request.headers.get('Last-Event-ID', type=int) or 0
+
+    def generate():
+        seq = last_seq
+        while True:
+            events = job.wait_for_events(seq)
+            if not events:
+                if job.finished:
+                    break
+                yield ": keep-alive\n\n"
+                continue
+            for item in events:
+                seq = item['seq']
+                payload = json.dumps(item['data'], ensure_ascii=False)
+                yield f"id: {seq}\nevent: {item['event']}\ndata: {payload}\n\n"
+            if job.finished and seq >= len(job.events):
+                break
+
+    return Response(generate(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
+
 @bp.route('/api/recommend-products', methods=['POST'])
 def recommend_products_endpoint():
     """ 유사 상품 추천 API: 상품 URL을 받아 유사 상품 링크를 반환합니다. """
@@ -85,17 +154,52 @@ def save_to_library_endpoint():
     return jsonify(result), 201  # 생성 성공은 201 Created가 더 적합합니다.
 
 
+def _encode_library_cursor(cursor):
+    """ (saved_at, analysis_id) 커서를 URL에 넣을 수 있는 문자열로 변환합니다. """
+    if not cursor:
+        return None
+    saved_at, analysis_id = cursor
+    raw = f"{saved_at.strftime('%Y-%m-%d %H:%M:%S')}|{analysis_id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def _decode_library_cursor(cursor_str):
+    """ 문자열 커서를 (saved_at, analysis_id)로 복원합니다. 형식이 잘못되면 ValueError """
+    raw = base64.urlsafe_b64decode(cursor_str.encode('ascii')).decode('utf-8')
+    saved_at_str, analysis_id = raw.split('|', 1)
+    return datetime.strptime(saved_at_str, '%Y-%m-%d %H:%M:%S'), analysis_id
+
+
 @bp.route('/api/library', methods=['GET'])
 def get_my_library():
-    """ 라이브러리 조회 API: 현재 로그인된 사용자의 라이브러리 목록을 반환합니다. """
+    """
+    라이브러리 조회 API: 현재 로그인된 사용자의 라이브러리 목록을 최신 저장순으로 페이지 단위로 반환합니다.
+    쿼리 파라미터: limit(페이지 크기), cursor(이전 응답의 next_cursor), fields=summary(analysis_text 제외)
+    """
     user_id = session.get('user_id')
     if not user_id:
         return jsonify({"status": "error", "message": "로그인이 필요합니다."}), 401
 
+    page_size = current_app.config.get('LIBRARY_PAGE_SIZE', 20)
+    limit = request.args.get('limit', default=page_size, type=int)
+    limit = max(1, min(limit, current_app.config.get('LIBRARY_MAX_PAGE_SIZE', 100)))
+    include_text = request.args.get('fields') != 'summary'
+
+    cursor = None
+    cursor_str = request.args.get('cursor')
+    if cursor_str:
+        try:
+            cursor = _decode_library_cursor(cursor_str)
+        except Exception:
+            return jsonify({"status": "error", "message": "잘못된 cursor 값입니다."}), 400
+
     try:
-        analysis_ids = db.get_library_by_user_id(user_id)
-        library_items = db.get_analyses_by_ids(analysis_ids)
-        return jsonify({"status": "success", "data": library_items}), 200
+        library_items, next_cursor = db.get_library_page(user_id, limit, cursor=cursor, include_text=include_text)
+        return jsonify({
+            "status": "success",
+            "data": library_items,
+            "next_cursor": _encode_library_cursor(next_cursor),
+        }), 200
     except Exception as e:
         # DB 오류 등 예기치 못한 에러 발생 시
         current_app.logger.error(f"라이브러리 조회 중 오류 발생: {e}")
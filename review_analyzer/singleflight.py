@@ -0,0 +1,76 @@
+# RA/review_analyzer/singleflight.py
+
+"""
+동일한 작업에 대한 동시 요청을 하나로 합치는 single-flight 모듈입니다.
+같은 키(analysis_id)로 진행 중인 작업이 있으면 새로 실행하지 않고, 그 작업이 끝나기를 기다려 결과를 함께 받습니다.
+"""
+
+import threading
+
+
+class _Call:
+    """ 진행 중인 작업 1건의 상태 (결과, 예외, 진행 이벤트 구독자) """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.subscribers = []
+        self.lock = threading.Lock()
+
+    def subscribe(self, callback):
+        if callback:
+            with self.lock:
+                self.subscribers.append(callback)
+
+    def notify(self, event, data):
+        """ 작업의 진행 이벤트를 합류한 모든 요청에게 전달합니다. """
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for callback in subscribers:
+            try:
+                callback(event, data)
+            except Exception as e:
+                print(f"WARNING: single-flight subscriber failed: {e}")
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, subscriber=None):
+        """
+        key에 대해 fn(notify)를 한 번만 실행하고 그 결과를 반환합니다.
+        이미 실행 중이면 기다렸다가 같은 결과를 반환합니다.
+        subscriber(event, data)는 실행 중인 작업의 진행 이벤트를 받습니다.
+        반환값: (result, shared)  shared=True면 다른 요청이 실행한 결과를 공유받은 것
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+            call.subscribe(subscriber)
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn(call.notify)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self, key):
+        with self._lock:
+            return key in self._calls
@@ -5,7 +5,9 @@ const STATE = {
     user: { user_id: null, user_name: null },
     chatHistory: [],
     analysisResult: null,
+    analysisProgress: null, // 진행 중인 분석의 스트리밍 상태 (진행 메시지, 완성된 키워드 결과)
     savedData: [],
+    savedCursor: null, // 라이브러리 다음 페이지 cursor (null이면 마지막 페이지)
     tempUrl: null,
     relatedProducts: null, // 유사 상품 링크 저장
     recommendChoice: null, // 유사 상품 추천 선택 상태: null(미선택), 'yes', 'no'
@@ -280,26 +282,29 @@ async function runAnalysis(link, keyword) {
     buttonElement.innerHTML = '<svg class="animate-spin w-5 h-5 text-white" fill="none" stroke="currentColor" viewBox="0 0 24 24" xmlns="http://www.w3.org/2000/svg"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 4v5h.582m15.356-2A8.001 8.001 0 004.582 19m9.625-3.5H19V14a5 5 0 10-10 0v1h10"></path></svg>'; // 로딩 아이콘 추가
 
     try {
-        // 서버 통신: app.py의 /api/analyze 호출
+        // 서버 통신: /api/analyze에 비동기 작업으로 요청하고, SSE 스트림으로 진행 상황과 결과를 받습니다.
         const response = await fetch('/api/analyze', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ link: link, keywords: keyword.split(',').map(k => k.trim()) }),
+            body: JSON.stringify({ link: link, keywords: keyword.split(',').map(k => k.trim()), async: true }),
         });
 
-        const data = await response.json();
+        const accepted = await response.json();
+        const data = response.ok ? await streamAnalysis(accepted.data.stream_url) : accepted;
 
-        if (response.ok) {
+        if (data && data.status === 'success') {
             STATE.analysisResult = data.data;
             STATE.relatedProducts = null; // 새로운 분석 시작 시 유사 상품 초기화
             STATE.recommendChoice = null; // 새로운 분석 시작 시 선택 상태 초기화
             pushChat('system', `__ANALYSIS_RESULT_CARD__`);
-        } else {
-            const errorMessage = data.message || "알 수 없는 서버 오류가 발생했습니다.";
+        } else if (data) {
             pushChat('system', `리뷰 분석 한도로 인해 분석이 종료되었습니다. 잠시 후 다시 이용해주세요.`);
+        } else {
+            pushChat('system', `🚫 분석 진행 상황을 받는 중 연결이 끊어졌습니다. 잠시 후 다시 시도해주세요.`);
         }
     } catch (error) {
         console.error("Network or Fetch Error:", error);
+        clearAnalysisProgress();
         pushChat('system', `🚫 네트워크 연결 또는 분석 요청 중 오류가 발생했습니다: ${error.message}. 서버(Flask)가 실행 중인지 확인해주세요.`);
     } finally {
         // 입력 활성화 및 버튼 복원
@@ -309,6 +314,64 @@ async function runAnalysis(link, keyword) {
     }
 }
 
+// 분석 작업의 SSE 스트림을 구독하여 진행 카드를 갱신하고, 최종 결과(done/error 이벤트의 데이터)로 resolve합니다.
+// 스트림에 다시 연결할 수 없으면 null로 resolve합니다.
+function streamAnalysis(streamUrl) {
+    STATE.analysisProgress = {
+        message: '리뷰 수집을 준비하고 있습니다...',
+        product_name: '',
+        overall_sentiment_summary: '',
+        keywords_analysis: [],
+        ratings: {},
+    };
+    pushChat('system', '__ANALYSIS_PROGRESS__');
+
+    return new Promise((resolve) => {
+        const source = new EventSource(streamUrl);
+        const progress = STATE.analysisProgress;
+        const on = (event, handler) => source.addEventListener(event, (e) => {
+            handler(e.data ? JSON.parse(e.data) : {});
+            renderChatArea();
+        });
+        const finish = (result) => {
+            source.close();
+            clearAnalysisProgress();
+            resolve(result);
+        };
+
+        on('queued', (d) => {
+            if (d.queue_position > 1) progress.message = `분석 대기 중입니다... (${d.queue_position}번째)`;
+        });
+        on('crawl_start', () => { progress.message = '리뷰를 수집하고 있습니다...'; });
+        on('rating_done', (d) => {
+            progress.ratings[d.rating] = d.count;
+            progress.message = `리뷰를 수집하고 있습니다... (${Object.keys(progress.ratings).length}개 별점 완료)`;
+        });
+        on('analyzing', (d) => {
+            progress.message = `AI가 리뷰 ${d.review_count}개에서 고른 문장 ${d.sentence_count}개를 분석하고 있습니다...`;
+        });
+        on('analysis_field', (d) => { progress[d.name] = d.value; });
+        on('keyword_result', (d) => { progress.keywords_analysis.push(d.keyword_analysis); });
+
+        source.addEventListener('done', (e) => finish(JSON.parse(e.data)));
+        source.addEventListener('error', (e) => {
+            // 서버가 보낸 'error' 이벤트(분석 실패)에는 결과 데이터가 있고, 연결 오류에는 없습니다.
+            if (e.data) {
+                finish(JSON.parse(e.data));
+            } else if (source.readyState === EventSource.CLOSED) {
+                finish(null);
+            }
+            // 그 밖의 연결 오류는 브라우저가 Last-Event-ID로 자동 재연결하여 이어서 받습니다.
+        });
+    });
+}
+
+// 진행 카드를 채팅 기록에서 제거합니다.
+function clearAnalysisProgress() {
+    STATE.analysisProgress = null;
+    STATE.chatHistory = STATE.chatHistory.filter(msg => msg.content !== '__ANALYSIS_PROGRESS__');
+}
+
 // --- 분석 결과 저장 ---
 async function handleSaveAnalysis() {
     if (!STATE.isAuthenticated) {
@@ -349,19 +412,37 @@ async function handleSaveAnalysis() {
     }
 }
 
-async function loadSavedReviews() {
+async function loadSavedReviews(append = false) {
+    // 서버는 페이지 단위(next_cursor)로 응답합니다. 첫 페이지만 불러오고, 나머지는 '더 보기'로 이어서 불러옵니다.
+    const cursor = append ? STATE.savedCursor : null;
     try {
-        const response = await fetch('/api/library', { method: 'GET' });
+        const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+        const response = await fetch(`/api/library${query}`, { method: 'GET' });
         const data = await response.json();
-        if (response.ok) {
-            STATE.savedData = data.data;
-        } else {
+        if (!response.ok) {
             console.error("라이브러리 로딩 실패:", data.message);
-            STATE.savedData = [];
+            if (!append) {
+                STATE.savedData = [];
+                STATE.savedCursor = null;
+            }
+            return;
         }
+        STATE.savedData = append ? STATE.savedData.concat(data.data) : data.data;
+        STATE.savedCursor = data.next_cursor;
     } catch (error) {
         console.error("라이브러리 로딩 중 오류:", error);
-        STATE.savedData = [];
+        if (!append) {
+            STATE.savedData = [];
+            STATE.savedCursor = null;
+        }
+    }
+}
+
+async function loadMoreSavedReviews() {
+    if (!STATE.savedCursor) return;
+    await loadSavedReviews(true);
+    if (STATE.currentScreen === 'savedReviews') {
+        renderSavedReviews();
     }
 }
 
@@ -553,6 +634,58 @@ function getMessageModal(title, message) {
   `;
 }
 
+// 키워드 하나의 상세 분석 HTML (결과 카드와 스트리밍 진행 카드에서 공통 사용)
+function getKeywordAnalysisHtml(k) {
+    const positiveCount = k.positive_count || 0;
+    const negativeCount = k.negative_count || 0;
+    const keywordTotal = positiveCount + negativeCount;
+    const positiveKeywordPercentage = keywordTotal > 0 ? Math.round((positiveCount / keywordTotal) * 100) : 0;
+    const negativeKeywordPercentage = 100 - positiveKeywordPercentage;
+
+    return `
+        <div class="mb-8 p-6 bg-white rounded-xl shadow-md border border-gray-100">
+            <h3 class="text-xl font-bold text-gray-900 mb-4">#${k.keyword}</h3>
+            <div class="flex items-center space-x-4 mb-4">
+                <div class="w-1/3 text-right text-sm font-semibold text-green-700">${positiveCount}</div>
+                <div class="flex-1 h-3 rounded-full overflow-hidden bg-red-100"><div class="bg-green-500 h-3" style="width: ${positiveKeywordPercentage}%;"></div></div>
+                <div class="w-1/3 text-left text-sm font-semibold text-red-700">${negativeCount}</div>
+            </div>
+            <div class="flex justify-between text-xs font-medium text-gray-600 mb-6">
+                <span>긍정 (${positiveKeywordPercentage}%)</span><span>부정 (${negativeKeywordPercentage}%)</span>
+            </div>
+            <div class="bg-green-50 p-4 rounded-lg mb-4 border border-green-200">
+                <div class="flex items-center text-green-700 font-bold mb-2"><svg class="w-5 h-5 mr-2" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M9 12l2 2 4-4m6 2a9 9 0 11-18 0 9 9 0 0118 0z"></path></svg>긍정 리뷰 요약</div>
+                <p class="text-sm text-green-800">${k.positive_summary}</p>
+            </div>
+            <div class="bg-red-50 p-4 rounded-lg border border-red-200">
+                <div class="flex items-center text-red-700 font-bold mb-2"><svg class="w-5 h-5 mr-2" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M10 14l2-2m0 0l2-2m-2 2l-2-2m2 2l2 2m7-2a9 9 0 11-18 0 9 9 0 0118 0z"></path></svg>부정 리뷰 요약</div>
+                <p class="text-sm text-red-800">${k.negative_summary}</p>
+            </div>
+        </div>
+    `;
+}
+
+// 분석 진행 카드 HTML (SSE 스트림으로 받은 진행 상황과 완성된 키워드 결과를 표시)
+function getAnalysisProgressCard(progress) {
+    if (!progress) return '';
+    const keywordsHtml = progress.keywords_analysis.map(getKeywordAnalysisHtml).join('');
+    return `
+        <div class="flex flex-col w-full max-w-4xl mx-auto">
+            <div class="bg-white p-4 rounded-xl shadow-md border border-gray-100 mb-6 flex items-center">
+                <svg class="animate-spin w-5 h-5 text-indigo-600 mr-3" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 4v5h.582m15.356-2A8.001 8.001 0 004.582 19m9.625-3.5H19V14a5 5 0 10-10 0v1h10"></path></svg>
+                <p class="text-sm text-gray-700">${progress.message}</p>
+            </div>
+            ${progress.product_name ? `<div class="text-center mb-6"><h1 class="text-2xl font-extrabold text-gray-800">${progress.product_name}</h1></div>` : ''}
+            ${progress.overall_sentiment_summary ? `
+            <div class="p-4 bg-indigo-50 rounded-lg mb-6">
+                <h3 class="text-lg font-semibold text-indigo-800 mb-2">⭐ 전반적 감정 요약</h3>
+                <p class="text-sm text-indigo-700">${progress.overall_sentiment_summary}</p>
+            </div>` : ''}
+            ${keywordsHtml}
+        </div>
+    `;
+}
+
 // AI 분석 결과 카드 HTML 
 function getAnalysisCard(dbResult) {
     const isCurrentAnalysis = STATE.currentScreen === 'currentAnalysis';
@@ -599,35 +732,7 @@ function getAnalysisCard(dbResult) {
         </div>
     `;
 
-    const keywordsAnalysisHtml = keywordsAnalysis.map(k => {
-        const positiveCount = k.positive_count || 0;
-        const negativeCount = k.negative_count || 0;
-        const keywordTotal = positiveCount + negativeCount;
-        const positiveKeywordPercentage = keywordTotal > 0 ? Math.round((positiveCount / keywordTotal) * 100) : 0;
-        const negativeKeywordPercentage = 100 - positiveKeywordPercentage;
-
-        return `
-            <div class="mb-8 p-6 bg-white rounded-xl shadow-md border border-gray-100">
-                <h3 class="text-xl font-bold text-gray-900 mb-4">#${k.keyword}</h3>
-                <div class="flex items-center space-x-4 mb-4">
-                    <div class="w-1/3 text-right text-sm font-semibold text-green-700">${positiveCount}</div>
-                    <div class="flex-1 h-3 rounded-full overflow-hidden bg-red-100"><div class="bg-green-500 h-3" style="width: ${positiveKeywordPercentage}%;"></div></div>
-                    <div class="w-1/3 text-left text-sm font-semibold text-red-700">${negativeCount}</div>
-                </div>
-                <div class="flex justify-between text-xs font-medium text-gray-600 mb-6">
-                    <span>긍정 (${positiveKeywordPercentage}%)</span><span>부정 (${negativeKeywordPercentage}%)</span>
-                </div>
-                <div class="bg-green-50 p-4 rounded-lg mb-4 border border-green-200">
-                    <div class="flex items-center text-green-700 font-bold mb-2"><svg class="w-5 h-5 mr-2" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M9 12l2 2 4-4m6 2a9 9 0 11-18 0 9 9 0 0118 0z"></path></svg>긍정 리뷰 요약</div>
-                    <p class="text-sm text-green-800">${k.positive_summary}</p>
-                </div>
-                <div class="bg-red-50 p-4 rounded-lg border border-red-200">
-                    <div class="flex items-center text-red-700 font-bold mb-2"><svg class="w-5 h-5 mr-2" fill="none" stroke="currentColor" viewBox="0 0 24 24"><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M10 14l2-2m0 0l2-2m-2 2l-2-2m2 2l2 2m7-2a9 9 0 11-18 0 9 9 0 0118 0z"></path></svg>부정 리뷰 요약</div>
-                    <p class="text-sm text-red-800">${k.negative_summary}</p>
-                </div>
-            </div>
-        `;
-    }).join('');
+    const keywordsAnalysisHtml = keywordsAnalysis.map(getKeywordAnalysisHtml).join('');
 
     // 저장된 데이터에서 유사 상품 링크 추출 (라이브러리에서 불러올 때)
     const savedRelatedProducts = analysisData.related_products || null;
@@ -786,6 +891,8 @@ function renderChatArea() {
             }
         } else if (msg.content === '__ANALYSIS_RESULT_CARD__') {
             return getAnalysisCard(STATE.analysisResult);
+        } else if (msg.content === '__ANALYSIS_PROGRESS__') {
+            return getAnalysisProgressCard(STATE.analysisProgress);
         } else {
             // 시스템 메시지
             let contentHtml = '';
@@ -958,10 +1065,19 @@ function renderSavedReviews() {
         }).join('')
         : '<div class="text-center py-12 text-gray-500">아직 저장된 리뷰가 없습니다. 분석 결과를 저장해보세요!</div>';
 
+    // 다음 페이지가 있으면 '더 보기' 버튼 표시
+    const loadMoreHtml = STATE.savedCursor ? `
+        <div class="text-center">
+            <button onclick="loadMoreSavedReviews()" class="px-6 py-2 bg-gray-200 text-gray-700 rounded-lg font-semibold hover:bg-gray-300 transition-colors">
+                더 보기
+            </button>
+        </div>` : '';
+
     elements.contentContainer.innerHTML = `
         <h1 class="text-2xl font-bold text-gray-900 mb-6">내 라이브러리</h1>
         <div class="max-w-3xl mx-auto">
             ${savedReviewsHtml}
+            ${loadMoreHtml}
         </div>
     `;
 }
@@ -9,6 +9,7 @@ from flask import Blueprint, jsonify, session, current_app
 
 # db 모듈을 상대 경로로 임포트합니다.
 from .db import db
+from .ai import analyzer
 
 # Blueprint 객체를 생성합니다. url_prefix를 사용하여 모든 라우트 앞에 '/test'를 붙입니다.
 bp = Blueprint('test', __name__, url_prefix='/test')
@@ -28,6 +29,18 @@ def test_db_connection():
         return jsonify({"status": "error", "message": str(e)}), 500
 
 
+@bp.route('/db_pool')
+def test_db_pool_stats():
+    """ DB 커넥션 풀 상태(생성/재사용/대기 횟수 등)를 확인합니다. """
+    return jsonify({"status": "success", "data": db.get_pool_stats()})
+
+
+@bp.route('/ai_usage')
+def test_ai_usage_stats():
+    """ Gemini 프롬프트 토큰 사용량과 컨텍스트 캐시에서 처리된 토큰 수(절감분)를 확인합니다. """
+    return jsonify({"status": "success", "data": analyzer.get_usage_stats()})
+
+
 @bp.route('/category')
 def test_category_creation():
     """ 카테고리 생성 및 조회 함수(find_or_create_category)를 테스트합니다. """